@@ -45,6 +45,14 @@ pythonProcessor.addToRolePolicy(
   })
 );
 
+// Player snapshots published at the end of each refresh
+pythonProcessor.addToRolePolicy(
+  new PolicyStatement({
+    actions: ['s3:PutObject'],
+    resources: [`${backend.storage.resources.bucket.bucketArn}/snapshots/*`],
+  })
+);
+
 pythonProcessor.addToRolePolicy(
   new PolicyStatement({
     actions: ['dynamodb:PutItem', 'dynamodb:BatchWriteItem', 'dynamodb:UpdateItem', 'dynamodb:GetItem', 'dynamodb:Scan'],
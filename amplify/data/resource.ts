@@ -31,6 +31,11 @@ const schema = a.schema({
     last_updated: a.string(),
   })
     .identifier(['sleeper_id']) // Primary Key
+    // Ranked lookups ("top 50 RBs", "all BUF players") without a full scan
+    .secondaryIndexes((index) => [
+      index('position').sortKeys(['fc_rank']).name('byPosition'),
+      index('team').sortKeys(['fc_rank']).name('byTeam'),
+    ])
     .authorization((allow) => [
       allow.publicApiKey(), // Read-only for public (homepage)
       allow.authenticated(), // Authenticated users can read
@@ -3,8 +3,10 @@ import os
 import pandas as pd
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 PLAYER_DATA_FILE = "nfl_players_data.json"
+PLAYER_COLUMNS = ['player_id', 'full_name', 'position', 'team']
 all_players_data = {}
 
 try:
@@ -21,10 +23,11 @@ except json.JSONDecodeError:
 
 roster_url = "https://api.sleeper.app/v1/league/1200992049558454272/rosters"
 managers_url = "https://api.sleeper.app/v1/league/1200992049558454272/users"
-user_url = "https://api.sleeper.app/v1/user/{user_id}"
 
-rosters = requests.get(roster_url)
-managers = requests.get(managers_url)
+# Rosters and managers are fetched concurrently; owners are joined from the
+# managers list, so no per-roster /user/<id> request is needed.
+with requests.Session() as session, ThreadPoolExecutor(max_workers=2) as executor:
+    rosters, managers = executor.map(session.get, [roster_url, managers_url])
 
 def create_manager_roster(manager_player_ids, all_players_data):
     roster_details_list = []
@@ -54,7 +57,8 @@ def create_manager_roster(manager_player_ids, all_players_data):
                     'position': 'N/A',
                     'team': 'N/A'
                 })
-    manager_df = pd.DataFrame(roster_details_list)
+    # Explicit columns, so an empty roster still has 'position' etc.
+    manager_df = pd.DataFrame(roster_details_list, columns=PLAYER_COLUMNS)
     return manager_df
 
 roster_data = rosters.json()
@@ -63,17 +67,17 @@ if not roster_data or not managers_data:
     print("Failed to fetch roster or manager data.")
     sys.exit(1)
 
+managers_by_id = {manager['user_id']: manager for manager in managers_data}
+manager_rosters = []
 for roster in roster_data:
-   players = roster['players']
-   players_details = create_manager_roster(players, all_players_data)
-   user = requests.get(user_url.format(user_id=roster['owner_id']))
-   user_data = user.json()
-   print(user_data['display_name'])
-   print(players_details)
-   print("-------------------")
-   
-for manager in managers_data:
-    print(manager['display_name'])
-    print(manager)
-    print("-------------------")
-    
+    players_details = create_manager_roster(roster['players'] or [], all_players_data)
+    manager = managers_by_id.get(roster['owner_id'], {})
+    manager_name = manager.get('display_name', 'Unknown')
+    players_details.insert(0, 'manager', manager_name)
+    manager_rosters.append((manager_name, players_details))
+league_rosters = pd.concat([players_details for _, players_details in manager_rosters], ignore_index=True)
+
+# Per roster rather than grouped, so managers with an empty roster are listed too
+for manager_name, players_details in manager_rosters:
+    positions = players_details['position'].value_counts()
+    print(f"{manager_name}: {len(players_details)} players ({', '.join(f'{pos} {count}' for pos, count in positions.items())})")
@@ -1,30 +1,289 @@
 import json
 import boto3
 import os
-from decimal import Decimal
-from boto3.dynamodb.conditions import Key
+import time
+import base64
+import gzip
+import logging
+from collections import OrderedDict
+from player_search import PlayerSearchIndex
+from query_params import parse_rank_query, parse_search_query
+from singleflight import CachedLoader
 
-# Initialize DynamoDB resource
-# Note: In Lambda, AWS_REGION is set automatically
-dynamodb = boto3.resource('dynamodb')
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib encoder
+    orjson = None
+
+# Initialize DynamoDB client
+# Note: In Lambda, AWS_REGION is set automatically.
+# The low-level client is used so numbers can be decoded straight to int/float (no Decimal round trip).
+dynamodb = boto3.client('dynamodb')
+s3 = boto3.client('s3')
 TABLE_NAME = os.environ.get('PLAYER_VALUES_TABLE', 'PlayerValues')
-table = dynamodb.Table(TABLE_NAME)
+BUCKET_NAME = os.environ.get('DATA_BUCKET_NAME')
+
+# LOG_LEVEL=DEBUG logs the full incoming event
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+# Snapshot published by amplify_processing_handler at the end of each refresh.
+# SNAPSHOT_MODE: 'stream' returns the gzipped object, 'redirect' returns a presigned URL, 'off' always scans.
+SNAPSHOT_MANIFEST_KEY = 'snapshots/players/latest.json'
+SNAPSHOT_MODE = os.environ.get('SNAPSHOT_MODE', 'stream')
+MANIFEST_TTL_SECONDS = int(os.environ.get('SNAPSHOT_MANIFEST_TTL', '30'))
+PRESIGNED_URL_TTL_SECONDS = 300
+
+# Secondary indexes (see amplify/data/resource.ts), both sorted by fc_rank
+INDEXED_ROUTES = {
+    '/api/enriched-players/position/': ('position', os.environ.get('POSITION_INDEX_NAME', 'byPosition')),
+    '/api/enriched-players/team/': ('team', os.environ.get('TEAM_INDEX_NAME', 'byTeam')),
+}
+
+# Single-player lookup cache sizing. Unknown IDs (team defenses, bad probes) are cached briefly.
+PLAYER_CACHE_SIZE = int(os.environ.get('PLAYER_CACHE_SIZE', '2000'))
+PLAYER_CACHE_TTL_SECONDS = int(os.environ.get('PLAYER_CACHE_TTL', '300'))
+NEGATIVE_CACHE_TTL_SECONDS = int(os.environ.get('NEGATIVE_CACHE_TTL', '60'))
+
+class PlayerLookupCache:
+    """
+    Bounded LRU of single-player lookups, scoped to a data version.
+    Entries hold the encoded response body, or None for IDs that are not in the table.
+    """
+
+    def __init__(self, max_size, ttl_seconds, negative_ttl_seconds):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.version = None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(self, sleeper_id, version):
+        """Returns (True, body_or_None) on a cache hit, (False, None) on a miss."""
+        if version != self.version:
+            # A refresh published a new version; everything cached is stale
+            self._entries.clear()
+            self.version = version
+
+        entry = self._entries.get(sleeper_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(sleeper_id)
+            if entry[0] is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return True, entry[0]
+
+        if entry is not None:
+            del self._entries[sleeper_id]
+        self.misses += 1
+        return False, None
+
+    def put(self, sleeper_id, body):
+        ttl = self.ttl_seconds if body is not None else self.negative_ttl_seconds
+        self._entries[sleeper_id] = (body, time.monotonic() + ttl)
+        self._entries.move_to_end(sleeper_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'negative_hits': self.negative_hits,
+            'misses': self.misses,
+            'data_version': self.version
+        }
 
-def decimal_default(obj):
-    """Helper to convert Decimal objects to float for JSON serialization"""
-    if isinstance(obj, Decimal):
-        return float(obj)
-    raise TypeError
+# Scan fallback for the full list (no snapshot published yet).
+# Lambda serves one request per container and freezes it once the response is
+# returned, so there is no stale-while-revalidate or request coalescing here
+# (see api_server/asgi_server for the long-running servers).
+FULL_LIST_TTL_SECONDS = int(os.environ.get('FULL_LIST_CACHE_TTL', '60'))
+
+# Per-container caches (survive between warm invocations)
+_manifest_cache = {'manifest': None, 'checked_at': 0.0}
+_snapshot_body_cache = {'version': None, 'body': None}
+_search_index_cache = {'source': None, 'players': None, 'index': None}
+player_cache = PlayerLookupCache(PLAYER_CACHE_SIZE, PLAYER_CACHE_TTL_SECONDS, NEGATIVE_CACHE_TTL_SECONDS)
+full_list_cache = CachedLoader(lambda _: dumps(scan_all_items()), FULL_LIST_TTL_SECONDS)
+
+def _number(value):
+    """DynamoDB numbers arrive as strings; whole numbers become int, everything else float."""
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+_DESERIALIZERS = {
+    'S': lambda v: v,
+    'N': _number,
+    'BOOL': lambda v: v,
+    'NULL': lambda v: None,
+    'M': lambda v: deserialize_item(v),
+    'L': lambda v: [deserialize_value(x) for x in v],
+    'SS': list,
+    'NS': lambda v: [_number(x) for x in v],
+    'B': lambda v: base64.b64encode(v).decode('ascii'),
+    'BS': lambda v: [base64.b64encode(x).decode('ascii') for x in v],
+}
+
+def deserialize_value(attribute):
+    """Converts one low-level attribute value (e.g. {'N': '42'}) to a native Python value."""
+    (type_tag, value), = attribute.items()
+    return _DESERIALIZERS[type_tag](value)
+
+def deserialize_item(item):
+    """Converts a low-level DynamoDB item to a plain dict of JSON-serializable values."""
+    return {key: deserialize_value(attribute) for key, attribute in item.items()}
+
+def dumps(obj):
+    """Encodes a response body, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+def scan_all_items():
+    """Scans the whole table (paginated) and returns deserialized items."""
+    items = []
+    request = {'TableName': TABLE_NAME}
+    while True:
+        response = dynamodb.scan(**request)
+        items.extend(deserialize_item(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def query_index(index_name, key_name, key_value, min_rank=None, max_rank=None, limit=None):
+    """
+    Queries a secondary index for one position/team, returning players in fc_rank order.
+    Follows pagination until the limit (or the end of the partition) is reached.
+    """
+    condition = '#key = :key'
+    names = {'#key': key_name}
+    values = {':key': {'S': key_value}}
+
+    if min_rank is not None or max_rank is not None:
+        names['#rank'] = 'fc_rank'
+        if min_rank is not None and max_rank is not None:
+            condition += ' AND #rank BETWEEN :min_rank AND :max_rank'
+        elif min_rank is not None:
+            condition += ' AND #rank >= :min_rank'
+        else:
+            condition += ' AND #rank <= :max_rank'
+        if min_rank is not None:
+            values[':min_rank'] = {'N': str(min_rank)}
+        if max_rank is not None:
+            values[':max_rank'] = {'N': str(max_rank)}
+
+    request = {
+        'TableName': TABLE_NAME,
+        'IndexName': index_name,
+        'KeyConditionExpression': condition,
+        'ExpressionAttributeNames': names,
+        'ExpressionAttributeValues': values,
+        'ScanIndexForward': True
+    }
+
+    items = []
+    while True:
+        if limit:
+            request['Limit'] = limit - len(items)
+        response = dynamodb.query(**request)
+        items.extend(deserialize_item(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response or (limit and len(items) >= limit):
+            return items
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def get_snapshot_manifest():
+    """
+    Returns the latest snapshot manifest, re-reading it from S3 at most every MANIFEST_TTL_SECONDS.
+    Returns None when no snapshot has been published.
+    """
+    if not BUCKET_NAME or SNAPSHOT_MODE == 'off':
+        return None
+
+    now = time.monotonic()
+    if _manifest_cache['checked_at'] and now - _manifest_cache['checked_at'] < MANIFEST_TTL_SECONDS:
+        return _manifest_cache['manifest']
+
+    try:
+        obj = s3.get_object(Bucket=BUCKET_NAME, Key=SNAPSHOT_MANIFEST_KEY)
+        manifest = json.loads(obj['Body'].read())
+    except Exception as e:
+        logger.info(f"No snapshot manifest available, falling back to scan: {e}")
+        manifest = None
+
+    _manifest_cache['manifest'] = manifest
+    _manifest_cache['checked_at'] = now
+    return manifest
+
+def get_snapshot_body(manifest):
+    """Returns the gzipped snapshot bytes for a manifest, reading the object once per version."""
+    if _snapshot_body_cache['version'] != manifest['version']:
+        body = s3.get_object(Bucket=BUCKET_NAME, Key=manifest['json_key'])['Body'].read()
+        _snapshot_body_cache['body'] = body
+        _snapshot_body_cache['version'] = manifest['version']
+    return _snapshot_body_cache['body']
+
+def get_search_index():
+    """
+    Returns (players, PlayerSearchIndex) for the current data, building the index
+    once per snapshot version (or once per cached scan when there is no snapshot).
+    """
+    manifest = get_snapshot_manifest()
+    if manifest:
+        source = manifest['version']
+        load_players = lambda: json.loads(gzip.decompress(get_snapshot_body(manifest)))
+    else:
+        source = full_list_cache.get()
+        load_players = lambda: json.loads(source)
+
+    if _search_index_cache['source'] != source:
+        players = load_players()
+        _search_index_cache['players'] = players
+        _search_index_cache['index'] = PlayerSearchIndex.from_players(players)
+        _search_index_cache['source'] = source
+    return _search_index_cache['players'], _search_index_cache['index']
+
+def snapshot_response(manifest, headers):
+    """Serves the full player list from the published snapshot instead of scanning the table."""
+    snapshot_headers = dict(headers, **{'X-Data-Version': manifest['version']})
+
+    if SNAPSHOT_MODE == 'redirect':
+        url = s3.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': BUCKET_NAME, 'Key': manifest['json_key']},
+            ExpiresIn=PRESIGNED_URL_TTL_SECONDS
+        )
+        snapshot_headers['Location'] = url
+        return {'statusCode': 302, 'headers': snapshot_headers, 'body': ''}
+
+    snapshot_headers['Content-Encoding'] = 'gzip'
+    return {
+        'statusCode': 200,
+        'headers': snapshot_headers,
+        'body': base64.b64encode(get_snapshot_body(manifest)).decode('ascii'),
+        'isBase64Encoded': True
+    }
 
 def lambda_handler(event, context):
     """
     AWS Lambda Handler for Data API
     Routes:
-    - GET /api/enriched-players: Returns all players (Scan)
+    - GET /api/enriched-players: Returns all players (S3 snapshot, Scan as fallback)
     - GET /api/enriched-players/sleeper/{id}: Returns single player
     - POST /api/enriched-players/batch: Returns multiple players
+    - GET /api/enriched-players/position/{pos}: Players at a position, by fc_rank (Query)
+    - GET /api/enriched-players/team/{team}: Players on an NFL team, by fc_rank (Query)
+      Both accept ?limit=&min_rank=&max_rank=
+    - GET /api/enriched-players/search?q=&position=&k=: Name prefix search, best value first
     """
-    print("Received event:", json.dumps(event))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", json.dumps(event))
     
     # Handle different event formats (API Gateway v1 vs v2)
     path = event.get('rawPath') or event.get('path')
@@ -41,18 +300,64 @@ def lambda_handler(event, context):
         return { 'statusCode': 200, 'headers': headers, 'body': '' }
 
     try:
+        # Route: Players by Position / Team (secondary index Query)
+        # Path pattern: /api/enriched-players/position/RB?limit=50
+        for prefix, (key_name, index_name) in INDEXED_ROUTES.items():
+            if path and path.startswith(prefix) and http_method == 'GET':
+                key_value = path[len(prefix):].strip('/').upper()
+                try:
+                    query = parse_rank_query(event.get('queryStringParameters'))
+                except ValueError as e:
+                    return {'statusCode': 400, 'headers': headers, 'body': dumps({'error': str(e)})}
+
+                items = query_index(index_name, key_name, key_value, **query)
+                return {
+                    'statusCode': 200,
+                    'headers': headers,
+                    'body': dumps(items)
+                }
+
+        # Route: Player search / autocomplete
+        # Path pattern: /api/enriched-players/search?q=jef&position=WR&k=10
+        if path == '/api/enriched-players/search' and http_method == 'GET':
+            try:
+                query, position, k = parse_search_query(event.get('queryStringParameters'))
+            except ValueError as e:
+                return {'statusCode': 400, 'headers': headers, 'body': dumps({'error': str(e)})}
+
+            players, index = get_search_index()
+            return {
+                'statusCode': 200,
+                'headers': headers,
+                'body': dumps([players[row] for row in index.search(query, k, position)])
+            }
+
         # Route: Get Single Player by ID
         # Path pattern: /api/enriched-players/sleeper/123
         if path and '/api/enriched-players/sleeper/' in path and http_method == 'GET':
             sleeper_id = path.split('/')[-1]
-            response = table.get_item(Key={'sleeper_id': sleeper_id})
-            item = response.get('Item')
-            
-            if item:
+            manifest = get_snapshot_manifest()
+            cached, body = player_cache.get(sleeper_id, manifest['version'] if manifest else None)
+
+            if not cached:
+                response = dynamodb.get_item(TableName=TABLE_NAME, Key={'sleeper_id': {'S': sleeper_id}})
+                item = response.get('Item')
+                body = dumps(deserialize_item(item)) if item else None
+                player_cache.put(sleeper_id, body)
+
+            logger.info(json.dumps({
+                'event': 'player_lookup',
+                'sleeper_id': sleeper_id,
+                'cache': 'hit' if cached else 'miss',
+                'found': body is not None,
+                **player_cache.stats()
+            }))
+
+            if body is not None:
                 return {
                     'statusCode': 200,
                     'headers': headers,
-                    'body': json.dumps(item, default=decimal_default)
+                    'body': body
                 }
             else:
                 return {
@@ -79,7 +384,7 @@ def lambda_handler(event, context):
 
             # Loop approach (naive but safe for small batches)
             # Optimization: Use dynamodb.batch_get_item
-            keys_to_get = [{'sleeper_id': str(sid)} for sid in sleeper_ids]
+            keys_to_get = [{'sleeper_id': {'S': str(sid)}} for sid in sleeper_ids]
             
             # Use Client for batch_get_item (Resource batch_get is also available)
             # We'll stick to a simple implementation for now:
@@ -92,28 +397,28 @@ def lambda_handler(event, context):
             
             # Note: UnprocessedKeys handling omitted for brevity in V1
             batch_response = dynamodb.batch_get_item(RequestItems=request_items)
-            results = batch_response.get('Responses', {}).get(TABLE_NAME, [])
+            results = [deserialize_item(item) for item in batch_response.get('Responses', {}).get(TABLE_NAME, [])]
             
             return {
                 'statusCode': 200,
                 'headers': headers,
-                'body': json.dumps(results, default=decimal_default)
+                'body': dumps(results)
             }
 
         # Route: Get All Enriched Players
         if path == '/api/enriched-players' and http_method == 'GET':
-            # Scan with pagination
-            response = table.scan()
-            items = response.get('Items', [])
-            
-            while 'LastEvaluatedKey' in response:
-                response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
-                items.extend(response.get('Items', []))
-                
+            manifest = get_snapshot_manifest()
+            if manifest:
+                try:
+                    return snapshot_response(manifest, headers)
+                except Exception as e:
+                    logger.warning(f"Snapshot read failed, falling back to scan: {e}")
+
+            # Scan with pagination (cached per container, one scan at a time)
             return {
                 'statusCode': 200,
                 'headers': headers,
-                'body': json.dumps(items, default=decimal_default)
+                'body': full_list_cache.get()
             }
 
         return {
@@ -123,7 +428,7 @@ def lambda_handler(event, context):
         }
 
     except Exception as e:
-        print(f"Error: {e}")
+        logger.exception(f"Error: {e}")
         return {
             'statusCode': 500,
             'headers': headers,
@@ -4,7 +4,9 @@ import os
 import pandas as pd
 import requests
 import io
+import gzip
 import math
+from datetime import datetime, timezone
 from decimal import Decimal
 from name_utils import cleanse_name
 
@@ -17,6 +19,11 @@ TABLE_NAME = os.environ.get('PLAYER_VALUES_TABLE', 'PlayerValues')
 table = dynamodb.Table(TABLE_NAME)
 BUCKET_NAME = os.environ.get('DATA_BUCKET_NAME')
 
+# Snapshot layout: each refresh writes snapshots/players/<version>/players.json.gz
+# (plus players.parquet when pyarrow is available), then repoints latest.json.
+SNAPSHOT_PREFIX = 'snapshots/players/'
+SNAPSHOT_MANIFEST_KEY = f'{SNAPSHOT_PREFIX}latest.json'
+
 def cleanse_df_names(df, name_column):
     """
     Applies name cleansing to a DataFrame column.
@@ -161,7 +168,10 @@ def fetch_fantasy_calc():
                     'fc_rank': p.get('overallRank'),
                     'trend_30_day': p.get('trend30Day'),
                     'redraft_value': p.get('redraftValue'),
-                    'player_name_original': name
+                    'player_name_original': name,
+                    # Keys for the byPosition/byTeam secondary indexes
+                    'position': player_info.get('position'),
+                    'team': player_info.get('maybeTeam')
                 })
         
         df = pd.DataFrame(processed)
@@ -173,6 +183,86 @@ def fetch_fantasy_calc():
         print(f"FantasyCalc Fetch Error: {e}")
         return pd.DataFrame()
 
+def to_snapshot_item(record):
+    """
+    Cleans a record for the JSON snapshot: drops NaN/None and stores whole floats as ints,
+    matching what a client gets back from DynamoDB.
+    """
+    cleaned = {}
+    for k, v in record.items():
+        if v is None:
+            continue
+        if isinstance(v, float):
+            if math.isnan(v):
+                continue
+            cleaned[k] = int(v) if v.is_integer() else v
+        else:
+            cleaned[k] = v
+    return cleaned
+
+def parquet_ready(df):
+    """Object columns holding mixed types (e.g. '6-1' and 73 in one column) are stored as strings."""
+    mixed = [
+        column for column in df.columns
+        if df[column].dtype == object and pd.api.types.infer_dtype(df[column], skipna=True) not in ('string', 'empty')
+    ]
+    if not mixed:
+        return df
+    return df.assign(**{column: df[column].astype('string') for column in mixed})
+
+def publish_snapshot(df, bucket):
+    """
+    Publishes a versioned snapshot of all enriched players to S3.
+    The manifest is written last so readers never see a partially written version.
+    """
+    if not bucket:
+        print("Bucket name not provided. Skipping snapshot.")
+        return None
+
+    version = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    items = [to_snapshot_item(r) for r in df.to_dict(orient='records') if r.get('sleeper_id')]
+    body = gzip.compress(json.dumps(items, separators=(',', ':')).encode('utf-8'))
+
+    json_key = f'{SNAPSHOT_PREFIX}{version}/players.json.gz'
+    s3.put_object(
+        Bucket=bucket,
+        Key=json_key,
+        Body=body,
+        ContentType='application/json',
+        ContentEncoding='gzip'
+    )
+
+    manifest = {
+        'version': version,
+        'count': len(items),
+        'json_key': json_key,
+        'generated_at': datetime.now(timezone.utc).isoformat()
+    }
+
+    # Columnar copy for analysis consumers. It is optional (the layer may not ship
+    # pyarrow), so a failed conversion must not keep the manifest below from being written.
+    parquet_buffer = io.BytesIO()
+    try:
+        parquet_ready(df).to_parquet(parquet_buffer, index=False)
+    except (ImportError, TypeError, ValueError) as e:
+        # pyarrow's ArrowTypeError/ArrowInvalid subclass TypeError/ValueError
+        print(f"Skipping Parquet snapshot: {e}")
+    else:
+        parquet_key = f'{SNAPSHOT_PREFIX}{version}/players.parquet'
+        s3.put_object(Bucket=bucket, Key=parquet_key, Body=parquet_buffer.getvalue(),
+                      ContentType='application/vnd.apache.parquet')
+        manifest['parquet_key'] = parquet_key
+
+    s3.put_object(
+        Bucket=bucket,
+        Key=SNAPSHOT_MANIFEST_KEY,
+        Body=json.dumps(manifest).encode('utf-8'),
+        ContentType='application/json',
+        CacheControl='no-cache'
+    )
+    print(f"Published snapshot {version} ({len(items)} players, {len(body)} bytes gzipped).")
+    return manifest
+
 def lambda_handler(event, context):
     print("Processing Lambda Triggered")
     
@@ -258,5 +348,12 @@ def lambda_handler(event, context):
             item = clean_record(record)
             if 'sleeper_id' in item:
                 batch.put_item(Item=item)
+
+    # 5. Publish the full snapshot the data API serves the player list from
+    try:
+        publish_snapshot(df_enriched, BUCKET_NAME)
+    except Exception as e:
+        # The table is already up to date; readers fall back to a scan.
+        print(f"Error publishing snapshot: {e}")
             
     return {'statusCode': 200, 'body': f'Successfully updated {len(records)} players.'}
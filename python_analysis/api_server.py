@@ -1,88 +1,137 @@
 # python_analysis/api_server_flask.py
-from flask import Flask, jsonify, request # Import 'request' for the POST route
+from flask import Flask, Response, jsonify, request # Import 'request' for the POST route
 from flask_cors import CORS
-import json
 import os
+import requests
+from player_store import PlayerStoreManager
+from query_params import (
+    ENRICHED_DATA_PATH, STORE_CHECK_INTERVAL_SECONDS, parse_rank_query, parse_search_query, parse_top_query
+)
+from sleeper_league import LeagueNotFound, enriched_league
 
 app = Flask(__name__)
 # Enable CORS to allow requests from your React frontend
-CORS(app) 
+CORS(app)
 
 # --- Configuration ---
-# Path to the enriched data, assuming this script is in python_analysis/
-CURRENT_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ENRICHED_DATA_PATH = os.path.join(CURRENT_SCRIPT_DIR, 'data_output', 'enriched_players_master.json')
+# The data path and check interval are shared with asgi_server (see query_params).
+# SERVE_STALE=true keeps answering from the previous data while a changed file is reloaded.
+SERVE_STALE = os.environ.get('SERVE_STALE', 'false').lower() == 'true'
+
+# The file is parsed once per version; requests share the immutable store
+store_manager = PlayerStoreManager(ENRICHED_DATA_PATH, STORE_CHECK_INTERVAL_SECONDS, SERVE_STALE)
 
 def load_data():
-    """Loads the enriched player data from the JSON file."""
-    # This function will now be called on each request, ensuring fresh data.
+    """Returns the current player store, reloading it only if the JSON file has changed."""
+    return store_manager.get()
+
+def json_response(body, status=200):
+    """Wraps an already-encoded JSON body."""
+    return Response(body, status=status, mimetype='application/json')
+
+def indexed_players_response(field, key):
+    """Shared handler for the position/team routes."""
     try:
-        print(f"--- PYTHON API: Attempting to load fresh data from: {ENRICHED_DATA_PATH}")
-        with open(ENRICHED_DATA_PATH, 'r', encoding='utf-8') as f:
-            enriched_player_data_list = json.load(f)
-        
-        # Create a map for quick O(1) lookups by sleeper_player_id
-        enriched_player_data_map_by_sleeper_id = {}
-        for player in enriched_player_data_list:
-            # Ensure the key exists and is not None before adding to map
-            if 'sleeper_id' in player and player['sleeper_id'] is not None:
-                enriched_player_data_map_by_sleeper_id[str(player['sleeper_id'])] = player
-        
-        print(f"--- PYTHON API: Successfully loaded and mapped {len(enriched_player_data_list)} players.")
-        return enriched_player_data_list, enriched_player_data_map_by_sleeper_id
-
-    except Exception as e:
-        print(f"FATAL: Could not load enriched player data: {e}")
-        return [], {}
-            
+        query = parse_rank_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return json_response(load_data().indexed_json(field, key, **query))
+
 # --- API Route Definitions ---
 
 @app.route('/api/enriched-players', methods=['GET'])
 def get_all_players():
     """Endpoint to get all enriched players."""
-    all_players, _ = load_data() # Load fresh data on each call
-    return jsonify(all_players)
+    store = load_data()
+    # Streamed from the shared table in chunks rather than copied whole per request
+    response = json_response(store.iter_all_json())
+    response.headers['Content-Length'] = str(len(store.all_json))
+    return response
 
 @app.route('/api/enriched-players/sleeper/<sleeper_id>', methods=['GET'])
 def get_player_by_sleeper_id(sleeper_id):
     """Endpoint to get a single player by their Sleeper ID."""
     print(f"--- PYTHON API DEBUG: Lookup for ID '{sleeper_id}' received.")
-    _, player_map = load_data() # Load fresh data on each call
-    player = player_map.get(str(sleeper_id)) # Ensure lookup key is a string
-    
-    if player:
+    player_json = load_data().player_json(sleeper_id)
+
+    if player_json:
         print(f"--- PYTHON API DEBUG: Lookup for ID '{sleeper_id}' returned: Data Found")
-        return jsonify(player)
+        return json_response(player_json)
     else:
         print(f"--- PYTHON API DEBUG: Lookup for ID '{sleeper_id}' returned: 404 - Not Found")
         return jsonify({"error": "Player not found by Sleeper ID"}), 404
 
+@app.route('/api/enriched-players/top', methods=['GET'])
+def get_top_players():
+    """
+    Endpoint to get the top N players by a metric, e.g. ?by=value&position=WR&n=50.
+    by: value (default), overall_rank or trend. Served from orderings precomputed per data version.
+    """
+    try:
+        by, position, n = parse_top_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        return json_response(load_data().top_json(by, position, n))
+    except KeyError:
+        return jsonify({"error": f"Unknown sort metric '{by}'"}), 400
+
+@app.route('/api/enriched-players/search', methods=['GET'])
+def search_players():
+    """
+    Endpoint for player search/autocomplete, e.g. ?q=jef&position=WR&k=10.
+    Matches name prefixes after cleanse_name normalization; best fantasy_calc_value first.
+    """
+    try:
+        query, position, k = parse_search_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return json_response(load_data().search_json(query, k, position))
+
+@app.route('/api/enriched-players/position/<position>', methods=['GET'])
+def get_players_by_position(position):
+    """Endpoint to get players at a position in rank order (?limit=&min_rank=&max_rank=)."""
+    return indexed_players_response('position', position)
+
+@app.route('/api/enriched-players/team/<team>', methods=['GET'])
+def get_players_by_team(team):
+    """Endpoint to get players on an NFL team in rank order (?limit=&min_rank=&max_rank=)."""
+    return indexed_players_response('team', team)
+
+@app.route('/api/enriched-players/league/<league_id>', methods=['GET'])
+def get_enriched_league(league_id):
+    """
+    Endpoint to get every team in a Sleeper league with enriched players and value totals.
+    Rosters, users and league info are fetched concurrently and cached briefly.
+    """
+    try:
+        return jsonify(enriched_league(league_id, load_data().get))
+    except LeagueNotFound:
+        return jsonify({"error": "League not found"}), 404
+    except requests.RequestException as e:
+        print(f"--- PYTHON API: Sleeper request failed for league '{league_id}': {e}")
+        return jsonify({"error": "Could not fetch league from Sleeper"}), 502
+
 @app.route('/api/enriched-players/batch', methods=['POST'])
 def get_players_by_sleeper_ids_batch():
     """Endpoint to get a batch of players from a list of Sleeper IDs."""
     print(f"--- PYTHON API DEBUG: Received request to look up a batch of IDs.")
-    _, player_map = load_data() # Load fresh data on each call
-    
+    store = load_data()
+
     request_data = request.json
     if not request_data or 'sleeper_ids' not in request_data:
         return jsonify({"error": "Missing 'sleeper_ids' in request body"}), 400
-        
+
     sleeper_ids = request_data.get('sleeper_ids', [])
     if not isinstance(sleeper_ids, list):
         return jsonify({"error": "'sleeper_ids' must be a list"}), 400
-    
+
     print(f"--- PYTHON API DEBUG: Sample of IDs to look up: {sleeper_ids[:5]} ...")
 
-    results = []
-    for s_id in sleeper_ids:
-        player_data = player_map.get(str(s_id))
-        if player_data:
-            results.append(player_data)
-        else:
-            results.append({"sleeper_id": str(s_id), "error": "Data not found"})
-            
-    return jsonify(results)
+    return json_response(store.batch_json(sleeper_ids))
 
 if __name__ == '__main__':
-    # We no longer need to load data on startup, it will happen per-request.
+    # Data is loaded on the first request and reloaded when the file changes.
     app.run(port=5002, debug=True)
@@ -0,0 +1,201 @@
+"""
+Async (ASGI) serving mode for the Python player API.
+
+Serves the same routes and response bodies as api_server.py, but on an ASGI
+server so one slow request no longer blocks a worker:
+
+    uvicorn asgi_server:app --port 5002
+
+Blocking work (stat-ing and parsing the data file, building the player table)
+runs in the default thread pool executor. A background task watches the file
+and swaps in a new PlayerStore when it changes. Requests that are already
+running keep the store they started with, so a reload never drops or mixes
+in-flight requests.
+"""
+
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+import requests
+
+from player_store import PlayerStoreManager
+from query_params import (
+    ENRICHED_DATA_PATH, STORE_CHECK_INTERVAL_SECONDS, parse_rank_query, parse_search_query, parse_top_query
+)
+from sleeper_league import LeagueNotFound, enriched_league
+from player_table import JSON_CHUNK_BYTES, encode
+
+PREFIX = '/api/enriched-players'
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'OPTIONS,GET,POST'),
+    (b'access-control-allow-headers', b'Content-Type,Authorization'),
+]
+
+
+def error(status, message):
+    return status, encode({"error": message})
+
+
+class PlayerAPI:
+    """
+    ASGI application for the enriched player routes.
+
+    Args:
+        path: The enriched players JSON file.
+        check_interval: Seconds between checks of the file for a new version.
+    """
+
+    def __init__(self, path, check_interval=STORE_CHECK_INTERVAL_SECONDS):
+        # The manager is only called from the executor; the event loop reads self.store
+        self.manager = PlayerStoreManager(path, check_interval=0)
+        self.check_interval = check_interval
+        self.store = None
+        self._load_lock = None
+        self._watcher = None
+
+    async def current_store(self):
+        """The current store, loaded in the executor on first use."""
+        if self.store is None:
+            if self._load_lock is None:
+                self._load_lock = asyncio.Lock()
+            async with self._load_lock:
+                if self.store is None:
+                    loop = asyncio.get_running_loop()
+                    self.store = await loop.run_in_executor(None, self.manager.get)
+                    if self._watcher is None:
+                        self._watcher = asyncio.create_task(self.watch())
+        return self.store
+
+    async def refresh(self):
+        """Checks the file and swaps in the new store if it changed."""
+        loop = asyncio.get_running_loop()
+        self.store = await loop.run_in_executor(None, self.manager.get)
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"--- PYTHON API: Reload check failed, keeping current data: {e}")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await self.current_store()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._watcher:
+                    self._watcher.cancel()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        body = b''
+        while True:
+            message = await receive()
+            body += message.get('body', b'')
+            if not message.get('more_body'):
+                return body
+
+    async def route(self, method, path, args, receive):
+        """Returns (status, encoded JSON body) for a request."""
+        path = path.rstrip('/')
+        store = await self.current_store()
+
+        if method == 'GET':
+            if path == PREFIX:
+                return 200, store.all_json
+
+            if path == f'{PREFIX}/top':
+                try:
+                    by, position, n = parse_top_query(args)
+                except ValueError as e:
+                    return error(400, str(e))
+                try:
+                    return 200, store.top_json(by, position, n)
+                except KeyError:
+                    return error(400, f"Unknown sort metric '{by}'")
+
+            if path == f'{PREFIX}/search':
+                try:
+                    query, position, k = parse_search_query(args)
+                except ValueError as e:
+                    return error(400, str(e))
+                return 200, store.search_json(query, k, position)
+
+            if path.startswith(f'{PREFIX}/sleeper/'):
+                player_json = store.player_json(path.rsplit('/', 1)[-1])
+                if player_json:
+                    return 200, player_json
+                return error(404, "Player not found by Sleeper ID")
+
+            if path.startswith(f'{PREFIX}/league/'):
+                league_id = path.rsplit('/', 1)[-1]
+                loop = asyncio.get_running_loop()
+                try:
+                    league = await loop.run_in_executor(None, enriched_league, league_id, store.get)
+                except LeagueNotFound:
+                    return error(404, "League not found")
+                except requests.RequestException as e:
+                    print(f"--- PYTHON API: Sleeper request failed for league '{league_id}': {e}")
+                    return error(502, "Could not fetch league from Sleeper")
+                return 200, encode(league)
+
+            for field in ('position', 'team'):
+                if path.startswith(f'{PREFIX}/{field}/'):
+                    try:
+                        query = parse_rank_query(args)
+                    except ValueError as e:
+                        return error(400, str(e))
+                    return 200, store.indexed_json(field, path.rsplit('/', 1)[-1], **query)
+
+        if method == 'POST' and path == f'{PREFIX}/batch':
+            try:
+                request_data = json.loads(await self.read_body(receive) or b'null')
+            except ValueError:
+                return error(400, "Request body must be JSON")
+            if not isinstance(request_data, dict) or 'sleeper_ids' not in request_data:
+                return error(400, "Missing 'sleeper_ids' in request body")
+            sleeper_ids = request_data.get('sleeper_ids', [])
+            if not isinstance(sleeper_ids, list):
+                return error(400, "'sleeper_ids' must be a list")
+            return 200, store.batch_json(sleeper_ids)
+
+        return error(404, "Route not found")
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        method = scope['method']
+        if method == 'OPTIONS':
+            status, body, headers = 200, b'', CORS_HEADERS
+        else:
+            args = {k: v[0] for k, v in parse_qs(scope.get('query_string', b'').decode('latin-1')).items()}
+            status, body = await self.route(method, scope['path'], args, receive)
+            headers = [(b'content-type', b'application/json')] + CORS_HEADERS[:1]
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers + [(b'content-length', str(len(body)).encode('ascii'))],
+        })
+        if isinstance(body, memoryview):
+            # The full list is a view of the shared table; send it in bounded bytes chunks
+            for start in range(0, len(body), JSON_CHUNK_BYTES):
+                end = start + JSON_CHUNK_BYTES
+                await send({'type': 'http.response.body', 'body': bytes(body[start:end]), 'more_body': end < len(body)})
+            if len(body):
+                return
+        await send({'type': 'http.response.body', 'body': body})
+
+
+app = PlayerAPI(ENRICHED_DATA_PATH)
@@ -4,6 +4,8 @@ import os
 import numpy as np
 import requests
 from name_utils import cleanse_name
+from player_ids import refresh_crosswalk
+from sleeper_players import changed_ids, clear_changes, read_pending_changes
 
 # --- Configuration ---
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -42,6 +44,10 @@ def fetch_fantasy_calc_data(is_dynasty=True, num_qbs=2, ppr=1):
         if not isinstance(players, list):
             print("WARNING: FantasyCalc API did not return a valid list.")
             return pd.DataFrame()
+        try:
+            refresh_crosswalk(fantasycalc_players=players)
+        except OSError as e:
+            print(f"WARNING: Could not update the player ID crosswalk. Error: {e}")
         player_list = [{'sleeper_id': str(p['player']['sleeperId']), 'fantasy_calc_value': p.get('value')} for p in players if p.get('player', {}).get('sleeperId')]
         df = pd.DataFrame(player_list)
         print(f"Successfully loaded {len(df)} players with Sleeper IDs from FantasyCalc.")
@@ -134,10 +140,17 @@ def load_and_prep_excel(file_path, column_rename_map, original_name_col='Player'
         print(f"WARNING: Could not load or process {os.path.basename(file_path)}. Error: {e}")
         return pd.DataFrame()
 
-def load_sleeper_player_data(file_path):
+def load_sleeper_player_data(file_path, sleeper_ids=None):
+    """Loads the Sleeper players dump; only the given IDs when sleeper_ids is set."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
+        if sleeper_ids is not None:
+            data = {player_id: details for player_id, details in data.items() if player_id in sleeper_ids}
+        try:
+            refresh_crosswalk(sleeper_players=data)
+        except OSError as e:
+            print(f"WARNING: Could not update the player ID crosswalk. Error: {e}")
         player_list = []
         for player_id, details in data.items():
             player_obj = details.copy()
@@ -153,17 +166,75 @@ def load_sleeper_player_data(file_path):
         print(f"Halting process: Error loading Sleeper data: {e}")
         return pd.DataFrame()
 
-def main():
+def load_enriched_records(file_path):
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def merge_enriched_records(existing, updated, changes, fantasy_calc_values=None):
+    """
+    Applies an incremental run to the previous master list: records for removed
+    and re-processed players are replaced. With fantasy_calc_values ({sleeper_id: value}),
+    the kept records get the current FantasyCalc value, and those FantasyCalc no
+    longer lists are dropped, as a full run's inner join would.
+    """
+    replaced = {str(record.get('sleeper_id')) for record in updated}
+    replaced |= changed_ids(changes) | set(changes.get('removed') or [])
+    kept = [record for record in existing if str(record.get('sleeper_id')) not in replaced]
+    if fantasy_calc_values is not None:
+        kept = [
+            dict(record, fantasy_calc_value=fantasy_calc_values[str(record.get('sleeper_id'))])
+            for record in kept if str(record.get('sleeper_id')) in fantasy_calc_values
+        ]
+    return kept + updated
+
+
+def main(changes_path=None):
+    """
+    Builds the enriched master list. With changes_path (the pending changes file
+    written by sleeper_players.refresh_players), only new and changed Sleeper
+    players, plus players new to FantasyCalc, are re-enriched. Removed players are
+    dropped. Every other record keeps its enrichment but gets the current
+    fantasy_calc_value. The changes file is cleared once the master list is saved.
+    """
     print("--- Starting Player Data Enrichment Process ---")
-    
-    df_sleeper_players = load_sleeper_player_data(SLEEPER_PLAYERS_JSON_PATH)
-    if df_sleeper_players.empty: return
+
+    changes = None
+    existing_records = None
+    if changes_path:
+        existing_records = load_enriched_records(ENRICHED_PLAYERS_OUTPUT_PATH)
+        if existing_records is None:
+            print("No existing master list to update; running a full enrichment.")
+        else:
+            changes = read_pending_changes(changes_path) or {'new': {}, 'changed': {}, 'removed': []}
+            print(f"Incremental run: {len(changed_ids(changes))} new or changed Sleeper players, "
+                  f"{len(changes.get('removed') or [])} removed.")
 
     df_fantasy_calc = fetch_fantasy_calc_data()
     if df_fantasy_calc.empty:
         print("Halting process: Cannot proceed without FantasyCalc value data.")
         return
 
+    sleeper_ids = None
+    fantasy_calc_values = None
+    if changes:
+        fantasy_calc_values = dict(zip(df_fantasy_calc['sleeper_id'].astype(str), df_fantasy_calc['fantasy_calc_value']))
+        known_ids = {str(record.get('sleeper_id')) for record in existing_records}
+        sleeper_ids = changed_ids(changes) | (set(fantasy_calc_values) - known_ids)
+
+    df_sleeper_players = load_sleeper_player_data(SLEEPER_PLAYERS_JSON_PATH, sleeper_ids=sleeper_ids)
+    if df_sleeper_players.empty:
+        if changes:
+            records = merge_enriched_records(existing_records, [], changes, fantasy_calc_values)
+            with open(ENRICHED_PLAYERS_OUTPUT_PATH, 'w', encoding='utf-8') as f:
+                json.dump(records, f, indent=4)
+            clear_changes(changes_path)
+            print(f"--- No players to re-enrich; master list now has {len(records)} players. ---")
+        return
+
     ai_analysis_lookup = load_consolidated_analysis(CONSOLIDATED_ANALYSIS_PATH)
 
     sf_rename_map = {'Dynasty_Overall': 'overall_rank', 'Overall': 'overall_rank', 'Dynasty_Positional_Rank': 'positional_rank', 'Positional Rank': 'positional_rank', 'Dynasty_Tier': 'tier', 'Tier': 'tier'}
@@ -274,9 +345,17 @@ def main():
     df_final_enriched = df_final_enriched.astype(object)
     df_final = df_final_enriched.replace({np.nan: None})
     records = df_final.to_dict(orient='records')
+    if changes:
+        records = merge_enriched_records(existing_records, records, changes, fantasy_calc_values)
+        print(f"Merged {len(df_final)} re-enriched players into the master list ({len(records)} players).")
     with open(ENRICHED_PLAYERS_OUTPUT_PATH, 'w', encoding='utf-8') as f:
         json.dump(records, f, indent=4)
+    if changes_path:
+        # A full run covers the pending changes too
+        clear_changes(changes_path)
     print(f"--- Data Consolidation Complete! Enriched data saved to: {ENRICHED_PLAYERS_OUTPUT_PATH} ---")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # python create_player_data.py [changes.json]
+    import sys
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Streaming Fleaflicker roster ingestion for one or many leagues.
+
+Each FetchLeagueRosters response is flattened in a single pass by a generator
+(one row per rostered player), and the rows from every league are collected
+straight into typed columns. Leagues and scoring periods are fetched
+concurrently over one pooled session; a shared RateLimiter keeps the request
+rate polite no matter how many workers are running.
+
+    rosters = fetch_rosters([(197269, 2024, 18), (312861, 2024, 18)])
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from name_utils import cleanse_name
+from player_ids import PlayerIdCrosswalk
+
+FLEAFLICKER_ROSTERS_URL = 'https://www.fleaflicker.com/api/FetchLeagueRosters'
+REQUEST_TIMEOUT_SECONDS = 15
+MAX_WORKERS = 8
+REQUESTS_PER_SECOND = 5
+
+ROSTER_COLUMNS = [
+    'league_id', 'season', 'scoring_period', 'team_id', 'team_name',
+    'fleaflicker_id', 'name', 'position', 'pro_team',
+]
+ROSTER_DTYPES = {
+    'league_id': 'int64',
+    'season': 'int16',
+    'scoring_period': 'int16',
+    'team_id': 'Int64',
+    'team_name': 'category',
+    'fleaflicker_id': 'Int64',
+    'name': 'string',
+    'position': 'category',
+    'pro_team': 'category',
+}
+
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=MAX_WORKERS))
+
+
+class RateLimiter:
+    """Spaces calls to acquire() at least 1/rate seconds apart, across threads."""
+
+    def __init__(self, rate_per_second):
+        self.interval = 1.0 / rate_per_second if rate_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def fetch_league_rosters(league_id, season, scoring_period, limiter=None):
+    """Raw FetchLeagueRosters response for one league and scoring period."""
+    if limiter:
+        limiter.acquire()
+    response = session.get(FLEAFLICKER_ROSTERS_URL, params={
+        "sport": "NFL", "league_id": league_id, "season": season, "scoring_period": scoring_period
+    }, timeout=REQUEST_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    return response.json()
+
+
+def iter_roster_rows(payload, league_id, season, scoring_period):
+    """Yields one tuple (in ROSTER_COLUMNS order) per rostered player, in a single pass."""
+    for roster in payload.get('rosters') or []:
+        team = roster.get('team') or {}
+        for player in roster.get('players') or []:
+            pro_player = player.get('proPlayer') or {}
+            yield (
+                league_id, season, scoring_period, team.get('id'), team.get('name'),
+                pro_player.get('id'), pro_player.get('nameFull'), pro_player.get('position'),
+                pro_player.get('proTeamAbbreviation'),
+            )
+
+
+def rosters_frame(rows, crosswalk=None):
+    """
+    Builds the typed roster frame from roster rows, adding 'player_cleansed_name'
+    and 'sleeper_id' (via the player ID crosswalk; NaN where it has no mapping).
+    """
+    columns = list(zip(*rows)) or [()] * len(ROSTER_COLUMNS)
+    df = pd.DataFrame({name: pd.Series(values, dtype=object) for name, values in zip(ROSTER_COLUMNS, columns)})
+    df = df.astype(ROSTER_DTYPES)
+    df['player_cleansed_name'] = df['name'].map(cleanse_name, na_action='ignore').astype('category')
+    crosswalk = crosswalk if crosswalk is not None else PlayerIdCrosswalk.load()
+    df['sleeper_id'] = crosswalk.map_series('fleaflicker', df['fleaflicker_id'])
+    return df
+
+
+def fetch_rosters(leagues, max_workers=MAX_WORKERS, rate_per_second=REQUESTS_PER_SECOND, crosswalk=None, strict=False):
+    """
+    Fetches rosters for many (league_id, season, scoring_period) combinations concurrently.
+
+    Args:
+        strict: Raise the first league's error instead of skipping it.
+
+    Returns:
+        One roster frame (see rosters_frame) for all of them. Unless strict, a league
+        that fails to load is reported and skipped so the others still come through.
+    """
+    leagues = list(leagues)
+    limiter = RateLimiter(rate_per_second)
+
+    def load(league):
+        league_id, season, scoring_period = league
+        try:
+            payload = fetch_league_rosters(league_id, season, scoring_period, limiter)
+        except (requests.RequestException, ValueError) as e:
+            if strict:
+                raise
+            print(f"WARNING: Could not fetch Fleaflicker rosters for league {league_id} ({season}, period {scoring_period}): {e}")
+            return []
+        return list(iter_roster_rows(payload, league_id, season, scoring_period))
+
+    rows = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(leagues)))) as executor:
+        for league_rows in executor.map(load, leagues):
+            rows.extend(league_rows)
+    return rosters_frame(rows, crosswalk)
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings for the Python player API.
+
+    gunicorn -c gunicorn.conf.py api_server:app
+
+The enriched data is written once as a memory-mapped player table (see
+player_table.py) and every worker maps the same files, so adding workers
+costs only their light per-process indexes.
+"""
+
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5002')
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+
+# Load the app in the master so the table is built before the workers fork
+preload_app = True
+
+
+def on_starting(server):
+    import api_server
+    api_server.store_manager.get()
@@ -0,0 +1,181 @@
+"""
+Keeper/cut selection for every team in a league at once.
+
+Each team keeps `roster_size` players and must keep at least minimums[pos]
+players at each listed position. Because positions are disjoint, the best
+keeper set is: the top minimums[pos] players at each position, then the best
+remaining players of any position up to the roster size.
+
+KeeperEngine sorts the league once (team, then value, best first) and ranks
+every player within their team and within their (team, position) with NumPy.
+After that, each selection is a few vector operations. A whole league or a
+sweep of what-if roster sizes runs in milliseconds.
+
+    engine = KeeperEngine(df, 'NNF_Team', sort_by='value', value_col='Value', position_col='Pos')
+    result = engine.select(roster_size=10, minimums={'QB': 1, 'RB': 2, 'WR': 2, 'TE': 1})
+    result.summary              # kept/dropped counts and values per team
+    result.available            # every dropped player, best first
+    engine.what_if([8, 10, 12], minimums={'QB': 1})
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from team_reports import TeamReport
+
+
+@dataclass
+class KeeperResult(TeamReport):
+    """A TeamReport whose 'status' follows the constrained selection, plus the league's dropped players."""
+    available: pd.DataFrame
+    position_col: str
+
+    def available_by_position(self):
+        """Players and total value left available at each position, richest first."""
+        values = self.available['keeper_value']
+        return (values.groupby(self.available[self.position_col], observed=True)
+                .agg(players='count', total_value='sum')
+                .sort_values('total_value', ascending=False))
+
+
+def _group_rank(sorted_keys):
+    """0-based position of each row within its run of equal keys (keys must be sorted)."""
+    n = len(sorted_keys)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    return np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+
+
+class KeeperEngine:
+    """
+    Pre-sorted, pre-ranked league rosters ready for keeper selection.
+
+    Args:
+        df: One row per rostered player.
+        group_col: The team column.
+        sort_by: Column players are ranked by (best first; missing values rank last).
+        value_col: Column summed into kept/dropped values (defaults to sort_by).
+        position_col: Column the positional minimums apply to.
+        teams: "all" or a list of teams to include, reported in that order.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        group_col: str,
+        sort_by: str,
+        value_col: Optional[str] = None,
+        position_col: str = 'Pos',
+        teams: Union[str, List[str]] = "all"
+    ):
+        self.group_col = group_col
+        self.sort_by = sort_by
+        self.position_col = position_col
+        data = df[df[group_col].notna()] if teams == "all" else df[df[group_col].isin(teams)]
+
+        rank_key = pd.to_numeric(data[sort_by], errors='coerce').to_numpy(dtype=float)
+        rank_key = np.where(np.isnan(rank_key), -np.inf, rank_key)
+        if teams == "all":
+            team_codes, self.team_names = pd.factorize(data[group_col], sort=True)
+        else:
+            # Teams are reported in the order given, as in team_reports.build_team_report
+            present = set(data[group_col])
+            self.team_names = pd.Index([team for team in dict.fromkeys(teams) if team in present])
+            team_codes = self.team_names.get_indexer(data[group_col])
+        positions = data[position_col] if position_col in data.columns else pd.Series(None, index=data.index, dtype=object)
+        position_codes, self.positions = pd.factorize(positions, sort=True)
+
+        # Team, then best first; lexsort is stable so ties keep their input order
+        order = np.lexsort((-rank_key, team_codes))
+        self.data = data.iloc[order].reset_index(drop=True)
+        self.team = team_codes[order]
+        self.position = position_codes[order] + 1  # 0 = no position
+        self.rank_key = rank_key[order]
+        self.values = pd.to_numeric(self.data[value_col or sort_by], errors='coerce').fillna(0).to_numpy(dtype=float)
+
+        n = len(order)
+        self.team_rank = _group_rank(self.team)
+        self.team_start = np.arange(n) - self.team_rank
+        # Rank within (team, position): a stable sort by position keeps the best-first order inside each group
+        by_position = np.lexsort((np.arange(n), self.position, self.team))
+        group_keys = self.team[by_position] * (len(self.positions) + 1) + self.position[by_position]
+        self.position_rank = np.empty(n, dtype=np.int64)
+        self.position_rank[by_position] = _group_rank(group_keys)
+
+    def _minimums_array(self, roster_size, minimums):
+        minimums = minimums or {}
+        if sum(minimums.values()) > roster_size:
+            raise ValueError(f"Positional minimums ({sum(minimums.values())}) exceed the roster size ({roster_size})")
+        required = np.zeros(len(self.positions) + 1, dtype=np.int64)
+        for position, count in minimums.items():
+            if position in self.positions:
+                required[self.positions.get_loc(position) + 1] = count
+        return required
+
+    def keep_mask(self, roster_size: int, minimums: Optional[Dict[str, int]] = None) -> np.ndarray:
+        """Boolean keep flag per player (in self.data order) under the roster size and positional minimums."""
+        required = self._minimums_array(roster_size, minimums)
+        mandatory = self.position_rank < required[self.position]
+        mandatory_count = np.bincount(self.team, weights=mandatory, minlength=len(self.team_names))
+        open_slots = roster_size - mandatory_count
+
+        # Best-first rank of each remaining player among their team's remaining players
+        flex = ~mandatory
+        flex_before = np.r_[0, np.cumsum(flex)]
+        flex_rank = flex_before[1:] - flex_before[self.team_start] - 1
+        return mandatory | (flex & (flex_rank < open_slots[self.team]))
+
+    def _summary(self, kept):
+        teams = len(self.team_names)
+        kept_value = np.bincount(self.team, weights=np.where(kept, self.values, 0), minlength=teams)
+        total_value = np.bincount(self.team, weights=self.values, minlength=teams)
+        players = np.bincount(self.team, minlength=teams)
+        kept_count = np.bincount(self.team, weights=kept, minlength=teams).astype(np.int64)
+        return pd.DataFrame({
+            'players': players,
+            'total_value': total_value,
+            'kept': kept_count,
+            'dropped': players - kept_count,
+            'kept_value': kept_value,
+            'dropped_value': total_value - kept_value,
+        }, index=pd.Index(self.team_names, name=self.group_col))
+
+    def select(self, roster_size: int, minimums: Optional[Dict[str, int]] = None) -> KeeperResult:
+        """
+        Picks every team's keepers.
+
+        Returns:
+            KeeperResult. players has 'team_rank', 'status' (Keep/Drop) and 'keeper_value';
+            summary has players, total_value, kept, dropped, kept_value and dropped_value per
+            team; available lists every dropped player, best first.
+        """
+        kept = self.keep_mask(roster_size, minimums)
+        players = self.data.assign(
+            team_rank=self.team_rank + 1,
+            status=np.where(kept, 'Keep', 'Drop'),
+            keeper_value=self.values,
+        )
+        dropped = np.flatnonzero(~kept)
+        dropped = dropped[np.argsort(-self.rank_key[dropped], kind='stable')]
+        return KeeperResult(
+            players=players,
+            summary=self._summary(kept),
+            group_col=self.group_col,
+            available=players.iloc[dropped].reset_index(drop=True),
+            position_col=self.position_col,
+        )
+
+    def what_if(self, roster_sizes: Iterable[int], minimums: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+        """Team summaries for each roster size, indexed by (roster_size, team)."""
+        summaries = {size: self._summary(self.keep_mask(size, minimums)) for size in roster_sizes}
+        return pd.concat(summaries, names=['roster_size'])
+
+
+def select_keepers(df, group_col, sort_by, roster_size, minimums=None, value_col=None, position_col='Pos', teams="all"):
+    """One-off selection; see KeeperEngine.select."""
+    engine = KeeperEngine(df, group_col, sort_by, value_col=value_col, position_col=position_col, teams=teams)
+    return engine.select(roster_size, minimums)
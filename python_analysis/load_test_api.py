@@ -0,0 +1,73 @@
+"""
+Load test for the local Flask API (api_server.py).
+
+Times each route through Flask's test client, first with the in-memory player
+store and then with the old behaviour of re-reading and re-mapping the JSON
+file on every request, and prints per-route latency.
+
+Usage:
+    python load_test_api.py [requests_per_route]
+"""
+
+import json
+import statistics
+import sys
+import time
+
+import api_server
+
+ROUTES = [
+    ('GET', '/api/enriched-players', None),
+    ('GET', '/api/enriched-players/sleeper/{sample_id}', None),
+    ('POST', '/api/enriched-players/batch', 'batch'),
+]
+
+
+def time_route(client, method, path, body, count, before_request=None):
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        if before_request:
+            before_request()
+        if method == 'POST':
+            response = client.post(path, json=body)
+        else:
+            response = client.get(path)
+        response.get_data()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"  {label:<45} mean {statistics.mean(timings):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def run(count):
+    with open(api_server.ENRICHED_DATA_PATH, 'r', encoding='utf-8') as f:
+        players = json.load(f)
+    sample_ids = [str(p['sleeper_id']) for p in players[:40]]
+    bodies = {'batch': {'sleeper_ids': sample_ids}}
+
+    api_server.app.config['TESTING'] = True
+    client = api_server.app.test_client()
+    client.get('/api/enriched-players')  # warm the store
+
+    def legacy_reload():
+        # Old behaviour: every request parsed the file and rebuilt the ID map
+        with open(api_server.ENRICHED_DATA_PATH, 'r', encoding='utf-8') as f:
+            legacy_players = json.load(f)
+        {str(p['sleeper_id']): p for p in legacy_players}
+
+    print(f"{len(players)} players, {count} requests per route")
+    for mode, before in (('in-memory store', None), ('re-read file per request', legacy_reload)):
+        print(f"\n{mode}:")
+        for method, path, body_key in ROUTES:
+            path = path.format(sample_id=sample_ids[0])
+            timings = time_route(client, method, path, bodies.get(body_key), count, before)
+            summarize(f"{method} {path}", timings)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
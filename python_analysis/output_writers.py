@@ -0,0 +1,182 @@
+"""
+Bulk writers for analysis outputs.
+
+pandas' default to_excel goes through openpyxl's full object model, building a
+styled cell object for every value before anything reaches disk. write_xlsx
+streams rows instead:
+
+  - with XlsxWriter (constant_memory mode), each row is flushed as it is written;
+  - without it, openpyxl's write-only workbook is used.
+
+Both keep the sheet formatting: a bold, frozen, filterable header, column widths
+sized from the data, and optional per-column number formats.
+
+write_outputs writes the same frame as any mix of xlsx, Parquet and CSV
+siblings, so downstream code can read the columnar copy instead of the workbook.
+write_many runs several of those in parallel processes:
+
+    write_outputs(df, 'data/output/superflex_rookies', formats=('xlsx', 'parquet'))
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:  # pragma: no cover - openpyxl's write-only mode is the fallback
+    xlsxwriter = None
+
+OUTPUT_FORMATS = ('xlsx', 'parquet', 'csv')
+MAX_COLUMN_WIDTH = 50
+WIDTH_SAMPLE_ROWS = 1000
+# Below this many cells across all jobs, starting worker processes costs more than it saves
+PARALLEL_MIN_CELLS = 200_000
+
+
+def _cells(df):
+    """The frame as a 2-D object array of native Python values, NaN/NaT as None (one conversion for all columns)."""
+    cells = df.astype(object).to_numpy()
+    cells[df.isna().to_numpy()] = None
+    return cells
+
+
+def column_widths(df, cells=None):
+    """Display width per column: the longest header or value in the first WIDTH_SAMPLE_ROWS rows, capped."""
+    sample = (_cells(df.head(WIDTH_SAMPLE_ROWS)) if cells is None else cells[:WIDTH_SAMPLE_ROWS]).T.tolist()
+    return [
+        min(max([len(str(column))] + [len(str(value)) for value in values if value is not None]) + 2, MAX_COLUMN_WIDTH)
+        for column, values in zip(df.columns, sample)
+    ]
+
+
+def _write_xlsxwriter(df, path, sheet_name, number_formats):
+    # Values are written as they are: no URL/formula detection on every string
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'strings_to_urls': False, 'strings_to_formulas': False})
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        header = workbook.add_format({'bold': True, 'bottom': 1})
+        formats = {column: workbook.add_format({'num_format': fmt}) for column, fmt in number_formats.items()}
+        cells = _cells(df)
+        for i, (column, width) in enumerate(zip(df.columns, column_widths(df, cells))):
+            worksheet.set_column(i, i, width, formats.get(column))
+        worksheet.write_row(0, 0, [str(column) for column in df.columns], header)
+        worksheet.freeze_panes(1, 0)
+        if len(df.columns):
+            worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
+        for row, values in enumerate(cells.tolist(), start=1):
+            worksheet.write_row(row, 0, values)
+    finally:
+        workbook.close()
+
+
+def _write_openpyxl(df, path, sheet_name, number_formats):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Border, Font, Side
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    cells = _cells(df)
+    for i, width in enumerate(column_widths(df, cells), start=1):
+        worksheet.column_dimensions[get_column_letter(i)].width = width
+    worksheet.freeze_panes = 'A2'
+    if len(df.columns):
+        worksheet.auto_filter.ref = f"A1:{get_column_letter(len(df.columns))}{len(df) + 1}"
+
+    header_font, header_border = Font(bold=True), Border(bottom=Side(style='thin'))
+    header = []
+    for column in df.columns:
+        cell = WriteOnlyCell(worksheet, value=str(column))
+        cell.font, cell.border = header_font, header_border
+        header.append(cell)
+    worksheet.append(header)
+
+    formatted = {i: number_formats[column] for i, column in enumerate(df.columns) if column in number_formats}
+    for values in cells.tolist():
+        if formatted:
+            values = list(values)
+            for i, fmt in formatted.items():
+                cell = WriteOnlyCell(worksheet, value=values[i])
+                cell.number_format = fmt
+                values[i] = cell
+        worksheet.append(values)
+    workbook.save(path)
+
+
+def write_xlsx(df, path, sheet_name='Sheet1', number_formats=None):
+    """
+    Streams a frame to an .xlsx file (no index).
+
+    Args:
+        df: The frame to write.
+        path: Output .xlsx path.
+        sheet_name: Worksheet name.
+        number_formats: Optional {column: Excel number format}, e.g. {'value': '#,##0'}.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    writer = _write_xlsxwriter if xlsxwriter is not None else _write_openpyxl
+    writer(df, path, sheet_name, number_formats or {})
+    return path
+
+
+def parquet_ready(df):
+    """Object columns holding mixed types (e.g. '6-1' and 73 in one column) are stored as strings."""
+    mixed = [
+        column for column in df.columns
+        if df[column].dtype == object and pd.api.types.infer_dtype(df[column], skipna=True) not in ('string', 'empty')
+    ]
+    if not mixed:
+        return df
+    return df.assign(**{column: df[column].astype('string') for column in mixed})
+
+
+def write_outputs(df, base_path, formats=('xlsx',), sheet_name='Sheet1', number_formats=None):
+    """
+    Writes a frame as sibling files <base_path>.<fmt> for each requested format.
+
+    Args:
+        formats: Any of OUTPUT_FORMATS ('xlsx', 'parquet', 'csv').
+
+    Returns:
+        dict: format -> written path.
+    """
+    unknown = set(formats) - set(OUTPUT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unsupported output format(s) {sorted(unknown)} (use {', '.join(OUTPUT_FORMATS)})")
+    os.makedirs(os.path.dirname(os.path.abspath(base_path)), exist_ok=True)
+
+    written = {}
+    for fmt in formats:
+        path = f'{base_path}.{fmt}'
+        if fmt == 'xlsx':
+            write_xlsx(df, path, sheet_name=sheet_name, number_formats=number_formats)
+        elif fmt == 'parquet':
+            parquet_ready(df).to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False)
+        written[fmt] = path
+    return written
+
+
+def _write_outputs_job(job):
+    df, base_path, kwargs = job
+    return write_outputs(df, base_path, **kwargs)
+
+
+def write_many(jobs, max_workers=None):
+    """
+    Runs several write_outputs calls, given as (df, base_path, kwargs) jobs. Large
+    boards are written in parallel processes (the xlsx writers are pure Python, so
+    threads would not overlap); small ones are written in turn.
+
+    Returns:
+        list: The write_outputs result of each job, in order.
+    """
+    jobs = list(jobs)
+    if len(jobs) < 2 or max_workers == 1 or sum(df.size for df, _, _ in jobs) < PARALLEL_MIN_CELLS:
+        return [_write_outputs_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(len(jobs), max_workers or os.cpu_count() or 1)) as executor:
+        return list(executor.map(_write_outputs_job, jobs))
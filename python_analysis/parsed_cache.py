@@ -0,0 +1,122 @@
+"""
+Cache of parsed spreadsheet and CSV sources.
+
+Parsing an .xlsx with openpyxl costs far more than loading the resulting
+DataFrame, and the same ranking workbooks are read by several builders. Each
+parsed file is pickled once under PARSED_CACHE_DIR, keyed by its path, size,
+modification time and read options, so an edited workbook is parsed again and
+an unchanged one never is. Within a process, repeat reads come from memory.
+
+read_tables() loads many sources at once. Cache misses are parsed in a process
+pool, because openpyxl is pure Python and threads would just take turns
+holding the GIL.
+
+    postdraft, rsp = read_tables(['data/1QB/Postdraft_Rookies.xlsx', 'data/common/RSP_Rookies.xlsx'])
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARSED_CACHE_DIR = os.environ.get('PARSED_CACHE_DIR') or os.path.join(CURRENT_DIR, 'data', 'parsed_cache')
+
+_memory = {}
+_memory_lock = threading.Lock()
+
+
+def _digest(value):
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()[:16]
+
+
+def cache_file(path, read_kwargs=None, cache_dir=None):
+    """Cache location for one version of a source: <path hash>-<version hash>.pkl."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    version = json.dumps([stat.st_mtime_ns, stat.st_size, sorted((read_kwargs or {}).items())], default=str)
+    return os.path.join(cache_dir or PARSED_CACHE_DIR, f'{_digest(path)}-{_digest(version)}.pkl')
+
+
+def parse(path, read_kwargs=None):
+    """Parses a source with pandas: read_csv for .csv files, read_excel otherwise."""
+    read_kwargs = read_kwargs or {}
+    if path.lower().endswith('.csv'):
+        return pd.read_csv(path, **read_kwargs)
+    return pd.read_excel(path, **read_kwargs)
+
+
+def _load(cached_path):
+    with _memory_lock:
+        df = _memory.get(cached_path)
+    if df is None:
+        try:
+            with open(cached_path, 'rb') as f:
+                df = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        with _memory_lock:
+            _memory[cached_path] = df
+    return df.copy()
+
+
+def _store(df, cached_path):
+    """Pickles df atomically and removes older versions of the same source."""
+    directory = os.path.dirname(cached_path)
+    os.makedirs(directory, exist_ok=True)
+    prefix = os.path.basename(cached_path).split('-')[0] + '-'
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and os.path.join(directory, name) != cached_path:
+            os.remove(os.path.join(directory, name))
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cached_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    with _memory_lock:
+        _memory[cached_path] = df
+
+
+def read_table(path, cache_dir=None, **read_kwargs):
+    """One parsed source, from the cache when the file is unchanged."""
+    return read_tables([(path, read_kwargs)], cache_dir=cache_dir, max_workers=1)[0]
+
+
+def read_tables(sources, cache_dir=None, max_workers=None):
+    """
+    Parsed DataFrames for many sources, in order.
+
+    Args:
+        sources: Paths, or (path, read_kwargs) pairs such as ('rankings.csv', {'delimiter': ';'}).
+        cache_dir: Cache directory (defaults to PARSED_CACHE_DIR).
+        max_workers: Processes used to parse cache misses (1 parses them inline).
+    """
+    sources = [(source, {}) if isinstance(source, (str, os.PathLike)) else source for source in sources]
+    cached_paths = [cache_file(path, kwargs, cache_dir) for path, kwargs in sources]
+    frames = [_load(cached_path) for cached_path in cached_paths]
+    misses = [i for i, df in enumerate(frames) if df is None]
+
+    if len(misses) > 1 and max_workers != 1:
+        with ProcessPoolExecutor(max_workers=min(len(misses), max_workers or os.cpu_count() or 1)) as executor:
+            parsed = list(executor.map(parse, *zip(*(sources[i] for i in misses))))
+    else:
+        parsed = [parse(*sources[i]) for i in misses]
+
+    for i, df in zip(misses, parsed):
+        _store(df, cached_paths[i])
+        frames[i] = df.copy()
+    return frames
+
+
+def clear_memory():
+    """Drops the in-process copies (the on-disk cache is kept)."""
+    with _memory_lock:
+        _memory.clear()
@@ -0,0 +1,129 @@
+"""
+Crosswalk from other platforms' player IDs to the canonical Sleeper ID.
+
+FantasyCalc returns sleeperId alongside fleaflickerId, espnId and mflId for
+every player it values, and the Sleeper players dump carries gsis_id (the ID
+nflverse/nfl_data_py uses as player_id). Both are folded into one persisted
+index so joins across sources can run on IDs with a vectorized Series.map
+instead of matching cleansed names:
+
+    crosswalk = PlayerIdCrosswalk.load()
+    rosters['sleeper_id'] = crosswalk.map_series('fleaflicker', rosters['fleaflicker_id'])
+
+The index is a JSON file of {platform: {platform_id: sleeper_id}}, refreshed
+by create_player_data on every FantasyCalc fetch.
+"""
+
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+CROSSWALK_PATH = os.environ.get('PLAYER_ID_CROSSWALK_PATH') or os.path.join(CURRENT_DIR, 'data_output', 'player_id_crosswalk.json')
+
+# Platform -> ID field in a FantasyCalc 'player' object
+FANTASYCALC_ID_FIELDS = {
+    'fantasycalc': 'id',
+    'fleaflicker': 'fleaflickerId',
+    'espn': 'espnId',
+    'mfl': 'mflId',
+}
+# Platform -> ID field in a Sleeper players dump entry
+SLEEPER_ID_FIELDS = {
+    'gsis': 'gsis_id',
+    'espn': 'espn_id',
+    'yahoo': 'yahoo_id',
+}
+
+
+def _normalize(value):
+    """IDs are stored as strings; empty values and floats from pandas ('17603.0') are normalized."""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+class PlayerIdCrosswalk:
+    """
+    In-memory {platform: {platform_id: sleeper_id}} index.
+
+    Args:
+        mappings: Existing mappings, e.g. as loaded from the persisted file.
+    """
+
+    def __init__(self, mappings=None):
+        self.mappings = {platform: dict(ids) for platform, ids in (mappings or {}).items()}
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.mappings.values())
+
+    @classmethod
+    def load(cls, path=CROSSWALK_PATH):
+        """Loads the persisted crosswalk; an empty one when there is none yet."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (OSError, ValueError):
+            return cls()
+
+    def save(self, path=CROSSWALK_PATH):
+        """Writes the crosswalk atomically (temp file plus rename)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.mappings, f, sort_keys=True)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def add(self, platform, platform_id, sleeper_id):
+        platform_id, sleeper_id = _normalize(platform_id), _normalize(sleeper_id)
+        if platform_id and sleeper_id:
+            self.mappings.setdefault(platform, {})[platform_id] = sleeper_id
+
+    def update_from_fantasycalc(self, fantasycalc_players):
+        """Adds the IDs from a raw FantasyCalc /values/current response."""
+        for entry in fantasycalc_players or []:
+            player = entry.get('player') or {}
+            sleeper_id = player.get('sleeperId')
+            for platform, field in FANTASYCALC_ID_FIELDS.items():
+                self.add(platform, player.get(field), sleeper_id)
+        return self
+
+    def update_from_sleeper(self, sleeper_players):
+        """Adds gsis (nflverse) and other IDs from the Sleeper players dump ({sleeper_id: details})."""
+        for sleeper_id, details in (sleeper_players or {}).items():
+            for platform, field in SLEEPER_ID_FIELDS.items():
+                self.add(platform, details.get(field), sleeper_id)
+        return self
+
+    def to_sleeper(self, platform, platform_id):
+        """The Sleeper ID for one platform ID, or None."""
+        return self.mappings.get(platform, {}).get(_normalize(platform_id))
+
+    def map_series(self, platform, ids):
+        """Vectorized lookup: a Series of Sleeper IDs (NaN where unknown) for a Series of platform IDs."""
+        ids = pd.Series(ids)
+        if pd.api.types.is_float_dtype(ids):
+            # Numeric IDs read from CSV/Excel come back as floats
+            ids = ids.astype('Int64')
+        return ids.astype('string').map(self.mappings.get(platform, {})).astype(object)
+
+
+def refresh_crosswalk(fantasycalc_players=None, sleeper_players=None, path=CROSSWALK_PATH):
+    """Merges new FantasyCalc and/or Sleeper IDs into the persisted crosswalk and saves it."""
+    crosswalk = PlayerIdCrosswalk.load(path)
+    crosswalk.update_from_fantasycalc(fantasycalc_players)
+    crosswalk.update_from_sleeper(sleeper_players)
+    crosswalk.save(path)
+    print(f"Player ID crosswalk refreshed: {len(crosswalk)} IDs across {len(crosswalk.mappings)} platforms.")
+    return crosswalk
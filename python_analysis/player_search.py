@@ -0,0 +1,83 @@
+"""
+Prefix search over player names for the search/autocomplete endpoints.
+
+Names are normalized with name_utils.cleanse_name, both when the index is
+built and for every query, so "Ja'Marr", "jamarr" and "JaMarr" all match.
+The index is a sorted array of (key, row) pairs searched with bisect, where
+the keys are the full cleansed name plus each word in it. A query therefore
+matches a prefix of the full name ("justin jef") or of any word ("jef").
+"""
+
+from bisect import bisect_left
+import heapq
+import math
+
+from name_utils import cleanse_name
+
+# Sorts after any character a cleansed name can contain
+_PREFIX_END = '\uffff'
+
+
+def _value_or_floor(value):
+    """Ranking value; players without a number (or NaN) rank last."""
+    if value is None:
+        return -math.inf
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return -math.inf
+    return -math.inf if math.isnan(value) else value
+
+
+class PlayerSearchIndex:
+    """
+    Sorted-array prefix index over cleansed player names.
+
+    Args:
+        names: Player names per row (cleansed again here, so raw names work too).
+        values: Ranking value per row, e.g. fantasy_calc_value.
+        positions: Position per row, used by the optional position filter.
+    """
+
+    def __init__(self, names, values, positions):
+        self._values = [_value_or_floor(v) for v in values]
+        self._positions = [str(p).upper() if p else '' for p in positions]
+        entries = set()
+        for row, name in enumerate(names):
+            cleansed = cleanse_name(name)
+            if not cleansed:
+                continue
+            entries.add((cleansed, row))
+            for word in cleansed.split(' '):
+                entries.add((word, row))
+        entries = sorted(entries)
+        self._keys = [key for key, _ in entries]
+        self._rows = [row for _, row in entries]
+
+    @classmethod
+    def from_players(cls, players):
+        names = [p.get('player_cleansed_name') or p.get('full_name') or p.get('player_name_original') for p in players]
+        return cls(
+            names,
+            [p.get('fantasy_calc_value') for p in players],
+            [p.get('position') for p in players]
+        )
+
+    def search(self, query, k=10, position=None):
+        """
+        Returns up to k row indices whose name matches the query prefix,
+        highest value first, optionally limited to one position.
+        """
+        # A query of just a suffix ("v", "iv") cleanses to nothing; search it as typed
+        prefix = cleanse_name(query) or ' '.join(str(query).lower().split())
+        if not prefix or k < 1:
+            return []
+
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + _PREFIX_END, lo)
+        rows = set(self._rows[lo:hi])
+        if position:
+            position = position.upper()
+            rows = [row for row in rows if self._positions[row] == position]
+
+        return heapq.nlargest(k, rows, key=lambda row: (self._values[row], -row))
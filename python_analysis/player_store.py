@@ -0,0 +1,275 @@
+"""
+In-memory store of the enriched player data for the local API server.
+
+The JSON file is parsed once per version into a shared, memory-mapped
+PlayerTable (see player_table.py) wrapped by an immutable PlayerStore that
+holds the ID map and the rank-ordered views. PlayerStoreManager checks the
+file's mtime/size on access and atomically swaps in a new store when the file
+changes, so the server still picks up fresh data without re-parsing it on
+every request.
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from player_search import PlayerSearchIndex
+from player_table import PlayerTable, encode, is_current_table, remove_stale_tables, write_table
+from singleflight import SingleFlight
+
+
+# Orderings the front end sorts by: metric name -> (field, descending)
+SORT_METRICS = {
+    'value': ('fantasy_calc_value', True),
+    'overall_rank': ('overall_rank', False),
+    'trend': ('trend_30_day', True),
+}
+# The underlying field names are accepted too (e.g. ?by=trend_30_day)
+SORT_METRIC_ALIASES = {field: metric for metric, (field, _) in SORT_METRICS.items()}
+
+
+def rank_order(table):
+    """Row order of the byPosition/byTeam indexes: fc_rank first, then value for unranked players."""
+    fc_rank = np.where(np.isnan(table.columns['fc_rank']), np.inf, table.columns['fc_rank'])
+    value = np.nan_to_num(table.columns['fantasy_calc_value'], nan=0.0)
+    return np.lexsort((-value, fc_rank))
+
+
+def group_rows(order, keys):
+    """Splits a row order into {KEY: rows} for a bytes column, keeping the order within each group."""
+    keys = np.char.upper(keys[order])
+    groups = {}
+    for key in np.unique(keys):
+        if key:
+            groups[key.decode('utf-8')] = order[keys == key]
+    return groups
+
+
+def build_orderings(table):
+    """
+    Precomputes, for every sort metric, the row order overall (position None) and
+    per position. Players missing the metric are left out.
+    """
+    orderings = {}
+    for metric, (field, descending) in SORT_METRICS.items():
+        values = table.columns[field]
+        ranked = np.flatnonzero(~np.isnan(values))
+        ranked = ranked[np.argsort(-values[ranked] if descending else values[ranked], kind='stable')]
+        orderings[(metric, None)] = ranked
+        for position, rows in group_rows(ranked, table.columns['position']).items():
+            orderings[(metric, position)] = rows
+    return orderings
+
+
+def file_version(path):
+    """Cheap change token for a file: (mtime_ns, size), or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class PlayerStore:
+    """
+    One immutable version of the enriched player data.
+
+    The data itself lives in a PlayerTable (columns plus pre-encoded records),
+    which may be memory-mapped and shared between worker processes. The store
+    only adds light per-process indexes: the ID map and row orderings.
+    Requests hold a reference to the store they started with, so a reload never
+    changes data underneath an in-flight request.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.version = table.version
+        self.by_id = {}
+        for row, sleeper_id in enumerate(table.columns['sleeper_id']):
+            if sleeper_id:
+                self.by_id[sleeper_id.decode('utf-8')] = row
+        order = rank_order(table)
+        self.views = {
+            'position': group_rows(order, table.columns['position']),
+            'team': group_rows(order, table.columns['team']),
+        }
+        self.orderings = build_orderings(table)
+        self.search_index = PlayerSearchIndex(
+            [name.decode('utf-8') for name in table.columns['player_cleansed_name']],
+            table.columns['fantasy_calc_value'],
+            [position.decode('utf-8') for position in table.columns['position']]
+        )
+
+    @classmethod
+    def from_players(cls, players, version=None):
+        return cls(PlayerTable.from_players(players, version))
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def all_json(self):
+        """Zero-copy view of the full JSON array."""
+        return self.table.all_json()
+
+    def iter_all_json(self):
+        """The full JSON array in bytes chunks (see PlayerTable.iter_json)."""
+        return self.table.iter_json()
+
+    def _rows_json(self, rows):
+        return b'[' + b','.join(self.table.record(row) for row in rows) + b']'
+
+    def get(self, sleeper_id):
+        row = self.by_id.get(str(sleeper_id))
+        return json.loads(self.table.record(row)) if row is not None else None
+
+    def player_json(self, sleeper_id):
+        """Pre-encoded JSON for one player, or None if the ID is unknown."""
+        row = self.by_id.get(str(sleeper_id))
+        return self.table.record(row) if row is not None else None
+
+    def indexed_json(self, field, key, min_rank=None, max_rank=None, limit=None):
+        """JSON array of the players for one position/team in rank order, optionally by fc_rank range."""
+        rows = self.views[field].get(key.upper(), np.empty(0, dtype=np.int64))
+        if min_rank is not None or max_rank is not None:
+            fc_rank = self.table.columns['fc_rank'][rows]
+            keep = ~np.isnan(fc_rank)
+            if min_rank is not None:
+                keep &= fc_rank >= min_rank
+            if max_rank is not None:
+                keep &= fc_rank <= max_rank
+            rows = rows[keep]
+        if limit:
+            rows = rows[:limit]
+        return self._rows_json(rows)
+
+    def top_json(self, by='value', position=None, n=50):
+        """
+        JSON array of the first n players for a sort metric, optionally within one position.
+        Raises KeyError for an unknown metric.
+        """
+        metric = SORT_METRIC_ALIASES.get(by, by)
+        if metric not in SORT_METRICS:
+            raise KeyError(by)
+        rows = self.orderings.get((metric, position.upper() if position else None), [])
+        return self._rows_json(rows[:n])
+
+    def search_json(self, query, k=10, position=None):
+        """JSON array of the top k name matches for a search prefix, by fantasy_calc_value."""
+        return self._rows_json(self.search_index.search(query, k, position))
+
+    def batch_json(self, sleeper_ids):
+        """JSON array for a batch lookup; unknown IDs get an error entry in place."""
+        parts = []
+        for s_id in sleeper_ids:
+            encoded = self.player_json(s_id)
+            parts.append(encoded if encoded is not None else encode({"sleeper_id": str(s_id), "error": "Data not found"}))
+        return b'[' + b','.join(parts) + b']'
+
+
+def table_dir_for(path):
+    """Where the mapped tables for a data file are kept (override with PLAYER_TABLE_DIR)."""
+    return os.environ.get('PLAYER_TABLE_DIR') or os.path.join(os.path.dirname(os.path.abspath(path)), '.player_table')
+
+
+def load_store(path, version=None):
+    """
+    Returns a PlayerStore for the given version of the JSON file.
+    The first process to see a version parses the JSON and writes the shared table;
+    every other process (e.g. the rest of the gunicorn workers) just maps it.
+    """
+    if version is None:
+        version = file_version(path)
+    table_dir = table_dir_for(path)
+    table_path = os.path.join(table_dir, f'{version[0]}-{version[1]}') if version else None
+
+    if table_path and is_current_table(table_path):
+        store = PlayerStore(PlayerTable.open(table_path))
+        print(f"--- PYTHON API: Mapped shared player table with {len(store)} players.")
+        return store
+
+    print(f"--- PYTHON API: Loading player data from: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        players = json.load(f)
+
+    if table_path:
+        try:
+            write_table(players, table_path, list(version))
+            remove_stale_tables(table_dir, keep=os.path.basename(table_path))
+            store = PlayerStore(PlayerTable.open(table_path))
+            print(f"--- PYTHON API: Successfully loaded and mapped {len(store)} players.")
+            return store
+        except OSError as e:
+            print(f"WARNING: Could not write shared player table, keeping data in process: {e}")
+
+    store = PlayerStore.from_players(players, version)
+    print(f"--- PYTHON API: Successfully loaded and mapped {len(store)} players.")
+    return store
+
+
+class PlayerStoreManager:
+    """
+    Serves the current PlayerStore for a file and reloads it when the file changes.
+
+    Args:
+        path: The enriched players JSON file.
+        check_interval: Minimum seconds between mtime checks (0 checks on every access).
+        serve_stale: When True, a changed file is reloaded in the background while
+            requests keep getting the previous store.
+    """
+
+    def __init__(self, path, check_interval=0.5, serve_stale=False, loader=load_store):
+        self.path = path
+        self.check_interval = check_interval
+        self.serve_stale = serve_stale
+        self._loader = loader
+        self._store = None
+        self._checked_at = 0.0
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._reloading = False
+        self.reloads = 0
+
+    def _reload(self, version):
+        try:
+            store = self._loader(self.path, version)
+        except Exception as e:
+            print(f"FATAL: Could not load enriched player data: {e}")
+            # Keep serving the last good copy; retry on the next check
+            if self._store is not None:
+                return self._store
+            store = PlayerStore.from_players([], None)
+        self._store = store
+        self.reloads += 1
+        return store
+
+    def _reload_in_background(self, version):
+        try:
+            self._flight.do('reload', lambda: self._reload(version))
+        finally:
+            with self._lock:
+                self._reloading = False
+
+    def get(self):
+        store = self._store
+        now = time.monotonic()
+        if store is not None and now - self._checked_at < self.check_interval:
+            return store
+        self._checked_at = now
+
+        version = file_version(self.path)
+        if store is not None and version == store.version:
+            return store
+
+        if store is not None and self.serve_stale:
+            with self._lock:
+                start = not self._reloading
+                self._reloading = True
+            if start:
+                threading.Thread(target=self._reload_in_background, args=(version,), daemon=True).start()
+            return store
+
+        return self._flight.do('reload', lambda: self._reload(version))
@@ -0,0 +1,180 @@
+"""
+Compact, read-only columnar table of the enriched player data.
+
+The table is written once per data version as a directory of plain files:
+
+    meta.json            version, row count and column names (written last)
+    records.bin          the full JSON array of players, each record pre-encoded
+    offsets.npy          int64 start/end offsets of every record in records.bin
+    <column>.npy         one array per indexed column (IDs as bytes, numbers as float64/NaN)
+
+Every process opens it with mmap, so gunicorn workers share a single copy of
+the data through the page cache instead of each holding its own dict-of-dicts.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Columns the API indexes or sorts on. 'S' columns are fixed-width bytes, 'f8' numeric with NaN for missing.
+TABLE_COLUMNS = {
+    'sleeper_id': 'S',
+    'position': 'S',
+    'team': 'S',
+    'player_cleansed_name': 'S',
+    'fantasy_calc_value': 'f8',
+    'fc_rank': 'f8',
+    'overall_rank': 'f8',
+    'trend_30_day': 'f8',
+}
+# Streamed responses copy at most this much of the mapped records at a time
+JSON_CHUNK_BYTES = 1 << 20
+
+
+def encode(obj):
+    """Encodes a response body the same way Flask's jsonify does (sorted keys, compact)."""
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def build_columns(players):
+    """Extracts the indexed columns from a list of player dicts."""
+    columns = {}
+    for name, kind in TABLE_COLUMNS.items():
+        values = [p.get(name) for p in players]
+        if kind == 'S':
+            columns[name] = np.array([b'' if v is None else str(v).encode('utf-8') for v in values], dtype='S')
+        else:
+            columns[name] = np.array([_number(v) for v in values], dtype='f8')
+    return columns
+
+
+def build_records(players):
+    """Encodes every player once and returns (json_array_bytes, offsets)."""
+    encoded = [encode(p) for p in players]
+    offsets = np.empty(len(encoded) + 1, dtype=np.int64)
+    position = 1  # after the opening '['
+    for i, record in enumerate(encoded):
+        offsets[i] = position
+        position += len(record) + 1  # record plus the ',' separator
+    offsets[len(encoded)] = position
+    return b'[' + b','.join(encoded) + b']', offsets
+
+
+class PlayerTable:
+    """
+    Columns plus pre-encoded records for one data version.
+    Backed either by in-memory arrays (from_players) or by a mapped table directory (open).
+    """
+
+    def __init__(self, columns, records, offsets, version=None):
+        self.columns = columns
+        self.records = records
+        self.offsets = offsets
+        self.version = version
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_players(cls, players, version=None):
+        records, offsets = build_records(players)
+        return cls(build_columns(players), records, offsets, version)
+
+    @classmethod
+    def open(cls, path):
+        """Maps a table directory written by write_table. Nothing is copied into the process."""
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        columns = {
+            name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+            for name in meta['columns']
+        }
+        offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+        with open(os.path.join(path, 'records.bin'), 'rb') as f:
+            records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        version = tuple(meta['version']) if isinstance(meta['version'], list) else meta['version']
+        return cls(columns, records, offsets, version)
+
+    def record(self, row):
+        """Encoded JSON for one row."""
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1]) - 1
+        return self.records[start:end]
+
+    def all_json(self):
+        """The whole JSON array, as stored: a zero-copy view of the (mapped) records."""
+        return memoryview(self.records)
+
+    def iter_json(self, chunk_size=JSON_CHUNK_BYTES):
+        """The whole JSON array as bytes chunks, for servers that stream a response body."""
+        view = self.all_json()
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+
+    def column_str(self, name, row):
+        return self.columns[name][row].decode('utf-8')
+
+
+def write_table(players, path, version=None):
+    """
+    Writes a table directory for a list of players.
+    Files go to a temporary directory that is renamed into place, so a reader
+    never sees a half-written table even if several workers build it at once.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+    try:
+        records, offsets = build_records(players)
+        with open(os.path.join(tmp_path, 'records.bin'), 'wb') as f:
+            f.write(records)
+        np.save(os.path.join(tmp_path, 'offsets.npy'), offsets)
+        columns = build_columns(players)
+        for name, values in columns.items():
+            np.save(os.path.join(tmp_path, f'{name}.npy'), values)
+        with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'count': len(players), 'columns': list(columns)}, f)
+        os.rename(tmp_path, path)
+    except OSError:
+        if os.path.isdir(path) and not is_current_table(path):
+            # A table written before a column was added; replace it
+            shutil.rmtree(path, ignore_errors=True)
+            try:
+                os.rename(tmp_path, path)
+                return path
+            except OSError:
+                pass
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not is_current_table(path):
+            raise
+        # Another process published the same version first; use theirs.
+    return path
+
+
+def is_current_table(path):
+    """True when a table directory is complete and has every column in TABLE_COLUMNS."""
+    try:
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return set(TABLE_COLUMNS) <= set(meta.get('columns', []))
+
+
+def remove_stale_tables(table_dir, keep):
+    """Deletes table directories for other versions. Processes that still map them keep working."""
+    if not os.path.isdir(table_dir):
+        return
+    for name in os.listdir(table_dir):
+        if name != keep and not name.startswith('.tmp-'):
+            shutil.rmtree(os.path.join(table_dir, name), ignore_errors=True)
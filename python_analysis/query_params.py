@@ -0,0 +1,71 @@
+"""
+Query parameter parsing and configuration shared by the player APIs (api_server,
+asgi_server and the Lambda handler), so every entry point validates requests the
+same way. The servers import from here rather than from each other, so loading
+asgi_server does not build the Flask app or its player store.
+
+Each parser takes a mapping of query parameters (Flask's request.args, a dict,
+or the Lambda event's queryStringParameters, which may be None) and raises
+ValueError with a client-facing message when a value is invalid.
+"""
+
+import os
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ENRICHED_DATA_PATH = os.path.join(CURRENT_DIR, 'data_output', 'enriched_players_master.json')
+# How often (seconds) the data file's mtime is checked for changes
+STORE_CHECK_INTERVAL_SECONDS = float(os.environ.get('STORE_CHECK_INTERVAL_SECONDS', '0.5'))
+MAX_SEARCH_RESULTS = 50
+
+
+def parse_rank_query(params):
+    """
+    Reads the optional limit/min_rank/max_rank query parameters.
+    Raises ValueError when a value is not a positive integer.
+    """
+    parsed = {}
+    for name in ('limit', 'min_rank', 'max_rank'):
+        value = (params or {}).get(name)
+        if value is None or value == '':
+            parsed[name] = None
+            continue
+        try:
+            parsed[name] = int(value)
+        except ValueError:
+            parsed[name] = 0
+        if parsed[name] < 1:
+            raise ValueError(f"'{name}' must be a positive integer")
+    return parsed
+
+
+def parse_top_query(params):
+    """
+    Reads by/position/n for the top-N route.
+    Raises ValueError when n is not a positive integer.
+    """
+    params = params or {}
+    try:
+        n = int(params.get('n') or 50)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise ValueError("'n' must be a positive integer")
+    return params.get('by') or 'value', params.get('position'), n
+
+
+def parse_search_query(params):
+    """
+    Reads q/position/k for the search route (k defaults to 10, at most MAX_SEARCH_RESULTS).
+    Raises ValueError when q is missing or k is not a positive integer.
+    """
+    params = params or {}
+    query = (params.get('q') or '').strip()
+    if not query:
+        raise ValueError("Missing search query 'q'")
+    try:
+        k = int(params.get('k') or 10)
+    except ValueError:
+        k = 0
+    if k < 1:
+        raise ValueError("'k' must be a positive integer")
+    return query, params.get('position'), min(k, MAX_SEARCH_RESULTS)
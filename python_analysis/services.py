@@ -2,6 +2,10 @@ import requests
 import pandas as pd
 import os
 from name_utils import cleanse_name
+from fleaflicker_rosters import fetch_rosters
+from keepers import select_keepers
+from output_writers import write_many
+from parsed_cache import read_tables
 
 
 nnf_team_ids = {
@@ -31,40 +35,19 @@ def cleanse_names(df, column):
     # Ensure the column is treated as a string, filling any non-string data with empty strings
     cleansed_series = df[column].astype(str).fillna('')
     # Apply the shared cleanse_name function to each name
-    return cleansed_series.apply(cleanse_name)
-    df['player_cleansed_name'] = cleansed_series
+    df['player_cleansed_name'] = cleansed_series.map(cleanse_name)
     return df
 
 
 def get_league_rosters(league_id=197269, season=2024, scoring_period=18):
-    url = 'https://www.fleaflicker.com/api/FetchLeagueRosters'
-    response = requests.get(url, params={"sport": "NFL", "league_id": league_id, "season": season,
-                                         "scoring_period": scoring_period})
-    j_response = response.json()
-    league_roster_dict = {}
-    rosters = j_response['rosters']
-    for team in rosters:
-        team_name = team['team']['name']
-        roster_list = []
-        team_roster_dict = {}
-        for player in team['players']:
-            name = player['proPlayer']['nameFull']
-            position = player['proPlayer']['position']
-            player = {"name": name, "position": position}
-            roster_list.append(player)
-        team_roster_dict = {team_name: roster_list}
-        league_roster_dict.update(team_roster_dict)
-        player_list = []
-        for key, value in league_roster_dict.items():
-            for player in value:
-                player_name = player['name']
-                player_position = player['position']
-                nnf_team = key
-                loop_player_list = [player_name, player_position, nnf_team]
-                player_list.append(loop_player_list)
-    df_rosters = pd.DataFrame(player_list, columns=['Name', 'Pos', 'NNF_Team'])
-    df_rosters = cleanse_names(df_rosters, 'Name')
-    return df_rosters
+    """
+    Rosters for one Fleaflicker league as ['Name', 'Pos', 'NNF_Team', 'player_cleansed_name', 'sleeper_id'].
+    Raises when the league cannot be fetched; see fleaflicker_rosters.fetch_rosters
+    for several leagues at once.
+    """
+    rosters = fetch_rosters([(league_id, season, scoring_period)], strict=True)
+    df_rosters = rosters.rename(columns={'name': 'Name', 'position': 'Pos', 'team_name': 'NNF_Team'})
+    return df_rosters[['Name', 'Pos', 'NNF_Team', 'player_cleansed_name', 'sleeper_id']]
 
 def create_dynasty_dfs():
     current_dir = os.path.dirname(__file__)
@@ -81,119 +64,132 @@ def create_dynasty_dfs():
     merged_dynasty = pd.merge(merged_dynasty, reception_perception, on='player_cleansed_name', how='outer')
     return merged_dynasty
 
-def create_rookie_rankings(format):
-    
-    if format == "superflex":
-        dir = "superflex"
-    else:
-        dir = "1QB"
-    common = "common"
-    
-    try:
-        # Get the directory where the script is located
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-    except NameError:
-        # Fallback if __file__ is not defined (e.g., running interactively)
-        base_dir = os.getcwd()
-        print(f"Warning: __file__ not defined. Using current working directory: {base_dir}")
-
-    target_dir = os.path.join(base_dir, 'data')
-    # *** Corrected output directory path to be inside 'data' ***
+ROOKIE_COLUMNS = [
+    'Rk', 'player_cleansed_name', 'position', 'NFL Team', 'Pos. Rank', 'RSP Pos. Ranking', 'RSP 2023-2025 Rank',
+    'RP 2021-2025 Rank', 'Tier', 'ZAP Score', 'Depth of Talent Score', 'Category', 'Depth of Talent Description',
+    'Draft Capital Delta', 'RP Definition', 'RP Quick Note', 'Comparables', 'Comparison Spectrum', 'Stylistic Comp',
+    'positionRank', 'value', 'Height', 'Weight', 'School', 'Notes', 'Summarized Notes', 'RSP Notes',
+    '% of Man Routes', 'Man Success Rate', 'Man Percentile', '% of Zone Routes', 'Zone Success Rate',
+    'Zone Percentile', '% of Press Routes', 'Press Success Rate', 'Press Percentile', '% of Double Routes',
+    'overallRank', 'trend30day',
+]
+ROOKIE_NUMBER_FORMATS = {'value': '#,##0', 'trend30day': '+#,##0;-#,##0;0'}
+ROOKIE_FORMAT_DIRS = {'superflex': 'superflex', '1qb': '1QB'}
+# (file, name column, read options); the common sources are shared by every format
+COMMON_ROOKIE_SOURCES = [
+    ('LRQB_Postdraft_Rookies.xlsx', 'Player', {}),
+    ('Reception_Perception_Rookies.xlsx', 'Player', {}),
+    ('RSP_Rookies.xlsx', 'Player', {}),
+]
+FORMAT_ROOKIE_SOURCES = [
+    ('Postdraft_Rookies.xlsx', 'Player', {}),
+    ('fantasycalc_dynasty_rookie_rankings.csv', 'name', {'delimiter': ';'}),
+]
+
+
+def _rookie_source_frames(sources):
+    """
+    Reads (path, name column, read options) sources through the parsed-file cache, in parallel.
+    A missing file is reported and contributes no rows.
+    """
+    present = [source for source in sources if os.path.exists(source[0])]
+    for path, _, _ in sources:
+        if not os.path.exists(path):
+            print(f"WARNING: Rookie source not found, skipping: {path}")
+    parsed = dict(zip((path for path, _, _ in present), read_tables([(path, kwargs) for path, _, kwargs in present])))
+    keyed = []
+    for path, name_column, _ in sources:
+        if path not in parsed:
+            keyed.append(pd.DataFrame(index=pd.Index([], name='player_cleansed_name')))
+            continue
+        df = cleanse_names(parsed[path], name_column)
+        # One row per player so the sources line up on the name index
+        keyed.append(df.drop_duplicates('player_cleansed_name').set_index('player_cleansed_name'))
+    return keyed
+
+
+def _align_rookie_sources(frames):
+    """Outer-joins sources on the cleansed name; the first source to provide a column wins."""
+    columns = {}
+    for df in frames:
+        for column in df.columns:
+            columns.setdefault(column, df[column])
+    return pd.concat(columns, axis=1, join='outer', sort=False)
+
+
+def build_rookie_rankings(formats=('superflex', '1qb'), write=True, output_formats=('xlsx',)):
+    """
+    Builds the rookie rankings for several scoring formats in one run.
+
+    The common workbooks (LRQB post-draft, Reception Perception and RSP) are read
+    and aligned once and shared by every format; all workbooks come from the
+    parsed-file cache and cache misses are parsed in parallel.
+
+    Args:
+        formats: Any of 'superflex' and '1qb'.
+        write: Also write data/output/<format dir>_rookies.<ext> for each format.
+        output_formats: Files written per format: any of 'xlsx', 'parquet' and 'csv'
+            (see output_writers.write_outputs).
+
+    Returns:
+        dict: format -> rankings DataFrame (ROOKIE_COLUMNS, sorted by 'Rk').
+    """
+    target_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
     output_dir = os.path.join(target_dir, 'output')
-    """Gets postdraft data from LRQB"""
-
-    relative_path = os.path.join(target_dir, common, 'Postdraft_Rookies.xlsx')
-    postdraft_rookies = pd.read_excel(relative_path)
-    postdraft_rookies = cleanse_names(postdraft_rookies, 'Player')
-    """Adds rankings dependent on scoring format"""
-    relative_path = os.path.join(target_dir, dir, 'Postdraft_Rookies.xlsx')
-    postdraft_rookies_rank = pd.read_excel(relative_path)
-    postdraft_rookies_rank = cleanse_names(postdraft_rookies_rank, 'Player')
-    """Gets fantasycalc data"""    
-    relative_path = os.path.join(target_dir, dir, 'fantasycalc_dynasty_rookie_rankings.csv')
-    fantasy_calc = pd.read_csv(relative_path, delimiter=';')
-    fantasy_calc = cleanse_names(fantasy_calc, 'name')
-    """Gets reception perception data"""
-    relative_path = os.path.join(target_dir, common, 'Reception_Perception_Rookies.xlsx')
-    reception_perception = pd.read_excel(relative_path)
-    reception_perception = cleanse_names(reception_perception, 'Player')
-    """Merge dataframes"""
-    merged_rookies = pd.merge(postdraft_rookies, postdraft_rookies_rank, on='player_cleansed_name', how='outer')
-    merged_rookies = pd.merge(merged_rookies, reception_perception, on='player_cleansed_name', how='outer')
-    relative_path = os.path.join(target_dir, common, 'RSP_Rookies.xlsx')
-    rsp_rookies = pd.read_excel(relative_path)
-    rsp_rookies = cleanse_names(rsp_rookies, 'Player')
-    merged_rookies = pd.merge(merged_rookies, rsp_rookies, on='player_cleansed_name', how='outer')
-    merged_rookies = pd.merge(merged_rookies, fantasy_calc, on='player_cleansed_name', how='outer')
-    columns = ['Rk',
-               'player_cleansed_name',
-               'position',
-               'NFL Team',
-               'Pos. Rank',
-               'RSP Pos. Ranking',
-               'RSP 2023-2025 Rank',
-               'RP 2021-2025 Rank',
-               'Tier',
-               'ZAP Score',
-               'Depth of Talent Score',
-               'Category',
-               'Depth of Talent Description',
-               'Draft Capital Delta',
-               'RP Definition',
-               'RP Quick Note',
-               'Comparables',
-               'Comparison Spectrum',
-               'Stylistic Comp',
-               'positionRank',
-               'value',
-               'Height',
-               'Weight',
-               'School',
-               'Notes',
-               'Summarized Notes',
-               'RSP Notes',
-                '% of Man Routes',
-                'Man Success Rate',
-                'Man Percentile',
-                '% of Zone Routes',
-                'Zone Success Rate',
-                'Zone Percentile',
-                '% of Press Routes',
-                'Press Success Rate',
-                'Press Percentile',
-                '% of Double Routes',
-                'overallRank',
-                'trend30day',
-    ]
-    merged_rookies = merged_rookies[columns]
-    merged_rookies = merged_rookies.sort_values(by='Rk', ascending=True)
-    merged_rookies.to_excel(os.path.join(output_dir, f'{dir}_rookies.xlsx'), index=False)
-    return merged_rookies
-
-def print_by_team(teams, frame):
-    for nnf_team in teams:
-        team = frame.loc[frame["NNF_Team"] == nnf_team]
+    format_dirs = {format: ROOKIE_FORMAT_DIRS[format.lower()] for format in formats}
+
+    # One read of every source (shared and per-format) through the cache
+    sources = [(os.path.join(target_dir, 'common', name), column, kwargs) for name, column, kwargs in COMMON_ROOKIE_SOURCES]
+    for dir in format_dirs.values():
+        sources += [(os.path.join(target_dir, dir, name), column, kwargs) for name, column, kwargs in FORMAT_ROOKIE_SOURCES]
+    frames = _rookie_source_frames(sources)
+    common = frames[:len(COMMON_ROOKIE_SOURCES)]
+
+    rankings = {}
+    jobs = []
+    for i, (format, dir) in enumerate(format_dirs.items()):
+        start = len(COMMON_ROOKIE_SOURCES) + i * len(FORMAT_ROOKIE_SOURCES)
+        postdraft_rank, fantasy_calc = frames[start:start + len(FORMAT_ROOKIE_SOURCES)]
+        merged_rookies = _align_rookie_sources(common + [postdraft_rank, fantasy_calc])
+        merged_rookies = merged_rookies.rename_axis('player_cleansed_name').reset_index()
+        merged_rookies = merged_rookies.reindex(columns=ROOKIE_COLUMNS).sort_values(by='Rk', ascending=True)
+        jobs.append((merged_rookies, os.path.join(output_dir, f'{dir}_rookies'),
+                     {'formats': output_formats, 'number_formats': ROOKIE_NUMBER_FORMATS}))
+        rankings[format] = merged_rookies
+    if write:
+        # Large boards are written in parallel processes (see output_writers.write_many)
+        write_many(jobs)
+    return rankings
+
+
+def create_rookie_rankings(format):
+    """Rookie rankings for one format ('superflex' or anything else for 1QB); see build_rookie_rankings."""
+    format = format if format == "superflex" else "1qb"
+    return build_rookie_rankings([format])[format]
+
+def print_by_team(teams, frame, roster_max=10, minimums=None, position_col='Pos_x'):
+    """
+    Prints likely keepers and drops for each team. minimums ({'QB': 1, ...}) are
+    positional minimums the keeper set must meet (see keepers.KeeperEngine).
+    """
+    columns = ['player_cleansed_name', 'Team_x', 'Pos_x', 'Age', 'Value', 'value', 'Buy/Sell/Hold', 'Harmon Tier', 'Harmon Rank','Seasonal Overall', 'Target']
+    # Every team's keepers are selected at once (see keepers)
+    report = select_keepers(frame, 'NNF_Team', sort_by='value', roster_size=roster_max, minimums=minimums,
+                            value_col='Value', position_col=position_col, teams=teams)
+    display_cols = [col for col in columns if col in report.players.columns]
+    for nnf_team, team, totals in report.teams():
         print(team)
-        columns = ['player_cleansed_name', 'Team_x', 'Pos_x', 'Age', 'Value', 'value', 'Buy/Sell/Hold', 'Harmon Tier', 'Harmon Rank','Seasonal Overall', 'Target']
-        team.sort_values(by=['value'], inplace=True, ascending=False)
-        players = team.player_cleansed_name.tolist()
         print(nnf_team)
         print("Likely Kept:")
         print("-------------")
-        print(team[columns].head(10))
-        keeper_value = team['Value'].head(10).sum()
-        print(f"Value of Keepers: {keeper_value}")
+        print(team.loc[team['status'] == 'Keep', display_cols])
+        print(f"Value of Keepers: {totals['kept_value']}")
         print("Likely Dropped:")
         print("----------------")
-        roster_count = team['player_cleansed_name'].count()
-        roster_max = 10
-        if roster_count > roster_max:
-            need_to_cut = roster_count - roster_max
-            print(team[columns].tail(need_to_cut))
-            dropped_value = team['Value'].tail(need_to_cut).sum()
-            print(f"Value of dropped: {dropped_value}")
-            team_value = team['Value'].sum()
-            print(f"Total Team Value for {nnf_team}: {team_value}")
+        if totals['dropped'] > 0:
+            print(team.loc[team['status'] == 'Drop', display_cols])
+            print(f"Value of dropped: {totals['dropped_value']}")
+            print(f"Total Team Value for {nnf_team}: {totals['total_value']}")
             
             
 def get_sleeper_roster(league_id):
@@ -0,0 +1,109 @@
+"""
+Request coalescing for the data APIs.
+
+When a cached player list expires while many requests are in flight, only one
+of them should go back to DynamoDB / disk. Everyone else waits for that load
+and shares its result (or its error).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Call:
+    """One in-flight load that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time.
+
+    Callers that arrive while a call for the same key is running block until it
+    finishes and receive the same result, instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class CachedLoader:
+    """
+    TTL cache in front of a loader function, with concurrent misses coalesced.
+
+    Args:
+        loader: Called as loader(key) to produce a fresh value.
+        ttl_seconds: How long a loaded value is served before it is reloaded.
+            None means it never expires on its own (use invalidate()).
+        max_entries: Keep at most this many keys, dropping the least recently
+            used (None means unbounded; only safe for a fixed set of keys).
+    """
+
+    def __init__(self, loader, ttl_seconds=None, max_entries=None):
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._flight = SingleFlight()
+        self._entries = OrderedDict()  # key -> (value, expires_at), least recently used first
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _load(self, key):
+        value = self._loader(key)
+        expires_at = float('inf') if self.ttl_seconds is None else time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        self.loads += 1
+        return value
+
+    def get(self, key=None):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if time.monotonic() < expires_at:
+                if self.max_entries is not None:
+                    with self._lock:
+                        if key in self._entries:
+                            self._entries.move_to_end(key)
+                return value
+
+        return self._flight.do(key, lambda: self._load(key))
+
+    def invalidate(self, key=None):
+        with self._lock:
+            self._entries.pop(key, None)
@@ -0,0 +1,135 @@
+"""
+Server-side enrichment of a whole Sleeper league.
+
+A league page used to need a rosters call, a users call, a user lookup per
+roster and a batch value lookup. enriched_league() does all of it in one call:
+the league, rosters and users endpoints are fetched concurrently over a pooled
+requests.Session, owners are joined from the /users response (no per-roster
+user lookups), and every roster is enriched from the player store with value
+totals computed here.
+
+Upstream responses are cached per league for ROSTER_CACHE_TTL_SECONDS, so a
+page refresh does not go back to Sleeper.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from singleflight import CachedLoader
+
+SLEEPER_API_URL = 'https://api.sleeper.app/v1'
+ROSTER_CACHE_TTL_SECONDS = int(os.environ.get('ROSTER_CACHE_TTL', '60'))
+# League IDs come from request URLs, so the cache is bounded (least recently used leagues go first)
+LEAGUE_CACHE_SIZE = int(os.environ.get('LEAGUE_CACHE_SIZE', '256'))
+REQUEST_TIMEOUT_SECONDS = 10
+VALUE_FIELD = 'fantasy_calc_value'
+
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_executor = ThreadPoolExecutor(max_workers=8)
+
+
+class LeagueNotFound(LookupError):
+    """Sleeper has no league with the requested ID."""
+
+
+def fetch_json(path):
+    """GETs a Sleeper API path and returns the decoded JSON (None for a 404)."""
+    response = session.get(f'{SLEEPER_API_URL}/{path}', timeout=REQUEST_TIMEOUT_SECONDS)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_league(league_id):
+    """
+    Fetches the league, its rosters and its users concurrently.
+    Raises LeagueNotFound when Sleeper does not know the league.
+    """
+    futures = {
+        name: _executor.submit(fetch_json, f'league/{league_id}{suffix}')
+        for name, suffix in (('league', ''), ('rosters', '/rosters'), ('users', '/users'))
+    }
+    results = {name: future.result() for name, future in futures.items()}
+    if not results['league']:
+        raise LeagueNotFound(league_id)
+    return results
+
+
+league_cache = CachedLoader(fetch_league, ROSTER_CACHE_TTL_SECONDS, max_entries=LEAGUE_CACHE_SIZE)
+
+
+def _value(player):
+    value = player.get(VALUE_FIELD)
+    return value if isinstance(value, (int, float)) and value == value else 0
+
+
+def owners_by_id(users):
+    """{user_id: {'display_name', 'team_name', 'avatar'}} from a /league/<id>/users response."""
+    return {
+        user.get('user_id'): {
+            'display_name': user.get('display_name'),
+            'team_name': (user.get('metadata') or {}).get('team_name') or user.get('display_name'),
+            'avatar': user.get('avatar'),
+        }
+        for user in users or []
+    }
+
+
+def enrich_league(league, rosters, users, lookup):
+    """
+    Joins rosters with their owners and enriched player data.
+
+    Args:
+        league: The /league/<id> response.
+        rosters: The /league/<id>/rosters response.
+        users: The /league/<id>/users response.
+        lookup: Called with a Sleeper ID; returns the enriched player dict or None.
+
+    Returns:
+        dict: League info plus 'teams', highest total value first. Players without
+        enriched data keep their ID with an error entry, as in the batch route.
+    """
+    owners = owners_by_id(users)
+    teams = []
+    for roster in rosters or []:
+        owner = owners.get(roster.get('owner_id'), {})
+        starters = set(roster.get('starters') or [])
+        players = []
+        for sleeper_id in roster.get('players') or []:
+            player = lookup(sleeper_id)
+            if player is None:
+                player = {'sleeper_id': str(sleeper_id), 'error': 'Data not found'}
+            player['is_starter'] = sleeper_id in starters
+            players.append(player)
+        players.sort(key=_value, reverse=True)
+
+        teams.append({
+            'roster_id': roster.get('roster_id'),
+            'owner_id': roster.get('owner_id'),
+            'display_name': owner.get('display_name'),
+            'team_name': owner.get('team_name'),
+            'avatar': owner.get('avatar'),
+            'players': players,
+            'total_value': sum(_value(p) for p in players),
+            'starters_value': sum(_value(p) for p in players if p['is_starter']),
+        })
+
+    teams.sort(key=lambda team: team['total_value'], reverse=True)
+    return {
+        'league_id': league.get('league_id'),
+        'name': league.get('name'),
+        'season': league.get('season'),
+        'roster_positions': league.get('roster_positions'),
+        'teams': teams,
+    }
+
+
+def enriched_league(league_id, lookup):
+    """Fetches (or reuses cached) league data and returns it enriched, see enrich_league."""
+    data = league_cache.get(str(league_id))
+    return enrich_league(data['league'], data['rosters'], data['users'], lookup)
@@ -0,0 +1,213 @@
+"""
+Conditional, delta-aware refresh of the Sleeper players dump.
+
+The dump (server/data/nfl_players_data.json) is several megabytes and Sleeper
+asks clients to fetch it at most once a day. refresh_players() keeps its own
+fetch metadata next to the dump and:
+
+  - skips the download entirely while the dump is younger than REFRESH_INTERVAL_SECONDS;
+  - otherwise sends a conditional GET (If-None-Match / If-Modified-Since), so an
+    unchanged dump costs a 304 and no body;
+  - diffs a new dump against the previous one by player ID and folds the result
+    into a compact pending changes file:
+    {"new": {id: details}, "changed": {id: details}, "removed": [id, ...]}.
+
+Pending changes accumulate across refreshes until create_player_data.main(changes_path=...)
+consumes them (re-enriching only the affected players) and clears the file.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import requests
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DATA_DIR = os.path.join(CURRENT_DIR, '..', 'server', 'data')
+SLEEPER_PLAYERS_URL = 'https://api.sleeper.app/v1/players/nfl'
+PLAYERS_PATH = os.path.join(SERVER_DATA_DIR, 'nfl_players_data.json')
+CHANGES_PATH = os.path.join(SERVER_DATA_DIR, 'nfl_players_changes.json')
+REFRESH_INTERVAL_SECONDS = int(os.environ.get('SLEEPER_PLAYERS_REFRESH_SECONDS', str(24 * 60 * 60)))
+REQUEST_TIMEOUT_SECONDS = 60
+
+# Fields that change without anything about the player changing
+VOLATILE_FIELDS = {'news_updated'}
+
+
+def meta_path(path):
+    return f'{path}.meta.json'
+
+
+def read_meta(path=PLAYERS_PATH):
+    try:
+        with open(meta_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_players(path=PLAYERS_PATH):
+    """The stored dump ({sleeper_id: details}); empty when there is none yet."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(data, path, indent=None):
+    """Writes JSON atomically (temp file plus rename)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def is_fresh(meta, max_age=REFRESH_INTERVAL_SECONDS, now=None):
+    """True while the stored dump was fetched (or confirmed unchanged) less than max_age ago."""
+    if not meta:
+        return False
+    return (now or time.time()) - meta.get('checked_at', 0) < max_age
+
+
+def _comparable(details):
+    return {key: value for key, value in details.items() if key not in VOLATILE_FIELDS}
+
+
+def diff_players(old, new):
+    """
+    Compares two dumps by player ID.
+
+    Returns:
+        dict: {'new': {id: details}, 'changed': {id: details}, 'removed': [id, ...]}.
+        'changed' holds the new details of players whose fields differ (VOLATILE_FIELDS ignored).
+    """
+    changes = {'new': {}, 'changed': {}, 'removed': sorted(set(old) - set(new))}
+    for player_id, details in new.items():
+        previous = old.get(player_id)
+        if previous is None:
+            changes['new'][player_id] = details
+        elif _comparable(previous) != _comparable(details):
+            changes['changed'][player_id] = details
+    return changes
+
+
+def read_changes(path=CHANGES_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_pending_changes(path=CHANGES_PATH):
+    """The changes not yet consumed by create_player_data; None when there are none."""
+    try:
+        return read_changes(path)
+    except (OSError, ValueError):
+        return None
+
+
+def clear_changes(path=CHANGES_PATH):
+    """Marks the pending changes as consumed."""
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def merge_changes(pending, delta):
+    """
+    Folds a newer diff into changes that have not been consumed yet, so the result
+    describes the base dump -> latest dump (e.g. a player added and then removed
+    before consumption drops out entirely).
+    """
+    if not pending:
+        return delta
+    new = dict(pending.get('new') or {})
+    changed = dict(pending.get('changed') or {})
+    removed = set(pending.get('removed') or [])
+
+    for player_id, details in delta['new'].items():
+        if player_id in removed:
+            # Removed and back again: the consumer still has its old record
+            removed.discard(player_id)
+            changed[player_id] = details
+        else:
+            new[player_id] = details
+    for player_id, details in delta['changed'].items():
+        if player_id in new:
+            new[player_id] = details
+        else:
+            changed[player_id] = details
+    for player_id in delta['removed']:
+        if new.pop(player_id, None) is None:
+            changed.pop(player_id, None)
+            removed.add(player_id)
+    return {'new': new, 'changed': changed, 'removed': sorted(removed)}
+
+
+def changed_ids(changes):
+    """IDs whose enriched records must be rebuilt (new and changed players)."""
+    return set(changes.get('new') or {}) | set(changes.get('changed') or {})
+
+
+def refresh_players(path=PLAYERS_PATH, changes_path=CHANGES_PATH, force=False, max_age=REFRESH_INTERVAL_SECONDS):
+    """
+    Refreshes the stored Sleeper dump when it is stale.
+
+    Args:
+        path: Where the dump lives (its metadata is stored at <path>.meta.json).
+        changes_path: The pending changes file the new diff is folded into.
+        force: Ignore the freshness window (the request is still conditional).
+        max_age: Seconds a fetched dump is considered fresh.
+
+    Returns:
+        The pending changes (see diff_players and merge_changes) when a new dump
+        was stored, otherwise None.
+    """
+    meta = read_meta(path) if os.path.exists(path) else None
+    if not force and is_fresh(meta, max_age):
+        print(f"Sleeper players dump is fresh (checked {time.time() - meta['checked_at']:.0f}s ago), skipping download.")
+        return None
+
+    headers = {}
+    if meta and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta and meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    response = requests.get(SLEEPER_PLAYERS_URL, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS)
+
+    if response.status_code == 304:
+        meta['checked_at'] = time.time()
+        _write_json(meta, meta_path(path))
+        print("Sleeper players dump unchanged upstream.")
+        return None
+    response.raise_for_status()
+    players = response.json()
+    if not isinstance(players, dict) or not players:
+        raise ValueError("Sleeper players endpoint returned no players")
+
+    delta = diff_players(read_players(path), players)
+    changes = merge_changes(read_pending_changes(changes_path), delta)
+    # Pending changes first: a crash in between re-diffs against the old dump next time
+    _write_json(changes, changes_path)
+    _write_json(players, path, indent=4)
+    _write_json({
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched_at': time.time(),
+        'checked_at': time.time(),
+        'players': len(players),
+        'changes': {kind: len(entries) for kind, entries in delta.items()},
+    }, meta_path(path))
+    print(f"Sleeper players dump refreshed: {len(delta['new'])} new, {len(delta['changed'])} changed, "
+          f"{len(delta['removed'])} removed ({len(changed_ids(changes)) + len(changes['removed'])} pending).")
+    return changes
+
+
+if __name__ == '__main__':
+    refresh_players()
@@ -1,8 +1,14 @@
-import nfl_data_py as nfl
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
-from typing import List, Union
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from typing import Dict, Iterable, List, Optional, Union
 from name_utils import cleanse_name as cleanse_name_util
+from player_ids import PlayerIdCrosswalk
+import stats_cache
+from team_reports import build_team_report
 
 # --- Constants ---
 # Using ALL_CAPS for constants is a standard Python convention.
@@ -21,6 +27,13 @@ SKILL_COLUMNS_SEASON = [
     'tgts/gm', 'recs/gm', 'opps/gm', 'rec_yds/gm', 'tgt_sh', 'ry_sh', 
     'fantasy_points_ppr', 'fantasy_points_ppr/gm', 'Value'
 ]
+# Weekly stats expressed as a share of the team total
+SHARE_METRICS = ['opportunities', 'carries', 'targets', 'rushing_yards', 'receiving_yards']
+# Games in each rolling opportunity share, and the span of the target share EWMA
+ROLLING_SHARE_WINDOWS = (3, 5)
+TARGET_SHARE_EWMA_SPAN = 4
+# Seasons are read from the cache (or fetched) concurrently
+MAX_LOAD_WORKERS = 8
 POSITIONS = {
     'SKILL': ['RB', 'WR', 'TE'],
     'ALL': ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
@@ -32,55 +45,137 @@ POSITIONS = {
 def cleanse_name(series: pd.Series) -> pd.Series:
     """
     Cleanses player names in a pandas Series using the shared cleanse_name utility.
+    Categorical names are cleansed once per distinct name.
     """
-    return series.apply(cleanse_name_util)
+    return series.map(cleanse_name_util)
 
 
 # --- Data Creation Functions ---
 
-def calculate_share_metrics(weekly_df: pd.DataFrame) -> pd.DataFrame:
+def team_totals(weekly_df: pd.DataFrame, metrics: List[str] = SHARE_METRICS) -> pd.DataFrame:
+    """
+    Team-game totals of the metrics ('team_<metric>'), aligned to weekly_df's rows.
+    All totals come from one grouped aggregation broadcast back with one join.
+    """
+    # Team totals are per game, so multi-season frames also group by season
+    group_keys = ['season', 'recent_team', 'week'] if 'season' in weekly_df.columns else ['recent_team', 'week']
+    totals = weekly_df.groupby(group_keys, observed=True)[metrics].sum().add_prefix('team_')
+    return weekly_df[group_keys].join(totals, on=group_keys)
+
+
+def calculate_share_metrics(
+    weekly_df: pd.DataFrame,
+    rolling: bool = True,
+    history: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """
     Calculates player share of team totals for key offensive metrics.
 
     Args:
         weekly_df: The main DataFrame containing weekly player stats.
+        rolling: Also add the rolling usage shares (see add_rolling_shares).
+        history: Already processed earlier weeks, when weekly_df only holds new weeks.
 
     Returns:
-        The DataFrame with new columns for share metrics (e.g., 'opportunity_share').
-    """
-    metrics_to_share = [
-        'opportunities',
-        'carries',
-        'targets',
-        'rushing_yards',
-        'receiving_yards'
-    ]
-
-    # Use .transform('sum') to calculate the sum for each group (team/week)
-    # and broadcast it back to every row in that group.
-    for metric in metrics_to_share:
-        team_total_col = f'team_{metric}'
-        weekly_df[team_total_col] = weekly_df.groupby(
-            ['recent_team', 'week']
-        )[metric].transform('sum')
-
-        # Calculate the share metric and fill NaN values with 0
-        share_col = f'{metric}_share'
-        weekly_df[share_col] = (
-            weekly_df[metric] / weekly_df[team_total_col]
-        ).fillna(0)
-
-    # Clean up intermediate team total columns
-    team_total_cols_to_drop = [f'team_{m}' for m in metrics_to_share]
-    weekly_df.drop(columns=team_total_cols_to_drop, inplace=True)
+        The DataFrame with new columns for share metrics (e.g., 'opportunities_share').
+    """
+    totals = team_totals(weekly_df)
 
+    # Calculate the share metrics and fill NaN values (0 / 0) with 0
+    for metric in SHARE_METRICS:
+        weekly_df[f'{metric}_share'] = (weekly_df[metric] / totals[f'team_{metric}']).fillna(0)
+
+    if rolling:
+        add_rolling_shares(weekly_df, totals['team_opportunities'], history)
     return weekly_df
 
 
-def create_weekly_df(year: int) -> pd.DataFrame:
-    """Imports and processes weekly NFL data for a given year."""
-    weekly_df = nfl.import_weekly_data([year])
-    
+def _usage_frame(weekly_df: pd.DataFrame, team_opportunities: pd.Series, player_keys: List[str]) -> pd.DataFrame:
+    """Positional float64 copy of the columns the rolling metrics need."""
+    frame = pd.DataFrame({
+        'opportunities': weekly_df['opportunities'].to_numpy(dtype='float64'),
+        'team_opportunities': team_opportunities.to_numpy(dtype='float64'),
+        'targets_share': weekly_df['targets_share'].to_numpy(dtype='float64'),
+        'week': weekly_df['week'].to_numpy(),
+    })
+    for key in player_keys:
+        frame[key] = weekly_df[key].to_numpy()
+    return frame
+
+
+def add_rolling_shares(
+    weekly_df: pd.DataFrame,
+    team_opportunities: pd.Series,
+    history: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Adds per-player rolling usage over the player's games (restarting each season):
+    'opportunities_share_{n}wk' for each of ROLLING_SHARE_WINDOWS, i.e. the player's
+    opportunities over the last n games divided by the team's over the same games,
+    and 'targets_share_ewma', an exponentially weighted average of weekly target share.
+
+    With history (processed earlier weeks), only weekly_df's rows are computed: the
+    windows pick up each player's last few games from history and the EWMA continues
+    from the player's last value, so the result matches a full recompute.
+    """
+    player_keys = ['player_id', 'season'] if 'season' in weekly_df.columns else ['player_id']
+
+    # Work on positional copies sorted by player and week; results are put back in row order
+    frame = _usage_frame(weekly_df, team_opportunities, player_keys)
+    prior_games = pd.Series(0.0, index=frame.index)
+    prior_ewma = pd.Series(0.0, index=frame.index)
+    context = frame.iloc[:0]
+    if history is not None and len(history):
+        earlier = _usage_frame(history, team_totals(history, ['opportunities'])['team_opportunities'], player_keys)
+        earlier['targets_share_ewma'] = history['targets_share_ewma'].to_numpy(dtype='float64')
+        earlier = earlier[earlier['player_id'].isin(frame['player_id'].unique())]
+        earlier = earlier.sort_values(player_keys + ['week'], kind='stable')
+        # Just enough earlier games to fill the longest window
+        context = earlier.groupby(player_keys, observed=True, sort=False).tail(max(ROLLING_SHARE_WINDOWS) - 1)
+        context.index = range(len(frame), len(frame) + len(context))
+        last = earlier.groupby(player_keys, observed=True).agg(games=('week', 'size'), ewma=('targets_share_ewma', 'last'))
+        joined = frame[player_keys].join(last, on=player_keys)
+        prior_games, prior_ewma = joined['games'].fillna(0), joined['ewma'].fillna(0)
+
+    combined = pd.concat([frame, context]).sort_values(player_keys + ['week'], kind='stable')
+    keys = [combined[key] for key in player_keys]
+
+    # Windowed sums as differences of per-player cumulative sums
+    cumulative = combined[['opportunities', 'team_opportunities']].groupby(keys, observed=True, sort=False).cumsum()
+    for window in ROLLING_SHARE_WINDOWS:
+        windowed = cumulative - cumulative.groupby(keys, observed=True, sort=False).shift(window, fill_value=0)
+        share = (windowed['opportunities'] / windowed['team_opportunities']).fillna(0)
+        weekly_df[f'opportunities_share_{window}wk'] = share.loc[frame.index].to_numpy()
+
+    # Same result as .ewm(span=TARGET_SHARE_EWMA_SPAN).mean() per player, without the per-group
+    # window machinery: weight game k by decay**-k and divide the cumulative sums. A player
+    # with n0 earlier games and EWMA e0 carries in a weighted sum of e0 * (1 - decay**n0) / (1 - decay).
+    # Games per player-season are few, so the weights stay well within float range.
+    decay = 1 - 2 / (TARGET_SHARE_EWMA_SPAN + 1)
+    ordered = frame.sort_values(player_keys + ['week'], kind='stable')
+    k = ordered.groupby(player_keys, observed=True, sort=False).cumcount().to_numpy(dtype='float64')
+    weights = decay ** -k
+    weighted_sum = (ordered['targets_share'] * weights).groupby(
+        [ordered[key] for key in player_keys], observed=True, sort=False
+    ).cumsum() * decay ** k
+    n0 = prior_games.loc[ordered.index].to_numpy()
+    carried = prior_ewma.loc[ordered.index].to_numpy() * (1 - decay ** n0) / (1 - decay)
+    weight_total = (1 - decay ** (n0 + k + 1)) / (1 - decay)
+    ewma = (weighted_sum + decay ** (k + 1) * carried) / weight_total
+    weekly_df['targets_share_ewma'] = ewma.sort_index().to_numpy()
+    return weekly_df
+
+
+def add_weekly_features(
+    weekly_df: pd.DataFrame,
+    crosswalk: Optional[PlayerIdCrosswalk] = None,
+    history: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """
+    Adds the derived columns and share metrics to raw weekly data, plus 'sleeper_id'
+    (mapped from the nflverse gsis player_id) when a crosswalk with gsis IDs is passed.
+    Pass history (processed earlier weeks) when weekly_df only holds new weeks.
+    """
     # Feature Engineering
     weekly_df['opportunities'] = weekly_df['targets'].fillna(0) + weekly_df['carries'].fillna(0)
     weekly_df['tds'] = weekly_df['receiving_tds'].fillna(0) + weekly_df['rushing_tds'].fillna(0)
@@ -88,21 +183,128 @@ def create_weekly_df(year: int) -> pd.DataFrame:
     
     # Cleaning
     weekly_df['player_cleansed_name'] = cleanse_name(weekly_df['player_display_name'])
+
+    # IDs for joining to Sleeper/FantasyCalc data without name matching
+    if crosswalk is not None and crosswalk.mappings.get('gsis'):
+        weekly_df['sleeper_id'] = crosswalk.map_series('gsis', weekly_df['player_id']).to_numpy()
     
     # --- Integrate the new share metrics function ---
     print("Calculating share metrics...")
-    weekly_df = calculate_share_metrics(weekly_df)
-    
-    weekly_df.to_csv(f'weekly_{year}.csv', index=False)
+    weekly_df = calculate_share_metrics(weekly_df, history=history)
+    # Derived columns follow the same compact schema as the cached data
+    return stats_cache.apply_schema(weekly_df, stats_cache.WEEKLY_SCHEMA)
+
+
+def concat_seasons(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates per-season frames, keeping categorical columns categorical
+    (plain pd.concat falls back to object when the categories differ).
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    categorical = [col for col, dtype in frames[0].dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    for col in categorical:
+        categories = pd.api.types.union_categoricals(
+            [frame[col] for frame in frames if col in frame.columns], ignore_order=True
+        ).categories
+        frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_seasons(load, years: Iterable[int]) -> pd.DataFrame:
+    """Loads several seasons with a cache loader (e.g. stats_cache.load_weekly) concurrently."""
+    years = sorted(set(years))
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(years)) or 1) as executor:
+        frames = list(executor.map(load, years))
+    for year, frame in zip(years, frames):
+        if 'season' not in frame.columns:
+            frame['season'] = pd.Series(year, index=frame.index, dtype='int16')
+    return concat_seasons(frames)
+
+
+def create_weekly_df(
+    year: int, csv_path: Optional[str] = None, crosswalk: Optional[PlayerIdCrosswalk] = None
+) -> pd.DataFrame:
+    """
+    Loads (from the local Parquet cache, see stats_cache) and processes weekly NFL data for a given year.
+    Pass csv_path to also export the processed frame as CSV. The ID crosswalk is
+    loaded from disk unless one is passed.
+    """
+    crosswalk = crosswalk if crosswalk is not None else PlayerIdCrosswalk.load()
+    weekly_df = add_weekly_features(stats_cache.load_weekly(year), crosswalk=crosswalk)
+
+    if csv_path:
+        weekly_df.to_csv(csv_path, index=False)
     return weekly_df
 
 
+def update_weekly_df(
+    year: int, full: bool = False, cache_dir: Optional[str] = None, crosswalk: Optional[PlayerIdCrosswalk] = None
+) -> pd.DataFrame:
+    """
+    Incremental in-season refresh of the processed weekly data for one season.
+
+    Processed weeks are kept as week partitions (stats_cache 'weekly_features').
+    Each run loads them, takes only the weeks that are not processed yet from the
+    (cached) raw season, computes features, shares and the rolling windows for
+    just those rows (continuing from the processed weeks), and appends one
+    partition per new week. Pass full=True to reprocess the season, e.g. after
+    nflverse stat corrections to earlier weeks. The ID crosswalk is loaded from
+    disk unless one is passed.
+
+    Returns:
+        The processed season, as create_weekly_df would.
+    """
+    if full:
+        stats_cache.clear_weeks('weekly_features', year, cache_dir)
+    processed = stats_cache.read_weeks('weekly_features', year, cache_dir)
+    history = concat_seasons(processed) if processed else None
+
+    raw = stats_cache.load_weekly(year, cache_dir=cache_dir)
+    if history is not None:
+        raw = raw[~raw['week'].isin(history['week'].unique())]
+    if raw.empty:
+        print(f"Weekly data for {year} is up to date.")
+        return history
+
+    print(f"Processing weeks {sorted(raw['week'].unique().tolist())} of {year}...")
+    crosswalk = crosswalk if crosswalk is not None else PlayerIdCrosswalk.load()
+    new_weeks = add_weekly_features(raw.copy(), crosswalk=crosswalk, history=history)
+    for week, rows in new_weeks.groupby('week', sort=True):
+        stats_cache.write_week(rows, 'weekly_features', year, week, cache_dir)
+    return concat_seasons([history, new_weeks]) if history is not None else new_weeks
+
+
+def create_weekly_range_df(years: Iterable[int], crosswalk: Optional[PlayerIdCrosswalk] = None) -> pd.DataFrame:
+    """
+    Weekly data for several seasons in one frame, indexed by (season, week).
+    Seasons load concurrently from the cache; features and share metrics are computed once.
+    """
+    crosswalk = crosswalk if crosswalk is not None else PlayerIdCrosswalk.load()
+    weekly_df = add_weekly_features(load_seasons(stats_cache.load_weekly, years), crosswalk=crosswalk)
+    return weekly_df.set_index(['season', 'week']).sort_index()
+
+
 def create_season_df(year: int, weekly_df: pd.DataFrame) -> pd.DataFrame:
-    """Imports and processes seasonal NFL data."""
-    season_df = nfl.import_seasonal_data([year])
-    
-    player_ref = weekly_df[['player_id', 'player_cleansed_name', 'position', 'recent_team']].drop_duplicates()
-    season_df = season_df.merge(player_ref, on='player_id', how='left')
+    """Loads (from the local Parquet cache) and processes seasonal NFL data."""
+    return add_season_features(stats_cache.load_seasonal(year), weekly_df)
+
+
+def create_season_range_df(years: Iterable[int], weekly_df: pd.DataFrame) -> pd.DataFrame:
+    """Seasonal data for several seasons (see create_weekly_range_df for weekly_df)."""
+    return add_season_features(load_seasons(stats_cache.load_seasonal, years), weekly_df)
+
+
+def add_season_features(season_df: pd.DataFrame, weekly_df: pd.DataFrame) -> pd.DataFrame:
+    """Joins player names/teams from the weekly data and adds per-game columns."""
+    weekly_df = weekly_df.reset_index() if 'season' in weekly_df.index.names else weekly_df
+    ref_keys = ['player_id', 'season'] if 'season' in season_df.columns and 'season' in weekly_df.columns else ['player_id']
+    # Most recent team per player (and season)
+    player_ref = weekly_df[ref_keys + ['player_cleansed_name', 'position', 'recent_team']].drop_duplicates(
+        subset=ref_keys, keep='last'
+    )
+    season_df = season_df.merge(player_ref, on=ref_keys, how='left')
 
     season_df['tds'] = season_df['receiving_tds'] + season_df['rushing_tds']
     season_df['opportunities'] = season_df['targets'] + season_df['carries']
@@ -124,19 +326,13 @@ def display_team_stats(
     sort_by: str, 
     teams: Union[str, List[str]] = "all"
 ):
-    """Displays stats for specified teams, grouped and sorted."""
-    if teams == "all":
-        teams_to_show = df[group_by_col].dropna().unique()
-    else:
-        teams_to_show = teams
+    """Displays stats for specified teams, grouped and sorted (in one pass, see team_reports)."""
+    report = build_team_report(df, group_by_col, sort_by, teams=teams)
+    display_cols = [col for col in columns if col in df.columns]
 
-    for team in teams_to_show:
+    for team, team_df, _ in report.teams():
         print(f"--- Team: {team} ---")
-        team_df = df[df[group_by_col] == team]
-        
-        display_cols = [col for col in columns if col in team_df.columns]
-        
-        print(team_df[display_cols].sort_values(by=sort_by, ascending=False).to_string())
+        print(team_df[display_cols].to_string(index=False))
         print("\n")
 
 
@@ -147,6 +343,8 @@ def plot_weekly_metric(
     title: str = ""
 ):
     """A powerful function to plot weekly stats for a list of players."""
+    if 'week' in weekly_df.index.names:
+        weekly_df = weekly_df.reset_index()
     data = weekly_df[weekly_df['player_cleansed_name'].isin(players_to_plot)]
     
     pivot_data = data.pivot_table(
@@ -171,6 +369,100 @@ def plot_weekly_metric(
     plt.show()
 
 
+def team_player_groups(
+    weekly_df: pd.DataFrame,
+    positions: List[str] = POSITIONS['SKILL'],
+    top_n: int = 4,
+    by: str = 'opportunities'
+) -> Dict[str, List[str]]:
+    """Each team's top_n players at the given positions by total `by`, e.g. for render_weekly_charts."""
+    if 'week' in weekly_df.index.names:
+        weekly_df = weekly_df.reset_index()
+    data = weekly_df[weekly_df['position'].isin(positions)]
+    totals = data.groupby(['recent_team', 'player_cleansed_name'], observed=True)[by].sum().reset_index()
+    totals = totals.sort_values(['recent_team', by], ascending=[True, False])
+    top = totals.groupby('recent_team', observed=True).head(top_n)
+    return {str(team): [str(name) for name in names] for team, names in top.groupby('recent_team', observed=True)['player_cleansed_name']}
+
+
+def _render_chart(task: dict) -> str:
+    """
+    Draws one chart on the Agg canvas and saves it. Runs in a worker process, so it
+    uses Figure directly instead of pyplot's global state.
+    """
+    with plt.style.context('seaborn-v0_8-whitegrid'):
+        fig = Figure(figsize=(12, 7))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        # Fixed margins: tight_layout would draw every figure twice
+        fig.subplots_adjust(left=0.07, right=0.97, top=0.94, bottom=0.08)
+        for player, values in task['series'].items():
+            ax.plot(task['weeks'], values, marker='o', linestyle='-', label=player)
+        ax.set_xlabel("Week")
+        ax.set_ylabel(task['metric'].replace('_', ' ').title())
+        ax.set_title(task['title'])
+        ax.set_xticks(task['weeks'])
+        if task['series']:
+            ax.legend()
+        fig.savefig(task['path'])
+    return task['path']
+
+
+def render_weekly_charts(
+    weekly_df: pd.DataFrame,
+    groups: Dict[str, List[str]],
+    metrics: List[str],
+    output_dir: str,
+    fmt: str = 'png',
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Batch version of plot_weekly_metric: writes one chart per (group, metric) to
+    output_dir as '<group>_<metric>.<fmt>' (png or svg) without opening any windows.
+
+    The data is pivoted once for every player in every group; each chart then only
+    gets its few rows, and the charts are drawn in a process pool.
+
+    Args:
+        weekly_df: Weekly data (as from create_weekly_df) for one season.
+        groups: Chart group name -> cleansed player names, e.g. from team_player_groups.
+        metrics: Weekly columns to chart.
+        output_dir: Directory for the files (created if needed).
+        fmt: 'png' or 'svg'.
+        max_workers: Process pool size (default: CPU count); 1 renders in this process.
+
+    Returns:
+        The paths written.
+    """
+    if 'week' in weekly_df.index.names:
+        weekly_df = weekly_df.reset_index()
+    players = {player for names in groups.values() for player in names}
+    data = weekly_df[weekly_df['player_cleansed_name'].isin(players)]
+    pivot = data.pivot_table(
+        index='player_cleansed_name', columns='week', values=metrics, aggfunc='sum', observed=True
+    ).fillna(0)
+    weeks = list(range(1, int(weekly_df['week'].max()) + 1))
+
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = []
+    for group, names in groups.items():
+        names = [name for name in names if name in pivot.index]
+        for metric in metrics:
+            values = pivot[metric].reindex(index=names, columns=weeks, fill_value=0)
+            tasks.append({
+                'path': os.path.join(output_dir, f"{group}_{metric}.{fmt}"),
+                'metric': metric,
+                'title': f"{group} Weekly {metric.replace('_', ' ').title()}",
+                'weeks': weeks,
+                'series': {name: row.tolist() for name, row in zip(names, values.to_numpy())},
+            })
+
+    if max_workers == 1:
+        return [_render_chart(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_render_chart, tasks, chunksize=max(1, len(tasks) // ((max_workers or os.cpu_count() or 1) * 4))))
+
+
 # --- Main Execution Block ---
 
 def main():
@@ -0,0 +1,238 @@
+"""
+Local Parquet cache for the nfl_data_py weekly and seasonal datasets.
+
+Each season is stored as its own partition:
+
+    <cache_dir>/weekly/season=2023/data.parquet
+    <cache_dir>/weekly/season=2023/meta.json     remote version, fetch time, completeness
+
+Frames are cast to a declared schema (SCHEMAS) both when they are fetched and
+when they are read back, so every caller sees the same compact dtypes.
+
+Completed seasons are frozen: once cached they are never fetched again.
+The current season is re-fetched only when nflverse publishes a newer file
+(checked with a HEAD request for its ETag/Last-Modified, at most every
+CURRENT_SEASON_CHECK_SECONDS). When the network is unavailable the cached
+partition is used as is, so analysis runs also work offline.
+"""
+
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+import requests
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.environ.get('NFL_CACHE_DIR') or os.path.join(CURRENT_DIR, 'data', 'nfl_cache')
+CURRENT_SEASON_CHECK_SECONDS = int(os.environ.get('NFL_CACHE_CHECK_SECONDS', '3600'))
+HEAD_TIMEOUT_SECONDS = 5
+
+# Both datasets are built by nfl_data_py from the same per-season nflverse release file
+PLAYER_STATS_URL = 'https://github.com/nflverse/nflverse-data/releases/download/player_stats/player_stats_{season}.parquet'
+
+
+def _import_weekly(season):
+    import nfl_data_py as nfl
+    return nfl.import_weekly_data([season])
+
+
+def _import_seasonal(season):
+    import nfl_data_py as nfl
+    return nfl.import_seasonal_data([season])
+
+
+DATASETS = {
+    'weekly': _import_weekly,
+    'seasonal': _import_seasonal,
+}
+
+
+def current_nfl_season(today=None):
+    """The season in progress (or most recently played); a season ends after the February Super Bowl."""
+    today = today or datetime.date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def remote_version(season):
+    """ETag/Last-Modified of the nflverse file for a season, or None when it cannot be checked."""
+    try:
+        response = requests.head(PLAYER_STATS_URL.format(season=season), allow_redirects=True, timeout=HEAD_TIMEOUT_SECONDS)
+    except requests.RequestException as e:
+        print(f"Could not check nflverse for season {season} (using cache): {e}")
+        return None
+    if response.status_code != 200:
+        return None
+    return response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+
+# Declared column types, enforced whenever a frame is fetched or read from the cache.
+# Identifiers are categorical, season/week small ints; every other numeric column is float32.
+ID_COLUMNS = [
+    'player_id', 'sleeper_id', 'player_name', 'player_display_name', 'player_cleansed_name', 'position',
+    'position_group', 'headshot_url', 'recent_team', 'opponent_team', 'season_type',
+]
+WEEKLY_SCHEMA = dict({column: 'category' for column in ID_COLUMNS}, season='int16', week='int8')
+SEASONAL_SCHEMA = dict({column: 'category' for column in ID_COLUMNS}, season='int16', games='int8')
+SCHEMAS = {
+    'weekly': WEEKLY_SCHEMA,
+    'seasonal': SEASONAL_SCHEMA,
+    # Processed weekly frames (stats.update_weekly_df), one partition per week
+    'weekly_features': WEEKLY_SCHEMA,
+}
+
+
+def apply_schema(df, schema):
+    """
+    Casts a frame to a declared schema in place and returns it. Columns missing from the
+    frame are skipped; integer columns that contain NaN stay float32. Undeclared numeric
+    columns become float32 and undeclared booleans are left alone.
+    """
+    for column in df.columns:
+        dtype = schema.get(column)
+        current = df[column].dtype
+        if dtype is None:
+            if pd.api.types.is_float_dtype(current) or pd.api.types.is_integer_dtype(current):
+                if current != 'float32':
+                    df[column] = df[column].astype('float32')
+        elif dtype == 'category':
+            if not isinstance(current, pd.CategoricalDtype):
+                df[column] = df[column].astype('category')
+        elif current != dtype:
+            df[column] = df[column].astype(dtype if not df[column].isna().any() else 'float32')
+    return df
+
+
+def partition_path(dataset, season, cache_dir=None):
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, dataset, f'season={season}')
+
+
+def read_meta(path):
+    try:
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_partition(path, dataset):
+    return apply_schema(pd.read_parquet(os.path.join(path, 'data.parquet')), SCHEMAS[dataset])
+
+
+def write_partition(df, path, meta):
+    """Writes data.parquet and meta.json to a temp directory and renames it into place."""
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+    try:
+        df.to_parquet(os.path.join(tmp_path, 'data.parquet'), index=False)
+        write_meta(tmp_path, meta)
+        shutil.rmtree(path, ignore_errors=True)
+        os.rename(tmp_path, path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def write_meta(path, meta):
+    with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+
+def needs_refresh(meta, season, today=None, check_version=remote_version):
+    """
+    Decides whether a cached partition must be fetched again.
+    Returns (refresh, remote): remote is the version token seen upstream,
+    or None when it was not checked (or could not be).
+    """
+    if meta is None or (not meta.get('complete') and season < current_nfl_season(today)):
+        # Never cached, or cached while in progress and the season has finished since
+        return True, None
+    if meta.get('complete') or time.time() - meta.get('checked_at', 0) < CURRENT_SEASON_CHECK_SECONDS:
+        return False, None
+    remote = check_version(season)
+    # Offline (remote None): keep the cached copy
+    return remote is not None and remote != meta.get('remote_version'), remote
+
+
+def load_season(dataset, season, cache_dir=None, fetch=None, today=None, check_version=remote_version):
+    """
+    Returns one season of a dataset, from the cache when it is current.
+
+    Args:
+        dataset: 'weekly' or 'seasonal'.
+        season: The NFL season year.
+        cache_dir: Cache root (defaults to NFL_CACHE_DIR or data/nfl_cache).
+        fetch: Called as fetch(season) on a miss; defaults to the nfl_data_py importer.
+    """
+    fetch = fetch or DATASETS[dataset]
+    path = partition_path(dataset, season, cache_dir)
+    meta = read_meta(path)
+    refresh, remote = needs_refresh(meta, season, today, check_version)
+
+    if not refresh:
+        if remote is not None:
+            # Unchanged upstream; skip the check until the interval has passed again
+            meta['checked_at'] = time.time()
+            write_meta(path, meta)
+        return read_partition(path, dataset)
+
+    try:
+        df = apply_schema(fetch(season), SCHEMAS[dataset])
+    except Exception as e:
+        if meta is None:
+            raise
+        print(f"Could not fetch {dataset} data for {season}, using cached copy: {e}")
+        return read_partition(path, dataset)
+
+    if remote is None and season >= current_nfl_season(today):
+        remote = check_version(season)
+    write_partition(df, path, {
+        'season': season,
+        'complete': season < current_nfl_season(today),
+        'remote_version': remote,
+        'fetched_at': time.time(),
+        'checked_at': time.time(),
+    })
+    print(f"Cached {dataset} data for {season} ({len(df)} rows).")
+    return df
+
+
+def read_weeks(dataset, season, cache_dir=None):
+    """
+    Reads the week partitions (<dataset>/season=YYYY/week=NN.parquet) of a season,
+    in week order. Returns an empty list when none have been written.
+    """
+    path = partition_path(dataset, season, cache_dir)
+    if not os.path.isdir(path):
+        return []
+    names = sorted(name for name in os.listdir(path) if name.startswith('week=') and name.endswith('.parquet'))
+    return [apply_schema(pd.read_parquet(os.path.join(path, name)), SCHEMAS[dataset]) for name in names]
+
+
+def write_week(df, dataset, season, week, cache_dir=None):
+    """Writes (or replaces) one week partition via a temp file and rename."""
+    path = partition_path(dataset, season, cache_dir)
+    os.makedirs(path, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.parquet', dir=path)
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, os.path.join(path, f'week={int(week):02d}.parquet'))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def clear_weeks(dataset, season, cache_dir=None):
+    shutil.rmtree(partition_path(dataset, season, cache_dir), ignore_errors=True)
+
+
+def load_weekly(season, **kwargs):
+    return load_season('weekly', season, **kwargs)
+
+
+def load_seasonal(season, **kwargs):
+    return load_season('seasonal', season, **kwargs)
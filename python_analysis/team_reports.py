@@ -0,0 +1,133 @@
+"""
+Grouped per-team reports built in one pass over the data.
+
+The frame is sorted once by (team, sort column). Each player's rank within
+their team comes from a single groupby cumcount, and the keeper/drop split and
+team totals come from one grouped aggregation. The cost is linear in the rows
+no matter how many teams there are; nothing is re-filtered per team.
+
+    report = build_team_report(df, 'NNF_Team', sort_by='value', keep=10, value_col='Value')
+    write_team_report(report, 'teams.html')
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from html import escape
+from typing import List, Optional, Union
+
+import pandas as pd
+
+
+@dataclass
+class TeamReport:
+    """Players in team/rank order plus one summary row per team."""
+    players: pd.DataFrame
+    summary: pd.DataFrame
+    group_col: str
+
+    def teams(self):
+        """(team, players, summary row) for each team, from one pass over the sorted players."""
+        for team, players in self.players.groupby(self.group_col, observed=True, sort=False):
+            yield team, players, self.summary.loc[team]
+
+
+def build_team_report(
+    df: pd.DataFrame,
+    group_col: str,
+    sort_by: str,
+    columns: Optional[List[str]] = None,
+    keep: Optional[int] = None,
+    value_col: Optional[str] = None,
+    ascending: bool = False,
+    teams: Union[str, List[str]] = "all"
+) -> TeamReport:
+    """
+    Groups and ranks every team at once.
+
+    Args:
+        df: One row per player.
+        group_col: The team column.
+        sort_by: Column players are ranked by within their team.
+        columns: Columns to keep in the report (missing ones are skipped); all by default.
+        keep: Roster size; players ranked within it are 'Keep', the rest 'Drop'.
+        value_col: Column summed into the team totals (defaults to sort_by).
+        ascending: Rank ascending instead of best-first.
+        teams: "all" or a list of teams to include, reported in that order.
+
+    Returns:
+        TeamReport. players adds 'team_rank' (and 'status' with keep); summary has
+        players and total_value per team, plus kept/dropped counts and values with keep.
+    """
+    value_col = value_col or sort_by
+    data = df[df[group_col].notna()] if teams == "all" else df[df[group_col].isin(teams)]
+
+    # Teams come out in sorted order, or in the order given when teams is a list
+    team_order = None if teams == "all" else {team: i for i, team in reversed(list(enumerate(teams)))}
+    data = data.sort_values(
+        [group_col, sort_by], ascending=[True, ascending], kind='stable', na_position='last',
+        key=lambda column: column.map(team_order) if team_order is not None and column.name == group_col else column
+    )
+    data = data.assign(team_rank=data.groupby(group_col, observed=True, sort=False).cumcount() + 1)
+
+    values = pd.to_numeric(data[value_col], errors='coerce').fillna(0)
+    parts = {'players': data['team_rank'], 'total_value': values}
+    aggregations = {'players': 'count', 'total_value': 'sum'}
+    if keep is not None:
+        kept = data['team_rank'] <= keep
+        data['status'] = kept.map({True: 'Keep', False: 'Drop'})
+        parts.update(kept=kept, dropped=~kept, kept_value=values.where(kept, 0), dropped_value=values.where(~kept, 0))
+        aggregations.update(kept='sum', dropped='sum', kept_value='sum', dropped_value='sum')
+    summary = pd.DataFrame(parts).groupby(data[group_col], observed=True, sort=False).agg(aggregations)
+
+    if columns is not None:
+        report_cols = [group_col] + [c for c in columns if c in data.columns and c != group_col]
+        data = data[report_cols + [c for c in ('team_rank', 'status') if c in data.columns and c not in report_cols]]
+    return TeamReport(players=data.reset_index(drop=True), summary=summary, group_col=group_col)
+
+
+def _json_ready(frame: pd.DataFrame):
+    """Records with NaN as null (via pandas' own JSON encoder)."""
+    return json.loads(frame.to_json(orient='records'))
+
+
+def write_team_report(report: TeamReport, path: str, fmt: Optional[str] = None) -> str:
+    """
+    Writes every team to one report file.
+
+    Args:
+        report: From build_team_report.
+        path: Output file.
+        fmt: 'csv', 'html' or 'json'; taken from the file extension by default.
+            CSV is one table in team/rank order; HTML has a section per team with
+            its totals; JSON maps each team to {"summary": {...}, "players": [...]}.
+    """
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    if fmt == 'csv':
+        report.players.to_csv(path, index=False)
+    elif fmt == 'json':
+        summary = _json_ready(report.summary.reset_index())
+        players = {}
+        for record in _json_ready(report.players):
+            players.setdefault(str(record[report.group_col]), []).append(record)
+        body = {
+            str(row[report.group_col]): {'summary': row, 'players': players.get(str(row[report.group_col]), [])}
+            for row in summary
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(body, f, indent=2)
+    elif fmt == 'html':
+        sections = []
+        for team, players, totals in report.teams():
+            totals_text = ', '.join(f"{escape(str(name))}: {value:,.0f}" for name, value in totals.items())
+            sections.append(
+                f"<h2>{escape(str(team))}</h2>\n<p>{totals_text}</p>\n"
+                + players.drop(columns=[report.group_col]).to_html(index=False, na_rep='')
+            )
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("<html><head><meta charset=\"utf-8\"></head><body>\n" + "\n".join(sections) + "\n</body></html>\n")
+    else:
+        raise ValueError(f"Unsupported report format '{fmt}' (use csv, html or json)")
+    return path
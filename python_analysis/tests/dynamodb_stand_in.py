@@ -0,0 +1,99 @@
+"""
+In-memory stand-in for the low-level DynamoDB client, covering the calls the data handler makes.
+Items are stored in the wire format ({'S': ...}, {'N': ...}) so responses match the real client.
+"""
+import re
+
+
+def to_attribute(value):
+    if value is None:
+        return {'NULL': True}
+    if isinstance(value, bool):
+        return {'BOOL': value}
+    if isinstance(value, (int, float)):
+        return {'N': str(value)}
+    if isinstance(value, list):
+        return {'L': [to_attribute(v) for v in value]}
+    if isinstance(value, dict):
+        return {'M': {k: to_attribute(v) for k, v in value.items()}}
+    return {'S': str(value)}
+
+
+def from_attribute(attribute):
+    (type_tag, value), = attribute.items()
+    return float(value) if type_tag == 'N' else value
+
+
+class DynamoDBStandIn:
+
+    def __init__(self, table_name, key_name='sleeper_id', indexes=None, page_size=100):
+        self.table_name = table_name
+        self.key_name = key_name
+        # index name -> (partition key, sort key)
+        self.indexes = indexes or {}
+        self.page_size = page_size
+        self.items = {}
+        self.calls = {}
+
+    def _record(self, operation):
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+
+    def put(self, item):
+        self.items[str(item[self.key_name])] = {k: to_attribute(v) for k, v in item.items() if v is not None}
+
+    def _page(self, rows, exclusive_start_key, limit):
+        start = 0
+        if exclusive_start_key:
+            start_id = exclusive_start_key[self.key_name]['S']
+            start = next(i for i, row in enumerate(rows) if row[self.key_name]['S'] == start_id) + 1
+        size = min(limit or self.page_size, self.page_size)
+        page = rows[start:start + size]
+        response = {'Items': page, 'Count': len(page)}
+        if start + size < len(rows):
+            response['LastEvaluatedKey'] = {self.key_name: page[-1][self.key_name]}
+        return response
+
+    def get_item(self, TableName, Key):
+        self._record('get_item')
+        item = self.items.get(Key[self.key_name]['S'])
+        return {'Item': item} if item else {}
+
+    def batch_get_item(self, RequestItems):
+        self._record('batch_get_item')
+        request = RequestItems[self.table_name]
+        found = [self.items[k[self.key_name]['S']] for k in request['Keys'] if k[self.key_name]['S'] in self.items]
+        return {'Responses': {self.table_name: found}, 'UnprocessedKeys': {}}
+
+    def scan(self, TableName, ExclusiveStartKey=None, Limit=None):
+        self._record('scan')
+        return self._page(list(self.items.values()), ExclusiveStartKey, Limit)
+
+    def query(self, TableName, IndexName, KeyConditionExpression, ExpressionAttributeNames,
+              ExpressionAttributeValues, ScanIndexForward=True, Limit=None, ExclusiveStartKey=None):
+        self._record('query')
+        partition_key, sort_key = self.indexes[IndexName]
+        names, values = ExpressionAttributeNames, ExpressionAttributeValues
+
+        key_clause = re.match(r'(#\w+) = (:\w+)', KeyConditionExpression)
+        assert names[key_clause.group(1)] == partition_key
+        key_value = values[key_clause.group(2)]['S']
+
+        low, high = float('-inf'), float('inf')
+        between = re.search(r'(#\w+) BETWEEN (:\w+) AND (:\w+)', KeyConditionExpression)
+        lower = re.search(r'(#\w+) >= (:\w+)', KeyConditionExpression)
+        upper = re.search(r'(#\w+) <= (:\w+)', KeyConditionExpression)
+        if between:
+            low, high = from_attribute(values[between.group(2)]), from_attribute(values[between.group(3)])
+        elif lower:
+            low = from_attribute(values[lower.group(2)])
+        elif upper:
+            high = from_attribute(values[upper.group(2)])
+
+        # Sparse index: only items carrying both index keys are present
+        rows = [
+            item for item in self.items.values()
+            if item.get(partition_key, {}).get('S') == key_value and sort_key in item
+            and low <= from_attribute(item[sort_key]) <= high
+        ]
+        rows.sort(key=lambda item: from_attribute(item[sort_key]), reverse=not ScanIndexForward)
+        return self._page(rows, ExclusiveStartKey, Limit)
@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import MagicMock, patch
 import pandas as pd
 import io
+import gzip
+import json
 import sys
 import os
 
@@ -60,6 +62,42 @@ class TestAmplifyProcessing(unittest.TestCase):
         # check put_item was called
         self.assertTrue(mock_batch.put_item.called)
         
+    @patch('amplify_processing_handler.s3')
+    def test_publish_snapshot(self, mock_s3):
+        df = pd.DataFrame([
+            {'sleeper_id': '123', 'fantasy_calc_value': 5000.0, 'overall_rank': float('nan')},
+            {'sleeper_id': '456', 'fantasy_calc_value': 2000.5, 'overall_rank': 12.0}
+        ])
+
+        manifest = amplify_processing_handler.publish_snapshot(df, 'test-bucket')
+
+        self.assertEqual(manifest['count'], 2)
+        keys = [c.kwargs['Key'] for c in mock_s3.put_object.call_args_list]
+        # Manifest must be written after the snapshot it points to
+        self.assertEqual(keys[-1], amplify_processing_handler.SNAPSHOT_MANIFEST_KEY)
+        self.assertIn(manifest['json_key'], keys)
+
+        body = mock_s3.put_object.call_args_list[0].kwargs['Body']
+        items = json.loads(gzip.decompress(body))
+        self.assertEqual(items[0], {'sleeper_id': '123', 'fantasy_calc_value': 5000})
+        self.assertEqual(items[1]['overall_rank'], 12)
+
+    @patch('amplify_processing_handler.s3')
+    def test_publish_snapshot_with_mixed_type_column(self, mock_s3):
+        df = pd.DataFrame([
+            {'sleeper_id': '123', 'height': '5-8'},
+            {'sleeper_id': '456', 'height': 73}
+        ])
+
+        manifest = amplify_processing_handler.publish_snapshot(df, 'test-bucket')
+
+        keys = [c.kwargs['Key'] for c in mock_s3.put_object.call_args_list]
+        self.assertEqual(keys[-1], amplify_processing_handler.SNAPSHOT_MANIFEST_KEY)
+        self.assertIn('parquet_key', manifest)
+
+    def test_publish_snapshot_without_bucket(self):
+        self.assertIsNone(amplify_processing_handler.publish_snapshot(pd.DataFrame(), None))
+
     def test_cleanse_name(self):
         self.assertEqual(amplify_processing_handler.cleanse_name("Patrick Mahomes II"), "patrick mahomes")
         self.assertEqual(amplify_processing_handler.cleanse_name("Calkins, Ryan"), "calkins ryan") 
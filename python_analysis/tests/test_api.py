@@ -7,6 +7,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from api_server import app
+from sleeper_league import LeagueNotFound
 
 @pytest.fixture
 def client():
@@ -28,3 +29,52 @@ def test_get_player_404(client):
     rv = client.get('/api/enriched-players/sleeper/invalid_id_99999')
     assert rv.status_code == 404
     assert b"Player not found" in rv.data or b"error" in rv.data
+
+def test_players_by_position_in_rank_order(client):
+    """Position route returns only that position, best players first"""
+    rv = client.get('/api/enriched-players/position/wr?limit=5')
+    assert rv.status_code == 200
+    players = rv.get_json()
+    assert 0 < len(players) <= 5
+    assert all(p['position'] == 'WR' for p in players)
+    values = [p.get('fantasy_calc_value') or 0 for p in players]
+    assert values == sorted(values, reverse=True)
+
+def test_players_by_team(client):
+    rv = client.get('/api/enriched-players/team/BUF')
+    assert rv.status_code == 200
+    assert all(p['team'] == 'BUF' for p in rv.get_json())
+
+def test_players_by_position_invalid_limit(client):
+    rv = client.get('/api/enriched-players/position/WR?limit=0')
+    assert rv.status_code == 400
+
+def test_top_players_by_value(client):
+    rv = client.get('/api/enriched-players/top?by=value&position=WR&n=10')
+    assert rv.status_code == 200
+    players = rv.get_json()
+    assert 0 < len(players) <= 10
+    assert all(p['position'] == 'WR' for p in players)
+    values = [p['fantasy_calc_value'] for p in players]
+    assert values == sorted(values, reverse=True)
+
+def test_top_players_unknown_metric(client):
+    rv = client.get('/api/enriched-players/top?by=shoe_size')
+    assert rv.status_code == 400
+
+def test_search_players(client):
+    rv = client.get('/api/enriched-players/search?q=a&k=5')
+    assert rv.status_code == 200
+    players = rv.get_json()
+    assert 0 < len(players) <= 5
+    values = [p.get('fantasy_calc_value') or 0 for p in players]
+    assert values == sorted(values, reverse=True)
+
+def test_search_requires_query(client):
+    rv = client.get('/api/enriched-players/search?k=5')
+    assert rv.status_code == 400
+
+def test_enriched_league_not_found(client, mocker):
+    mocker.patch('api_server.enriched_league', side_effect=LeagueNotFound('1'))
+    rv = client.get('/api/enriched-players/league/1')
+    assert rv.status_code == 404
@@ -0,0 +1,74 @@
+"""
+Tests for the async (ASGI) serving mode, driven directly through the ASGI interface.
+"""
+
+import asyncio
+import json
+import os
+
+from asgi_server import PlayerAPI
+
+PLAYERS = [
+    {'sleeper_id': '1', 'position': 'RB', 'team': 'ATL', 'fantasy_calc_value': 11081, 'fc_rank': 1},
+    {'sleeper_id': '2', 'position': 'WR', 'team': 'CIN', 'fantasy_calc_value': 9500, 'fc_rank': 3},
+]
+
+
+async def call(app, method, path, query=b'', body=None):
+    messages = []
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+
+    async def receive():
+        return {'type': 'http.request', 'body': payload, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query}
+    await app(scope, receive, send)
+    body = messages[1]['body']
+    return messages[0]['status'], json.loads(body) if body else None
+
+
+def make_app(tmp_path, players=PLAYERS):
+    path = tmp_path / 'players.json'
+    path.write_text(json.dumps(players), encoding='utf-8')
+    return PlayerAPI(str(path), check_interval=3600), path
+
+
+def test_routes_match_flask_shapes(tmp_path):
+    app, _ = make_app(tmp_path)
+
+    async def scenario():
+        assert await call(app, 'GET', '/api/enriched-players') == (200, PLAYERS)
+        assert await call(app, 'GET', '/api/enriched-players/sleeper/2') == (200, PLAYERS[1])
+        status, body = await call(app, 'GET', '/api/enriched-players/sleeper/invalid_id_99999')
+        assert status == 404 and 'error' in body
+        assert await call(app, 'GET', '/api/enriched-players/position/rb') == (200, [PLAYERS[0]])
+        assert (await call(app, 'GET', '/api/enriched-players/top', b'by=value&n=1'))[1] == [PLAYERS[0]]
+        assert (await call(app, 'GET', '/api/enriched-players/top', b'n=0'))[0] == 400
+        assert await call(app, 'POST', '/api/enriched-players/batch', body={'sleeper_ids': ['1', 'KC']}) == (
+            200, [PLAYERS[0], {'sleeper_id': 'KC', 'error': 'Data not found'}]
+        )
+        assert (await call(app, 'POST', '/api/enriched-players/batch', body={'ids': []}))[0] == 400
+
+    asyncio.run(scenario())
+
+
+def test_reload_swaps_store_without_affecting_in_flight_requests(tmp_path):
+    app, path = make_app(tmp_path)
+
+    async def scenario():
+        old_store = await app.current_store()
+
+        path.write_text(json.dumps(PLAYERS[:1]), encoding='utf-8')
+        os.utime(path, ns=(old_store.version[0] + 10**9, old_store.version[0] + 10**9))
+        await app.refresh()
+
+        assert app.store is not old_store
+        assert (await call(app, 'GET', '/api/enriched-players'))[1] == PLAYERS[:1]
+        # A request that started before the swap still sees a complete old version
+        assert json.loads(bytes(old_store.all_json)) == PLAYERS
+        app._watcher.cancel()
+
+    asyncio.run(scenario())
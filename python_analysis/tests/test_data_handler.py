@@ -0,0 +1,267 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import base64
+import gzip
+import json
+import sys
+import os
+
+# Add parent directory to path so we can import modules from the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock boto3 before importing the handler
+sys.modules['boto3'] = MagicMock()
+
+import amplify_data_handler
+from dynamodb_stand_in import DynamoDBStandIn
+
+
+def s3_object(payload):
+    body = MagicMock()
+    body.read.return_value = payload
+    return {'Body': body}
+
+
+def api_event(path, method='GET', body=None):
+    event = {'rawPath': path, 'requestContext': {'http': {'method': method}}}
+    if body is not None:
+        event['body'] = json.dumps(body)
+    return event
+
+
+class TestDataHandlerSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        amplify_data_handler._manifest_cache.update({'manifest': None, 'checked_at': 0.0})
+        amplify_data_handler._snapshot_body_cache.update({'version': None, 'body': None})
+        amplify_data_handler.full_list_cache.invalidate()
+
+    @patch('amplify_data_handler.BUCKET_NAME', 'test-bucket')
+    @patch('amplify_data_handler.dynamodb')
+    @patch('amplify_data_handler.s3')
+    def test_full_list_served_from_snapshot(self, mock_s3, mock_dynamodb):
+        players = [{'sleeper_id': '123', 'fantasy_calc_value': 5000}]
+        manifest = {'version': 'v1', 'json_key': 'snapshots/players/v1/players.json.gz'}
+        objects = {
+            amplify_data_handler.SNAPSHOT_MANIFEST_KEY: json.dumps(manifest).encode('utf-8'),
+            manifest['json_key']: gzip.compress(json.dumps(players).encode('utf-8'))
+        }
+        mock_s3.get_object.side_effect = lambda Bucket, Key: s3_object(objects[Key])
+
+        for _ in range(2):
+            result = amplify_data_handler.lambda_handler(api_event('/api/enriched-players'), None)
+
+            self.assertEqual(result['statusCode'], 200)
+            self.assertTrue(result['isBase64Encoded'])
+            self.assertEqual(result['headers']['Content-Encoding'], 'gzip')
+            self.assertEqual(result['headers']['X-Data-Version'], 'v1')
+            self.assertEqual(json.loads(gzip.decompress(base64.b64decode(result['body']))), players)
+
+        # Manifest and snapshot are each read once per container, and the table is never scanned
+        self.assertEqual(mock_s3.get_object.call_count, 2)
+        mock_dynamodb.scan.assert_not_called()
+
+    @patch('amplify_data_handler.SNAPSHOT_MODE', 'redirect')
+    @patch('amplify_data_handler.BUCKET_NAME', 'test-bucket')
+    @patch('amplify_data_handler.s3')
+    def test_full_list_redirects_to_presigned_url(self, mock_s3):
+        manifest = {'version': 'v2', 'json_key': 'snapshots/players/v2/players.json.gz'}
+        mock_s3.get_object.return_value = s3_object(json.dumps(manifest).encode('utf-8'))
+        mock_s3.generate_presigned_url.return_value = 'https://example.com/players.json.gz'
+
+        result = amplify_data_handler.lambda_handler(api_event('/api/enriched-players'), None)
+
+        self.assertEqual(result['statusCode'], 302)
+        self.assertEqual(result['headers']['Location'], 'https://example.com/players.json.gz')
+
+    @patch('amplify_data_handler.BUCKET_NAME', 'test-bucket')
+    @patch('amplify_data_handler.dynamodb')
+    @patch('amplify_data_handler.s3')
+    def test_full_list_falls_back_to_scan(self, mock_s3, mock_dynamodb):
+        mock_s3.get_object.side_effect = Exception('NoSuchKey')
+        mock_dynamodb.scan.side_effect = [
+            {'Items': [{'sleeper_id': {'S': '123'}}], 'LastEvaluatedKey': {'sleeper_id': {'S': '123'}}},
+            {'Items': [{'sleeper_id': {'S': '456'}}]}
+        ]
+
+        result = amplify_data_handler.lambda_handler(api_event('/api/enriched-players'), None)
+
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(json.loads(result['body']), [{'sleeper_id': '123'}, {'sleeper_id': '456'}])
+        self.assertEqual(mock_dynamodb.scan.call_count, 2)
+
+
+class TestDataHandlerReads(unittest.TestCase):
+
+    def setUp(self):
+        amplify_data_handler.player_cache = amplify_data_handler.PlayerLookupCache(
+            max_size=2, ttl_seconds=300, negative_ttl_seconds=60
+        )
+
+    def test_deserialize_item_returns_native_types(self):
+        item = {
+            'sleeper_id': {'S': '123'},
+            'fantasy_calc_value': {'N': '5000'},
+            'trend_30_day': {'N': '-12.5'},
+            'active': {'BOOL': True},
+            'notes': {'NULL': True},
+            'tags': {'L': [{'S': 'rookie'}, {'N': '1'}]},
+            'metadata': {'M': {'rookie_year': {'S': '2023'}}}
+        }
+
+        self.assertEqual(amplify_data_handler.deserialize_item(item), {
+            'sleeper_id': '123',
+            'fantasy_calc_value': 5000,
+            'trend_30_day': -12.5,
+            'active': True,
+            'notes': None,
+            'tags': ['rookie', 1],
+            'metadata': {'rookie_year': '2023'}
+        })
+
+    @patch('amplify_data_handler.dynamodb')
+    def test_get_single_player(self, mock_dynamodb):
+        mock_dynamodb.get_item.return_value = {
+            'Item': {'sleeper_id': {'S': '123'}, 'fantasy_calc_value': {'N': '5000'}}
+        }
+
+        result = amplify_data_handler.lambda_handler(api_event('/api/enriched-players/sleeper/123'), None)
+
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual(json.loads(result['body']), {'sleeper_id': '123', 'fantasy_calc_value': 5000})
+        mock_dynamodb.get_item.assert_called_once_with(
+            TableName=amplify_data_handler.TABLE_NAME, Key={'sleeper_id': {'S': '123'}}
+        )
+
+    def test_single_lookups_are_cached(self):
+        db = DynamoDBStandIn(amplify_data_handler.TABLE_NAME)
+        db.put({'sleeper_id': '123', 'fantasy_calc_value': 5000})
+
+        with patch('amplify_data_handler.dynamodb', db):
+            for _ in range(3):
+                found = amplify_data_handler.lambda_handler(api_event('/api/enriched-players/sleeper/123'), None)
+                missing = amplify_data_handler.lambda_handler(api_event('/api/enriched-players/sleeper/KC'), None)
+                self.assertEqual(found['statusCode'], 200)
+                self.assertEqual(missing['statusCode'], 404)
+
+        # One round trip each; repeats (including the unknown ID) are served from memory
+        self.assertEqual(db.calls['get_item'], 2)
+        stats = amplify_data_handler.player_cache.stats()
+        self.assertEqual((stats['hits'], stats['negative_hits'], stats['misses']), (2, 2, 2))
+
+    def test_lookup_cache_eviction_and_version_scope(self):
+        cache = amplify_data_handler.player_cache
+        cache.put('1', '{}')
+        cache.put('2', '{}')
+        cache.get('1', None)
+        cache.put('3', '{}')  # evicts '2', the least recently used
+
+        self.assertEqual(cache.get('2', None), (False, None))
+        self.assertEqual(cache.get('1', None), (True, '{}'))
+        # A new data version invalidates everything
+        self.assertEqual(cache.get('1', 'v2'), (False, None))
+
+    def test_negative_entries_expire(self):
+        cache = amplify_data_handler.player_cache
+        with patch('amplify_data_handler.time.monotonic', return_value=1000.0):
+            cache.put('KC', None)
+        with patch('amplify_data_handler.time.monotonic', return_value=1030.0):
+            self.assertEqual(cache.get('KC', None), (True, None))
+        with patch('amplify_data_handler.time.monotonic', return_value=1061.0):
+            self.assertEqual(cache.get('KC', None), (False, None))
+
+
+class TestDataHandlerIndexedRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.db = DynamoDBStandIn(
+            amplify_data_handler.TABLE_NAME,
+            indexes={'byPosition': ('position', 'fc_rank'), 'byTeam': ('team', 'fc_rank')},
+            page_size=2
+        )
+        players = [
+            ('1', 'RB', 'ATL', 1), ('2', 'RB', 'DET', 2), ('3', 'WR', 'CIN', 3),
+            ('4', 'RB', 'BUF', 5), ('5', 'QB', 'BUF', 4), ('6', 'RB', 'NYJ', 8),
+            ('7', 'RB', None, None)
+        ]
+        for sleeper_id, position, team, fc_rank in players:
+            self.db.put({'sleeper_id': sleeper_id, 'position': position, 'team': team, 'fc_rank': fc_rank})
+
+        patcher = patch('amplify_data_handler.dynamodb', self.db)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, path, **params):
+        event = api_event(path)
+        event['queryStringParameters'] = {k: str(v) for k, v in params.items()} or None
+        return amplify_data_handler.lambda_handler(event, None)
+
+    def test_position_route_returns_players_in_rank_order(self):
+        result = self.get('/api/enriched-players/position/rb')
+
+        self.assertEqual(result['statusCode'], 200)
+        ids = [p['sleeper_id'] for p in json.loads(result['body'])]
+        # Unranked player is not in the sparse index; results span several pages
+        self.assertEqual(ids, ['1', '2', '4', '6'])
+        self.assertGreater(self.db.calls['query'], 1)
+        self.assertNotIn('scan', self.db.calls)
+
+    def test_position_route_applies_limit_and_rank_range(self):
+        limited = json.loads(self.get('/api/enriched-players/position/RB', limit=3)['body'])
+        self.assertEqual([p['sleeper_id'] for p in limited], ['1', '2', '4'])
+
+        ranged = json.loads(self.get('/api/enriched-players/position/RB', min_rank=2, max_rank=5)['body'])
+        self.assertEqual([p['sleeper_id'] for p in ranged], ['2', '4'])
+
+        top = json.loads(self.get('/api/enriched-players/position/RB', max_rank=2)['body'])
+        self.assertEqual([p['sleeper_id'] for p in top], ['1', '2'])
+
+    def test_team_route(self):
+        result = json.loads(self.get('/api/enriched-players/team/BUF')['body'])
+        self.assertEqual([p['sleeper_id'] for p in result], ['5', '4'])
+        self.assertEqual(result[0]['fc_rank'], 4)
+
+    def test_invalid_query_parameter(self):
+        result = self.get('/api/enriched-players/team/BUF', limit='abc')
+        self.assertEqual(result['statusCode'], 400)
+
+
+class TestDataHandlerSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.db = DynamoDBStandIn(amplify_data_handler.TABLE_NAME)
+        players = [('1', 'justin jefferson', 'WR', 9800), ('2', 'justin herbert', 'QB', 5200), ('3', 'jamarr chase', 'WR', 10500)]
+        for sleeper_id, name, position, value in players:
+            self.db.put({'sleeper_id': sleeper_id, 'player_cleansed_name': name, 'position': position, 'fantasy_calc_value': value})
+
+        for target, value in (('dynamodb', self.db), ('BUCKET_NAME', None)):
+            patcher = patch(f'amplify_data_handler.{target}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        amplify_data_handler.full_list_cache.invalidate()
+        amplify_data_handler._search_index_cache['source'] = None
+
+    def search(self, **params):
+        event = api_event('/api/enriched-players/search')
+        event['queryStringParameters'] = {k: str(v) for k, v in params.items()} or None
+        return amplify_data_handler.lambda_handler(event, None)
+
+    def test_search_returns_best_matches_first(self):
+        result = self.search(q='Justin')
+        self.assertEqual(result['statusCode'], 200)
+        self.assertEqual([p['sleeper_id'] for p in json.loads(result['body'])], ['1', '2'])
+
+        result = self.search(q='j', position='WR', k=1)
+        self.assertEqual([p['sleeper_id'] for p in json.loads(result['body'])], ['3'])
+
+        # The index is built once for the cached player list
+        self.search(q='her')
+        self.assertEqual(self.db.calls['scan'], 1)
+
+    def test_search_requires_query(self):
+        self.assertEqual(self.search()['statusCode'], 400)
+        self.assertEqual(self.search(q='jus', k=0)['statusCode'], 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for the streaming Fleaflicker roster ingester.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import fleaflicker_rosters
+import services
+from player_ids import PlayerIdCrosswalk
+
+
+def league_payload(league_id):
+    return {'rosters': [
+        {'team': {'id': league_id * 10 + team, 'name': f'Team {team}'}, 'players': [
+            {'proPlayer': {'id': 17603, 'nameFull': 'Bijan Robinson', 'position': 'RB', 'proTeamAbbreviation': 'ATL'}},
+            {'proPlayer': {'id': 1000 + team, 'nameFull': f"Player {team} Jr.", 'position': 'WR'}},
+        ]}
+        for team in range(3)
+    ]}
+
+
+def fake_get(url, params=None, timeout=None):
+    if params['league_id'] == 999:
+        raise fleaflicker_rosters.requests.ConnectionError('down')
+    response = MagicMock()
+    response.json.return_value = league_payload(params['league_id'])
+    return response
+
+
+def test_fetch_many_leagues_into_one_typed_frame():
+    crosswalk = PlayerIdCrosswalk({'fleaflicker': {'17603': '9509'}})
+    leagues = [(1, 2024, 18), (2, 2024, 18), (999, 2024, 18)]
+
+    with patch.object(fleaflicker_rosters.session, 'get', side_effect=fake_get) as get:
+        rosters = fleaflicker_rosters.fetch_rosters(leagues, crosswalk=crosswalk)
+
+    assert get.call_count == 3
+    # The failing league is skipped; two leagues of three teams with two players each remain
+    assert len(rosters) == 12
+    assert sorted(rosters['league_id'].unique()) == [1, 2]
+    assert str(rosters['position'].dtype) == 'category'
+    assert rosters['season'].dtype == 'int16'
+    assert set(rosters.loc[rosters['fleaflicker_id'] == 17603, 'sleeper_id']) == {'9509'}
+    assert rosters['sleeper_id'].isna().sum() == 6
+    assert 'player 0' in set(rosters['player_cleansed_name'])
+
+
+def test_single_league_failure_raises():
+    with patch.object(fleaflicker_rosters.session, 'get', side_effect=fake_get):
+        with pytest.raises(fleaflicker_rosters.requests.ConnectionError):
+            services.get_league_rosters(league_id=999)
+        with pytest.raises(fleaflicker_rosters.requests.ConnectionError):
+            fleaflicker_rosters.fetch_rosters([(1, 2024, 18), (999, 2024, 18)], crosswalk=PlayerIdCrosswalk({}), strict=True)
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = fleaflicker_rosters.RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start >= 4 / 50 - 0.005
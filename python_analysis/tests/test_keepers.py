@@ -0,0 +1,79 @@
+"""
+Tests for the league-wide keeper/cut engine.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keepers import KeeperEngine, select_keepers
+
+MINIMUMS = {'QB': 1, 'TE': 1}
+
+
+def league(teams=3, players=8, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'NNF_Team': np.repeat([f'Team {t}' for t in range(teams)], players),
+        'Name': [f'P{i}' for i in range(teams * players)],
+        'Pos': rng.choice(['QB', 'RB', 'WR', 'TE'], teams * players, p=[0.15, 0.35, 0.35, 0.15]),
+        'value': rng.integers(100, 10000, teams * players).astype(float),
+    })
+
+
+def best_keepers(team, roster_size, minimums):
+    """Exhaustive search over every keeper set of one team."""
+    best = None
+    for combo in itertools.combinations(team.index, min(roster_size, len(team))):
+        chosen = team.loc[list(combo)]
+        if all((chosen['Pos'] == pos).sum() >= min(count, (team['Pos'] == pos).sum()) for pos, count in minimums.items()):
+            best = max(best or 0, chosen['value'].sum())
+    return best
+
+
+def test_matches_exhaustive_search():
+    df = league()
+    df.loc[0, 'value'] = np.nan
+    result = select_keepers(df, 'NNF_Team', 'value', roster_size=4, minimums=MINIMUMS)
+
+    for team, players in df.groupby('NNF_Team'):
+        expected = best_keepers(players.fillna({'value': 0}), 4, MINIMUMS)
+        assert result.summary.loc[team, 'kept_value'] == expected
+    assert (result.summary['kept'] == 4).all()
+    assert result.summary['total_value'].sum() == df['value'].sum()
+
+    kept = result.players[result.players['status'] == 'Keep']
+    for team, players in kept.groupby('NNF_Team'):
+        assert {'QB', 'TE'} <= set(players['Pos']) or not {'QB', 'TE'} <= set(df.loc[df['NNF_Team'] == team, 'Pos'])
+    # Best first, the player without a value last
+    assert result.available['value'].iloc[:-1].is_monotonic_decreasing
+    assert np.isnan(result.available['value'].iloc[-1])
+    assert len(result.available) == len(df) - 12
+    by_position = result.available_by_position()
+    assert by_position['players'].sum() == len(result.available)
+
+
+def test_what_if_roster_sizes():
+    engine = KeeperEngine(league(teams=12, players=25), 'NNF_Team', 'value')
+    sweep = engine.what_if(range(5, 26, 5), minimums={'QB': 2})
+    assert len(sweep) == 5 * 12
+    kept_value = sweep['kept_value'].groupby(level='roster_size').sum()
+    assert kept_value.is_monotonic_increasing
+    assert (sweep.xs(25, level='roster_size')['dropped'] == 0).all()
+    # Without minimums the selection is the plain top-N by value
+    top_n = engine.select(10).players
+    assert (top_n['status'].eq('Keep') == (top_n['team_rank'] <= 10)).all()
+
+
+def test_minimums_larger_than_roster():
+    with pytest.raises(ValueError):
+        select_keepers(league(), 'NNF_Team', 'value', roster_size=1, minimums=MINIMUMS)
+
+
+def test_listed_teams_keep_their_order():
+    result = select_keepers(league(), 'NNF_Team', 'value', roster_size=4, teams=['Team 2', 'Team 0', 'Team 9'])
+    assert [team for team, _, _ in result.teams()] == ['Team 2', 'Team 0']
+    assert list(result.summary.index) == ['Team 2', 'Team 0']
+    assert list(result.players['NNF_Team'].unique()) == ['Team 2', 'Team 0']
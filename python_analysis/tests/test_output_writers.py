@@ -0,0 +1,59 @@
+"""
+Tests for the streaming xlsx and columnar output writers.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+import output_writers
+
+BOARD = pd.DataFrame({
+    'Rk': [1.0, 2.0, np.nan],
+    'player_cleansed_name': ['ashton jeanty', 'travis hunter', 'cam ward'],
+    'Height': ['5-8', 73, None],
+    'value': [6308.0, np.nan, 4100.0],
+})
+
+
+@pytest.mark.parametrize('streaming', [True, False])
+def test_xlsx_round_trip_keeps_values_and_formatting(tmp_path, monkeypatch, streaming):
+    if not streaming:
+        monkeypatch.setattr(output_writers, 'xlsxwriter', None)
+    path = output_writers.write_xlsx(BOARD, str(tmp_path / 'board.xlsx'), sheet_name='Rookies',
+                                     number_formats={'value': '#,##0'})
+
+    back = pd.read_excel(path, sheet_name='Rookies')
+    assert list(back.columns) == list(BOARD.columns)
+    assert back['value'].isna().tolist() == [False, True, False]
+    assert back['player_cleansed_name'].tolist() == BOARD['player_cleansed_name'].tolist()
+
+    sheet = load_workbook(path)['Rookies']
+    assert sheet['A1'].font.b
+    assert sheet.freeze_panes == 'A2'
+    assert sheet.auto_filter.ref == 'A1:D4'
+    assert sheet['D2'].number_format == '#,##0'
+    assert sheet.column_dimensions['B'].width >= len('player_cleansed_name')
+
+
+def test_write_outputs_siblings(tmp_path):
+    base = str(tmp_path / 'out' / 'superflex_rookies')
+    written = output_writers.write_outputs(BOARD, base, formats=('parquet', 'csv'))
+    assert written == {'parquet': base + '.parquet', 'csv': base + '.csv'}
+
+    parquet = pd.read_parquet(written['parquet'])
+    # The mixed-type column is stored as strings
+    assert parquet['Height'].tolist()[:2] == ['5-8', '73']
+    assert pd.read_csv(written['csv'])['value'].iloc[0] == 6308.0
+
+    with pytest.raises(ValueError):
+        output_writers.write_outputs(BOARD, base, formats=('xls',))
+
+
+def test_write_many_in_parallel(tmp_path, monkeypatch):
+    monkeypatch.setattr(output_writers, 'PARALLEL_MIN_CELLS', 0)
+    jobs = [(BOARD, str(tmp_path / name), {'formats': ('xlsx', 'csv')}) for name in ('superflex', '1QB')]
+    results = output_writers.write_many(jobs)
+    assert [result['xlsx'] for result in results] == [str(tmp_path / 'superflex.xlsx'), str(tmp_path / '1QB.xlsx')]
+    assert pd.read_excel(results[1]['xlsx'])['Rk'].iloc[0] == 1
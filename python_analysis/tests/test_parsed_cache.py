@@ -0,0 +1,48 @@
+"""
+Tests for the parsed-source cache and the shared-load rookie builder.
+"""
+
+import os
+from unittest.mock import patch
+
+import pandas as pd
+
+import parsed_cache
+import services
+
+
+def test_unchanged_sources_are_parsed_once(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    first, second = str(tmp_path / 'a.csv'), str(tmp_path / 'b.csv')
+    pd.DataFrame({'name': ['A', 'B'], 'value': [1, 2]}).to_csv(first, index=False, sep=';')
+    pd.DataFrame({'name': ['C'], 'value': [3]}).to_excel(second.replace('.csv', '.xlsx'), index=False)
+    second = second.replace('.csv', '.xlsx')
+
+    a, b = parsed_cache.read_tables([(first, {'delimiter': ';'}), second], cache_dir=cache_dir)
+    assert a['value'].tolist() == [1, 2] and b['name'].tolist() == ['C']
+    a['value'] = 0  # callers get their own copy
+
+    parsed_cache.clear_memory()
+    with patch.object(parsed_cache, 'parse', side_effect=AssertionError("parsed again")):
+        cached = parsed_cache.read_table(first, cache_dir=cache_dir, delimiter=';')
+    assert cached['value'].tolist() == [1, 2]
+
+    # An edited file is parsed again and replaces its old cache entry
+    pd.DataFrame({'name': ['A'], 'value': [9]}).to_csv(first, index=False, sep=';')
+    os.utime(first, ns=(os.stat(first).st_atime_ns, os.stat(first).st_mtime_ns + 10**9))
+    assert parsed_cache.read_table(first, cache_dir=cache_dir, delimiter=';')['value'].tolist() == [9]
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_build_rookie_rankings_for_every_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(parsed_cache, 'PARSED_CACHE_DIR', str(tmp_path))
+    parsed_cache.clear_memory()
+    rankings = services.build_rookie_rankings(write=False)
+
+    assert set(rankings) == {'superflex', '1qb'}
+    for df in rankings.values():
+        assert list(df.columns) == services.ROOKIE_COLUMNS
+        assert df['player_cleansed_name'].is_unique
+        assert df['Rk'].dropna().is_monotonic_increasing
+    # Every workbook was parsed once for both formats: three shared plus two per format
+    assert len(os.listdir(tmp_path)) == 3 + 2 * 2
@@ -0,0 +1,44 @@
+"""
+Tests for the platform ID -> Sleeper ID crosswalk.
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from player_ids import PlayerIdCrosswalk, refresh_crosswalk
+
+FC_DEBUG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'fc_debug.json')
+
+SLEEPER_PLAYERS = {
+    '9509': {'full_name': 'Bijan Robinson', 'gsis_id': ' 00-0038542', 'espn_id': 4430807},
+    'KC': {'full_name': 'Kansas City', 'gsis_id': None},
+}
+
+
+def test_refresh_merges_sources_and_persists(tmp_path):
+    path = str(tmp_path / 'crosswalk.json')
+    with open(FC_DEBUG_PATH, 'r', encoding='utf-8') as f:
+        fantasycalc = json.load(f)
+
+    refresh_crosswalk(fantasycalc_players=fantasycalc, path=path)
+    crosswalk = refresh_crosswalk(sleeper_players=SLEEPER_PLAYERS, path=path)
+
+    assert crosswalk.to_sleeper('fleaflicker', 17603) == '9509'
+    assert crosswalk.to_sleeper('mfl', '16161') == '9509'
+    assert crosswalk.to_sleeper('gsis', '00-0038542') == '9509'
+    assert crosswalk.to_sleeper('espn', '4430807') == '9509'
+    assert crosswalk.to_sleeper('gsis', 'missing') is None
+    assert PlayerIdCrosswalk.load(path).mappings == crosswalk.mappings
+
+
+def test_map_series_is_vectorized_over_ids():
+    crosswalk = PlayerIdCrosswalk({'fleaflicker': {'17603': '9509', '1': '2'}})
+
+    mapped = crosswalk.map_series('fleaflicker', pd.Series([17603.0, None, 1.0]))
+
+    assert mapped.tolist()[0] == '9509'
+    assert pd.isna(mapped.tolist()[1])
+    assert mapped.tolist()[2] == '2'
+    assert crosswalk.map_series('espn', pd.Series(['1'])).isna().all()
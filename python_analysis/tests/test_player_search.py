@@ -0,0 +1,52 @@
+"""
+Tests for the prefix search index behind the search/autocomplete routes.
+"""
+
+import json
+
+from player_search import PlayerSearchIndex
+from player_store import PlayerStore
+
+PLAYERS = [
+    {'sleeper_id': '1', 'player_cleansed_name': "ja'marr chase", 'position': 'WR', 'fantasy_calc_value': 10500},
+    {'sleeper_id': '2', 'player_cleansed_name': 'justin jefferson', 'position': 'WR', 'fantasy_calc_value': 9800},
+    {'sleeper_id': '3', 'player_cleansed_name': 'justin fields', 'position': 'QB', 'fantasy_calc_value': 2100},
+    {'sleeper_id': '4', 'player_cleansed_name': 'justin herbert', 'position': 'QB', 'fantasy_calc_value': 5200},
+    {'sleeper_id': '5', 'player_cleansed_name': 'jefferson unvalued', 'position': 'TE'},
+]
+
+
+def test_prefix_matches_full_name_and_words_by_value():
+    index = PlayerSearchIndex.from_players(PLAYERS)
+
+    assert index.search('Justin') == [1, 3, 2]
+    assert index.search('justin je') == [1]
+    # Word prefixes match anywhere in the name; players without a value rank last
+    assert index.search('jef') == [1, 4]
+    # Queries are normalized the same way as names
+    assert index.search('JaMarr') == [0]
+    assert index.search("Ja'Marr Chase Jr.") == [0]
+    assert index.search('zz') == []
+    assert index.search('   ') == []
+
+
+def test_position_filter_and_k():
+    index = PlayerSearchIndex.from_players(PLAYERS)
+
+    assert index.search('justin', k=2) == [1, 3]
+    assert index.search('justin', position='qb') == [3, 2]
+
+
+def test_store_search_json():
+    store = PlayerStore.from_players(PLAYERS)
+
+    results = json.loads(store.search_json('jus', k=2, position='QB'))
+    assert [p['sleeper_id'] for p in results] == ['4', '3']
+
+
+def test_suffix_only_query_is_searched_as_typed():
+    index = PlayerSearchIndex(['Vance McDonald', 'Ivan Pace', 'Davante Adams'], [10, 20, 30], ['TE', 'LB', 'WR'])
+
+    # cleanse_name strips "v" and "iv" as name suffixes; they still prefix-match first names
+    assert index.search('v') == [0]
+    assert index.search('IV') == [1]
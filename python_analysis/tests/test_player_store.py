@@ -0,0 +1,145 @@
+"""
+Tests for the load-once player store used by api_server.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from player_store import PlayerStore, PlayerStoreManager, load_store, table_dir_for
+from player_table import PlayerTable
+
+PLAYERS = [
+    {'sleeper_id': '1', 'full_name': 'Bijan Robinson', 'position': 'RB', 'team': 'ATL', 'fantasy_calc_value': 11081},
+    {'sleeper_id': '2', 'full_name': 'Jahmyr Gibbs', 'position': 'RB', 'team': 'DET', 'fantasy_calc_value': 10042},
+    {'sleeper_id': None, 'full_name': 'No Id'},
+]
+
+RANKED_PLAYERS = [
+    {'sleeper_id': '1', 'position': 'RB', 'fantasy_calc_value': 9000, 'overall_rank': 3, 'trend_30_day': -50},
+    {'sleeper_id': '2', 'position': 'WR', 'fantasy_calc_value': 9500, 'overall_rank': 1, 'trend_30_day': 120},
+    {'sleeper_id': '3', 'position': 'WR', 'fantasy_calc_value': 7000, 'overall_rank': 2},
+    {'sleeper_id': '4', 'position': 'QB', 'fantasy_calc_value': 8000, 'trend_30_day': 300},
+]
+
+
+def write_players(path, players):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(players, f)
+
+
+def test_store_indexes_and_encodes_once():
+    store = PlayerStore.from_players(PLAYERS)
+
+    assert len(store) == 3
+    assert store.get(1)['full_name'] == 'Bijan Robinson'
+    assert json.loads(store.player_json('2'))['team'] == 'DET'
+    assert store.player_json('missing') is None
+    assert json.loads(bytes(store.all_json)) == PLAYERS
+    assert [p['sleeper_id'] for p in json.loads(store.indexed_json('position', 'rb'))] == ['1', '2']
+    assert json.loads(store.batch_json(['2', 'KC'])) == [
+        PLAYERS[1], {'sleeper_id': 'KC', 'error': 'Data not found'}
+    ]
+
+
+def top_ids(store, *args):
+    return [p['sleeper_id'] for p in json.loads(store.top_json(*args))]
+
+
+def test_top_uses_precomputed_orderings():
+    store = PlayerStore.from_players(RANKED_PLAYERS)
+
+    assert top_ids(store, 'value', None, 3) == ['2', '1', '4']
+    assert top_ids(store, 'value', 'wr', 50) == ['2', '3']
+    assert top_ids(store, 'overall_rank', None, 50) == ['2', '3', '1']
+    # Players without the metric are left out; field names work as aliases
+    assert top_ids(store, 'trend_30_day', None, 50) == ['4', '2', '1']
+    assert top_ids(store, 'value', 'K', 5) == []
+
+
+def test_top_rejects_unknown_metric():
+    store = PlayerStore.from_players(RANKED_PLAYERS)
+    with pytest.raises(KeyError):
+        store.top_json('age')
+
+
+def test_manager_loads_once_and_reloads_on_change(tmp_path):
+    path = tmp_path / 'players.json'
+    write_players(path, PLAYERS[:1])
+    manager = PlayerStoreManager(str(path), check_interval=0)
+
+    first = manager.get()
+    assert manager.get() is first
+    assert manager.reloads == 1
+
+    write_players(path, PLAYERS[:2])
+    os.utime(path, ns=(first.version[0] + 10**9, first.version[0] + 10**9))
+
+    second = manager.get()
+    assert second is not first
+    assert len(second) == 2
+    assert manager.reloads == 2
+    # The old store is untouched, so in-flight requests keep a consistent view
+    assert len(first) == 1
+
+
+def test_manager_keeps_last_good_store_on_bad_file(tmp_path):
+    path = tmp_path / 'players.json'
+    write_players(path, PLAYERS[:1])
+    manager = PlayerStoreManager(str(path), check_interval=0)
+    good = manager.get()
+
+    path.write_text('{not json', encoding='utf-8')
+    assert manager.get() is good
+
+
+def test_manager_missing_file_serves_empty_store(tmp_path):
+    manager = PlayerStoreManager(str(tmp_path / 'missing.json'), check_interval=0)
+    assert len(manager.get()) == 0
+
+
+def test_indexed_json_rank_range():
+    players = [
+        {'sleeper_id': str(i), 'team': 'BUF', 'fc_rank': rank, 'fantasy_calc_value': 100 - i}
+        for i, rank in enumerate([5, 2, None, 9])
+    ]
+    store = PlayerStore.from_players(players)
+
+    assert [p['sleeper_id'] for p in json.loads(store.indexed_json('team', 'BUF'))] == ['1', '0', '3', '2']
+    assert [p['sleeper_id'] for p in json.loads(store.indexed_json('team', 'BUF', min_rank=3))] == ['0', '3']
+    assert [p['sleeper_id'] for p in json.loads(store.indexed_json('team', 'BUF', limit=1))] == ['1']
+    assert json.loads(store.indexed_json('team', 'KC')) == []
+
+
+def test_load_store_writes_and_maps_shared_table(tmp_path):
+    path = tmp_path / 'players.json'
+    write_players(path, PLAYERS)
+
+    first = load_store(str(path))
+    assert len(first) == 3
+    assert isinstance(first.table.offsets, np.memmap)
+
+    # A second process (worker) maps the same table instead of parsing the JSON
+    path.write_text('not parsed again', encoding='utf-8')
+    table_dirs = os.listdir(table_dir_for(str(path)))
+    assert len(table_dirs) == 1
+    second = load_store(str(path), first.version)
+    assert json.loads(bytes(second.all_json)) == PLAYERS
+    assert second.get('2')['team'] == 'DET'
+
+
+def test_mapped_table_matches_in_memory_table(tmp_path):
+    path = tmp_path / 'players.json'
+    write_players(path, RANKED_PLAYERS)
+    mapped = load_store(str(path))
+    in_memory = PlayerStore.from_players(RANKED_PLAYERS)
+
+    assert mapped.all_json == in_memory.all_json
+    # The full list is served from the mapping without a per-request copy
+    assert isinstance(mapped.all_json, memoryview)
+    assert b''.join(mapped.table.iter_json(chunk_size=64)) == bytes(mapped.all_json)
+    for by in ('value', 'overall_rank', 'trend'):
+        assert mapped.top_json(by, None, 10) == in_memory.top_json(by, None, 10)
+    assert len(PlayerTable.from_players([])) == 0
@@ -0,0 +1,33 @@
+"""
+Tests for the query parameter parsers shared by the player APIs.
+"""
+
+import pytest
+
+from query_params import MAX_SEARCH_RESULTS, parse_rank_query, parse_search_query, parse_top_query
+
+
+def test_rank_query_reads_optional_positive_integers():
+    assert parse_rank_query({'limit': '5', 'min_rank': '', 'max_rank': None}) == {'limit': 5, 'min_rank': None, 'max_rank': None}
+    # The Lambda event has no queryStringParameters at all when the URL has none
+    assert parse_rank_query(None) == {'limit': None, 'min_rank': None, 'max_rank': None}
+
+
+@pytest.mark.parametrize('value', ['0', '-3', 'ten'])
+def test_rank_query_rejects_non_positive_values(value):
+    with pytest.raises(ValueError, match="'limit'"):
+        parse_rank_query({'limit': value})
+
+
+def test_search_query_defaults_and_caps_k():
+    assert parse_search_query({'q': ' jeff ', 'position': 'WR'}) == ('jeff', 'WR', 10)
+    assert parse_search_query({'q': 'jeff', 'k': '500'}) == ('jeff', None, MAX_SEARCH_RESULTS)
+    with pytest.raises(ValueError, match="'q'"):
+        parse_search_query(None)
+
+
+def test_top_query_defaults_and_rejects_non_positive_n():
+    assert parse_top_query({}) == ('value', None, 50)
+    assert parse_top_query({'by': 'trend', 'position': 'WR', 'n': '5'}) == ('trend', 'WR', 5)
+    with pytest.raises(ValueError, match="'n'"):
+        parse_top_query({'n': '0'})
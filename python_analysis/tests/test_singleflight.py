@@ -0,0 +1,93 @@
+"""
+Tests for singleflight request coalescing.
+"""
+
+import threading
+import time
+
+import pytest
+from singleflight import SingleFlight, CachedLoader
+
+
+def slow_loader(calls, delay=0.05):
+    def load(key):
+        calls.append(key)
+        time.sleep(delay)
+        return f"value-{len(calls)}"
+    return load
+
+
+def run_concurrently(fn, count=10):
+    results = [None] * count
+    start = threading.Barrier(count)
+
+    def worker(i):
+        start.wait()
+        results[i] = fn()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_misses_share_one_load():
+    calls = []
+    cache = CachedLoader(slow_loader(calls), ttl_seconds=60)
+
+    results = run_concurrently(cache.get)
+
+    assert calls == [None]
+    assert results == ['value-1'] * 10
+
+
+def test_expired_value_is_reloaded_once():
+    calls = []
+    cache = CachedLoader(slow_loader(calls, delay=0), ttl_seconds=0.01)
+    cache.get('players')
+    time.sleep(0.02)
+
+    assert cache.get('players') == 'value-2'
+    assert cache.loads == 2
+
+
+def test_errors_are_shared_and_not_cached():
+    flight = SingleFlight()
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        time.sleep(0.05)
+        raise RuntimeError("scan failed")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do('players', failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    run_concurrently(call, count=5)
+    assert len(attempts) == 1
+    assert errors == ['scan failed'] * 5
+
+    with pytest.raises(RuntimeError):
+        flight.do('players', failing)
+    assert len(attempts) == 2
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    calls = []
+    cache = CachedLoader(slow_loader(calls, delay=0), ttl_seconds=60, max_entries=2)
+    cache.get('a')
+    cache.get('b')
+    cache.get('a')
+    cache.get('c')
+
+    # 'b' was the least recently used key when 'c' was loaded
+    assert cache.get('a') == 'value-1'
+    assert cache.get('b') == 'value-4'
+    assert calls == ['a', 'b', 'c', 'b']
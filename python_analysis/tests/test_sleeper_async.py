@@ -0,0 +1,62 @@
+"""
+Tests for the async Sleeper roster client.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+import sleeper_async
+import sleeper_league
+
+SLEEPER_PLAYERS = {
+    '100': {'full_name': 'Bijan Robinson', 'position': 'RB', 'team': 'ATL'},
+    '200': {'first_name': 'Jahmyr', 'last_name': 'Gibbs', 'position': 'RB', 'team': 'DET'},
+}
+
+RESPONSES = {
+    'league/1': {'league_id': '1', 'name': 'Dynasty', 'season': '2025'},
+    'league/1/rosters': [
+        {'roster_id': 1, 'owner_id': 'u1', 'players': ['100', 'DET'], 'starters': ['100']},
+        {'roster_id': 2, 'owner_id': 'u2', 'players': ['200', '999'], 'starters': []},
+    ],
+    'league/1/users': [
+        {'user_id': 'u1', 'display_name': 'alpha', 'metadata': {'team_name': 'Team A'}},
+        {'user_id': 'u2', 'display_name': 'bravo'},
+    ],
+    'league/2': {'league_id': '2', 'name': 'Redraft', 'season': '2025'},
+    'league/2/rosters': [{'roster_id': 1, 'owner_id': 'u3', 'players': ['100']}],
+    'league/2/users': [{'user_id': 'u3', 'display_name': 'charlie'}],
+}
+
+
+def fake_get(url, timeout=None):
+    path = url[len(sleeper_league.SLEEPER_API_URL) + 1:]
+    response = MagicMock()
+    response.status_code = 200 if path in RESPONSES else 404
+    response.json.return_value = RESPONSES.get(path)
+    return response
+
+
+def test_many_leagues_with_owners_from_users():
+    with patch.object(sleeper_league.session, 'get', side_effect=fake_get) as get:
+        rosters = asyncio.run(sleeper_async.fetch_league_rosters(['1', '2', 'missing'], players=SLEEPER_PLAYERS))
+
+    # Three requests per league, no per-roster user lookups; the missing league is skipped
+    assert get.call_count == 9
+    assert list(rosters.columns) == sleeper_async.ROSTER_COLUMNS
+    assert len(rosters) == 5
+    league_1 = rosters[rosters['league_id'] == '1'].set_index('sleeper_id')
+    assert league_1.loc['100', ['team_name', 'full_name', 'is_starter']].tolist() == ['Team A', 'Bijan Robinson', True]
+    assert league_1.loc['DET', ['full_name', 'position']].tolist() == ['DET Defense', 'DEF']
+    assert league_1.loc['200', ['display_name', 'team_name', 'full_name']].tolist() == ['bravo', 'bravo', 'Jahmyr Gibbs']
+    assert pd.isna(league_1.loc['999', 'full_name'])
+    assert rosters.loc[rosters['league_id'] == '2', 'display_name'].tolist() == ['charlie']
+
+
+def test_no_leagues_found_gives_empty_frame():
+    with patch.object(sleeper_league.session, 'get', side_effect=fake_get):
+        rosters = asyncio.run(sleeper_async.fetch_league_rosters(['missing']))
+    assert rosters.empty
+    assert list(rosters.columns) == sleeper_async.ROSTER_COLUMNS
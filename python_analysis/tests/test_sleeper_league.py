@@ -0,0 +1,68 @@
+"""
+Tests for server-side Sleeper league enrichment.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+import sleeper_league
+from player_store import PlayerStore
+
+PLAYERS = [
+    {'sleeper_id': '100', 'full_name': 'Bijan Robinson', 'position': 'RB', 'fantasy_calc_value': 11000},
+    {'sleeper_id': '200', 'full_name': 'Jahmyr Gibbs', 'position': 'RB', 'fantasy_calc_value': 10000},
+    {'sleeper_id': '300', 'full_name': 'Puka Nacua', 'position': 'WR', 'fantasy_calc_value': 9000},
+]
+
+RESPONSES = {
+    'league/1': {'league_id': '1', 'name': 'Dynasty', 'season': '2025', 'roster_positions': ['RB', 'WR']},
+    'league/1/rosters': [
+        {'roster_id': 1, 'owner_id': 'u1', 'players': ['100', 'DET'], 'starters': ['100']},
+        {'roster_id': 2, 'owner_id': 'u2', 'players': ['300', '200'], 'starters': ['200', '300']},
+    ],
+    'league/1/users': [
+        {'user_id': 'u1', 'display_name': 'alpha', 'metadata': {'team_name': 'Team A'}},
+        {'user_id': 'u2', 'display_name': 'bravo', 'metadata': {}},
+    ],
+}
+
+
+def fake_get(url, timeout=None):
+    path = url[len(sleeper_league.SLEEPER_API_URL) + 1:]
+    response = MagicMock()
+    response.status_code = 200 if path in RESPONSES else 404
+    response.json.return_value = RESPONSES.get(path)
+    return response
+
+
+def test_enriched_league_in_one_call():
+    store = PlayerStore.from_players(PLAYERS)
+    sleeper_league.league_cache.invalidate('1')
+
+    with patch.object(sleeper_league.session, 'get', side_effect=fake_get) as get:
+        league = sleeper_league.enriched_league('1', store.get)
+        sleeper_league.enriched_league('1', store.get)
+
+    # Three upstream calls, no per-roster user lookups; the second request is cached
+    assert get.call_count == 3
+    assert league['name'] == 'Dynasty'
+    bravo, alpha = league['teams']
+    assert (bravo['team_name'], bravo['total_value'], bravo['starters_value']) == ('bravo', 19000, 19000)
+    assert [p['sleeper_id'] for p in bravo['players']] == ['200', '300']
+    assert alpha['team_name'] == 'Team A'
+    assert alpha['players'][1] == {'sleeper_id': 'DET', 'error': 'Data not found', 'is_starter': False}
+    assert (alpha['total_value'], alpha['starters_value']) == (11000, 11000)
+
+
+def test_unknown_league_and_upstream_errors():
+    sleeper_league.league_cache.invalidate('missing')
+    with patch.object(sleeper_league.session, 'get', side_effect=fake_get):
+        with pytest.raises(sleeper_league.LeagueNotFound):
+            sleeper_league.enriched_league('missing', lambda _: None)
+
+    sleeper_league.league_cache.invalidate('1')
+    with patch.object(sleeper_league.session, 'get', side_effect=requests.ConnectionError('down')):
+        with pytest.raises(requests.RequestException):
+            sleeper_league.enriched_league('1', lambda _: None)
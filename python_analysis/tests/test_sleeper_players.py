@@ -0,0 +1,100 @@
+"""
+Tests for the conditional, delta-aware Sleeper players refresh.
+"""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import sleeper_players
+from create_player_data import merge_enriched_records
+
+OLD = {
+    '1': {'full_name': 'Joe Flacco', 'team': 'CLE', 'news_updated': 1},
+    '2': {'full_name': 'Bijan Robinson', 'team': 'ATL', 'news_updated': 1},
+    '3': {'full_name': 'Retired Guy', 'team': None},
+}
+NEW = {
+    '1': {'full_name': 'Joe Flacco', 'team': 'CIN', 'news_updated': 2},
+    '2': {'full_name': 'Bijan Robinson', 'team': 'ATL', 'news_updated': 2},
+    '4': {'full_name': 'Rookie', 'team': 'NYG'},
+}
+
+
+def response(status_code, body=None, headers=None):
+    mock = MagicMock(status_code=status_code, headers=headers or {})
+    mock.json.return_value = body
+    return mock
+
+
+def test_diff_players_by_id():
+    changes = sleeper_players.diff_players(OLD, NEW)
+    assert list(changes['new']) == ['4']
+    # Only the team move counts; news_updated churn is ignored
+    assert changes['changed'] == {'1': NEW['1']}
+    assert changes['removed'] == ['3']
+
+
+def test_refresh_skips_fresh_and_unchanged_dumps(tmp_path):
+    path = str(tmp_path / 'players.json')
+    changes_path = str(tmp_path / 'changes.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(OLD, f)
+
+    with patch.object(sleeper_players.requests, 'get', return_value=response(200, NEW, {'ETag': '"v2"'})) as get:
+        changes = sleeper_players.refresh_players(path, changes_path)
+        assert get.call_count == 1
+        assert sleeper_players.read_changes(changes_path) == changes
+        assert sleeper_players.changed_ids(changes) == {'1', '4'}
+        assert sleeper_players.read_players(path) == NEW
+
+        # Within the freshness window nothing is requested
+        assert sleeper_players.refresh_players(path, changes_path) is None
+        assert get.call_count == 1
+
+    with patch.object(sleeper_players.requests, 'get', return_value=response(304)) as get:
+        assert sleeper_players.refresh_players(path, changes_path, force=True) is None
+        assert get.call_args.kwargs['headers'] == {'If-None-Match': '"v2"'}
+    assert sleeper_players.read_players(path) == NEW
+    assert sleeper_players.read_meta(path)['changes'] == {'new': 1, 'changed': 1, 'removed': 1}
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.tmp-')]
+
+
+def test_unconsumed_changes_accumulate_across_refreshes(tmp_path):
+    path = str(tmp_path / 'players.json')
+    changes_path = str(tmp_path / 'changes.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(OLD, f)
+    latest = {'2': {'full_name': 'Bijan Robinson', 'team': 'ATL'}, '4': NEW['4'], '5': {'full_name': 'Another Rookie'}}
+
+    with patch.object(sleeper_players.requests, 'get', side_effect=[response(200, NEW), response(200, latest)]):
+        sleeper_players.refresh_players(path, changes_path, force=True)
+        changes = sleeper_players.refresh_players(path, changes_path, force=True)
+
+    # Against OLD: 4 and 5 are new, 1 and 3 are gone; nothing from the first refresh is lost
+    assert sleeper_players.read_changes(changes_path) == changes
+    assert sorted(changes['new']) == ['4', '5']
+    assert changes['changed'] == {}
+    assert changes['removed'] == ['1', '3']
+
+    sleeper_players.clear_changes(changes_path)
+    assert sleeper_players.read_pending_changes(changes_path) is None
+
+
+def test_merge_enriched_records_replaces_only_affected_players():
+    existing = [{'sleeper_id': '1', 'team': 'CLE'}, {'sleeper_id': '2', 'team': 'ATL'}, {'sleeper_id': '3', 'team': None}]
+    updated = [{'sleeper_id': '1', 'team': 'CIN'}, {'sleeper_id': '4', 'team': 'NYG'}]
+    records = merge_enriched_records(existing, updated, sleeper_players.diff_players(OLD, NEW))
+    assert records == [{'sleeper_id': '2', 'team': 'ATL'}] + updated
+
+
+def test_merge_enriched_records_refreshes_fantasycalc_values():
+    existing = [
+        {'sleeper_id': '2', 'fantasy_calc_value': 9000},
+        {'sleeper_id': '6', 'fantasy_calc_value': 100},
+    ]
+    updated = [{'sleeper_id': '7', 'fantasy_calc_value': 500}]
+    changes = {'new': {}, 'changed': {}, 'removed': []}
+    records = merge_enriched_records(existing, updated, changes, {'2': 9500, '7': 500})
+    # 2 keeps its record with the current value, 6 left FantasyCalc, 7 is newly valued
+    assert records == [{'sleeper_id': '2', 'fantasy_calc_value': 9500}] + updated
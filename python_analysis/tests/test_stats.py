@@ -0,0 +1,138 @@
+"""
+Tests for the stats frame builders, with the nfl_data_py cache stubbed by small frames.
+"""
+
+import os
+
+import pandas as pd
+
+import stats
+from player_ids import PlayerIdCrosswalk
+
+
+def weekly_season(season, team_targets):
+    rows = []
+    for week, (a_targets, b_targets) in enumerate(team_targets, start=1):
+        for player_id, name, targets in (('p1', 'Player A', a_targets), ('p2', 'Player B', b_targets)):
+            rows.append({
+                'player_id': player_id, 'player_display_name': name, 'position': 'WR',
+                'recent_team': 'KC', 'season': season, 'week': week, 'targets': float(targets),
+                'carries': 0.0, 'receiving_tds': 0.0, 'rushing_tds': 0.0,
+                'rushing_yards': 0.0, 'receiving_yards': 10.0 * targets,
+            })
+    return pd.DataFrame(rows).astype({'recent_team': 'category', 'player_display_name': 'category'})
+
+
+SEASONS = {
+    2022: weekly_season(2022, [(6, 4), (3, 1)]),
+    2023: weekly_season(2023, [(1, 1)]),
+}
+
+
+def test_weekly_range_is_indexed_and_shares_are_per_game(monkeypatch):
+    loaded = []
+    def load_weekly(year):
+        loaded.append(year)
+        return SEASONS[year].copy()
+    monkeypatch.setattr(stats.stats_cache, 'load_weekly', load_weekly)
+
+    weekly = stats.create_weekly_range_df([2023, 2022])
+
+    assert sorted(loaded) == [2022, 2023]
+    assert list(weekly.index.names) == ['season', 'week']
+    assert weekly.index.is_monotonic_increasing
+    assert isinstance(weekly['recent_team'].dtype, pd.CategoricalDtype)
+    # Week 1 totals are not mixed across seasons
+    player_a = weekly[weekly['player_id'] == 'p1']['targets_share']
+    assert player_a.loc[(2022, 1)] == 0.6
+    assert player_a.loc[(2022, 2)] == 0.75
+    assert player_a.loc[(2023, 1)] == 0.5
+
+
+def test_rolling_shares_restart_each_season():
+    weekly = pd.concat([SEASONS[2022], SEASONS[2023]], ignore_index=True)
+    weekly['opportunities'] = weekly['targets']
+    # Shuffled rows: results must still line up with their own rows
+    weekly = weekly.sample(frac=1, random_state=1)
+
+    stats.calculate_share_metrics(weekly)
+
+    player_a = weekly[weekly['player_id'] == 'p1'].set_index(['season', 'week'])
+    assert player_a.loc[(2022, 1), 'opportunities_share_3wk'] == 0.6
+    assert abs(player_a.loc[(2022, 2), 'opportunities_share_3wk'] - 9 / 14) < 1e-9
+    assert player_a.loc[(2023, 1), 'opportunities_share_3wk'] == 0.5
+    assert player_a.loc[(2023, 1), 'targets_share_ewma'] == 0.5
+    assert 0.6 < player_a.loc[(2022, 2), 'targets_share_ewma'] < 0.75
+
+
+def test_weekly_frame_follows_declared_schema(monkeypatch):
+    monkeypatch.setattr(stats.stats_cache, 'load_weekly', lambda year: SEASONS[year].astype({'recent_team': object}))
+
+    weekly = stats.create_weekly_df(2022)
+
+    assert isinstance(weekly['recent_team'].dtype, pd.CategoricalDtype)
+    assert isinstance(weekly['player_cleansed_name'].dtype, pd.CategoricalDtype)
+    assert weekly['week'].dtype == 'int8'
+    assert weekly['targets'].dtype == 'float32'
+    assert weekly['opportunities_share_3wk'].dtype == 'float32'
+    assert list(weekly['player_cleansed_name'].unique()) == ['player a', 'player b']
+
+
+def test_crosswalk_is_loaded_once_by_the_caller(monkeypatch):
+    monkeypatch.setattr(stats.stats_cache, 'load_weekly', lambda year: SEASONS[year].copy())
+    loads = []
+    monkeypatch.setattr(stats.PlayerIdCrosswalk, 'load', classmethod(lambda cls: loads.append(1) or PlayerIdCrosswalk()))
+
+    # add_weekly_features never reads the crosswalk from disk itself
+    assert 'sleeper_id' not in stats.add_weekly_features(SEASONS[2022].copy()).columns
+    assert loads == []
+
+    weekly = stats.create_weekly_df(2022, crosswalk=PlayerIdCrosswalk({'gsis': {'p1': '9509'}}))
+    assert loads == []
+    assert set(weekly.loc[weekly['player_id'] == 'p1', 'sleeper_id']) == {'9509'}
+
+
+def test_render_weekly_charts_headless(monkeypatch, tmp_path):
+    monkeypatch.setattr(stats.stats_cache, 'load_weekly', lambda year: SEASONS[year].copy())
+    weekly = stats.create_weekly_df(2022)
+
+    groups = stats.team_player_groups(weekly, top_n=1)
+    assert groups == {'KC': ['player a']}
+
+    paths = stats.render_weekly_charts(
+        weekly, dict(groups, Both=['player a', 'player b']), ['targets', 'targets_share'], str(tmp_path), max_workers=2
+    )
+
+    assert sorted(os.path.basename(p) for p in paths) == [
+        'Both_targets.png', 'Both_targets_share.png', 'KC_targets.png', 'KC_targets_share.png'
+    ]
+    assert all(os.path.getsize(p) > 0 for p in paths)
+
+
+def test_incremental_update_matches_full_processing(monkeypatch, tmp_path):
+    season = weekly_season(2022, [(6, 4), (3, 1), (2, 2), (5, 0), (1, 3), (4, 4)])
+    published = {'weeks': 4}
+    monkeypatch.setattr(
+        stats.stats_cache, 'load_weekly',
+        lambda year, cache_dir=None: season[season['week'] <= published['weeks']].copy()
+    )
+
+    first = stats.update_weekly_df(2022, cache_dir=str(tmp_path))
+    assert sorted(first['week'].unique()) == [1, 2, 3, 4]
+
+    published['weeks'] = 6
+    updated = stats.update_weekly_df(2022, cache_dir=str(tmp_path))
+    assert sorted(os.listdir(tmp_path / 'weekly_features' / 'season=2022')) == [
+        f'week=0{week}.parquet' for week in range(1, 7)
+    ]
+    # Nothing new: served from the week partitions
+    assert len(stats.update_weekly_df(2022, cache_dir=str(tmp_path))) == len(updated)
+
+    full = stats.create_weekly_df(2022)
+    columns = ['opportunities_share', 'opportunities_share_3wk', 'opportunities_share_5wk', 'targets_share_ewma']
+    key = ['player_id', 'week']
+    pd.testing.assert_frame_equal(
+        updated.sort_values(key)[columns].reset_index(drop=True),
+        full.sort_values(key)[columns].reset_index(drop=True),
+        rtol=1e-6
+    )
@@ -0,0 +1,64 @@
+"""
+Tests for the per-season Parquet cache of nfl_data_py data.
+"""
+
+import datetime
+
+import pandas as pd
+
+import stats_cache
+
+TODAY = datetime.date(2024, 11, 1)  # 2024 season in progress
+
+
+def make_fetch(calls):
+    def fetch(season):
+        calls.append(season)
+        return pd.DataFrame({
+            'player_display_name': ['A', 'B', 'A'],
+            'recent_team': ['KC', 'KC', 'KC'],
+            'week': [1, 1, 2],
+            'targets': [5.0, 3.0, 7.0],
+        })
+    return fetch
+
+
+def never_checked(season):
+    raise AssertionError("completed seasons are never checked upstream")
+
+
+def test_completed_season_is_frozen(tmp_path):
+    calls = []
+    load = lambda: stats_cache.load_weekly(
+        2023, cache_dir=str(tmp_path), fetch=make_fetch(calls), today=TODAY, check_version=never_checked
+    )
+
+    first = load()
+    second = load()
+
+    assert calls == [2023]
+    assert str(second['recent_team'].dtype) == 'category'
+    assert second['targets'].dtype == 'float32'
+    pd.testing.assert_frame_equal(first.reset_index(drop=True), second)
+
+
+def test_current_season_refreshes_only_on_new_version(tmp_path, monkeypatch):
+    calls, versions = [], ['v1']
+    monkeypatch.setattr(stats_cache, 'CURRENT_SEASON_CHECK_SECONDS', 0)
+    load = lambda: stats_cache.load_weekly(
+        2024, cache_dir=str(tmp_path), fetch=make_fetch(calls), today=TODAY,
+        check_version=lambda season: versions[-1]
+    )
+
+    load()
+    load()
+    assert calls == [2024]
+
+    versions.append('v2')
+    load()
+    assert calls == [2024, 2024]
+
+    # Offline: the version check fails and the cached copy is served
+    versions.append(None)
+    assert len(load()) == 3
+    assert calls == [2024, 2024]
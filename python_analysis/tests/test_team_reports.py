@@ -0,0 +1,54 @@
+"""
+Tests for the one-pass grouped team reports.
+"""
+
+import json
+
+import pandas as pd
+
+from team_reports import build_team_report, write_team_report
+
+ROSTERS = pd.DataFrame({
+    'NNF_Team': ['B', 'A', 'A', 'B', 'A', None],
+    'player_cleansed_name': ['b1', 'a1', 'a2', 'b2', 'a3', 'free agent'],
+    'value': [50, 90, 70, 80, None, 10],
+    'Value': [5, 9, 7, 8, 1, 1],
+})
+
+
+def test_report_ranks_and_splits_every_team_at_once():
+    report = build_team_report(ROSTERS, 'NNF_Team', sort_by='value', keep=2, value_col='Value')
+
+    assert list(report.players['player_cleansed_name']) == ['a1', 'a2', 'a3', 'b2', 'b1']
+    assert list(report.players['team_rank']) == [1, 2, 3, 1, 2]
+    assert list(report.players['status']) == ['Keep', 'Keep', 'Drop', 'Keep', 'Keep']
+    assert report.summary.loc['A'].to_dict() == {
+        'players': 3, 'total_value': 17, 'kept': 2, 'dropped': 1, 'kept_value': 16, 'dropped_value': 1
+    }
+    assert report.summary.loc['B', 'dropped'] == 0
+
+    only_b = build_team_report(ROSTERS, 'NNF_Team', sort_by='value', columns=['value'], teams=['B'])
+    assert list(only_b.players.columns) == ['NNF_Team', 'value', 'team_rank']
+    assert [team for team, _, _ in only_b.teams()] == ['B']
+
+    # A list of teams is reported in the order given
+    listed = build_team_report(ROSTERS, 'NNF_Team', sort_by='value', teams=['B', 'A'])
+    assert [team for team, _, _ in listed.teams()] == ['B', 'A']
+    assert list(listed.players['player_cleansed_name']) == ['b2', 'b1', 'a1', 'a2', 'a3']
+
+
+def test_write_report_formats(tmp_path):
+    report = build_team_report(ROSTERS, 'NNF_Team', sort_by='value', keep=2, value_col='Value')
+
+    csv = pd.read_csv(write_team_report(report, str(tmp_path / 'teams.csv')))
+    assert len(csv) == 5
+
+    with open(write_team_report(report, str(tmp_path / 'teams.json')), encoding='utf-8') as f:
+        body = json.load(f)
+    assert body['A']['summary']['kept_value'] == 16
+    assert [p['player_cleansed_name'] for p in body['A']['players']] == ['a1', 'a2', 'a3']
+    assert body['A']['players'][2]['value'] is None
+
+    html = (tmp_path / 'teams.html')
+    write_team_report(report, str(html))
+    assert html.read_text(encoding='utf-8').count('<h2>') == 2